@@ -0,0 +1,38 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from scripts.backtest import backtest, pivot_signals, session_levels, level_signals
+from scripts.technical.trend_detector import DirectionalChange
+
+symbol = "btcusdt"
+timeframe = "1m"
+# read data
+df = pd.read_csv(
+    f"./data/{symbol}{timeframe}.csv", index_col=["Date"], parse_dates=["Date"]
+)
+
+# breakouts of confirmed directional change pivots
+dc = DirectionalChange(df, threshold=0.5)
+dc.fit()
+signal = pivot_signals(df.index, dc.confirmations, df["Close"], mode="breakout")
+result = backtest(df, signal, fee=0.0004, slippage=0.0002)
+print(pd.Series(result.metrics))
+
+# rejections of the previous day's value area, out at its POC
+levels = session_levels(df, "VolumeProfile", freq="1D")
+signal = level_signals(
+    df["Close"],
+    levels["VAL"],
+    levels["VAH"],
+    mode="rejection",
+    high=df["High"],
+    low=df["Low"],
+    exit=levels["POC"],
+)
+result = backtest(df, signal)
+print(result.trades)
+print(pd.Series(result.metrics))
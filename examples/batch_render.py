@@ -0,0 +1,21 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.batch_render import render_batch
+
+if __name__ == "__main__":
+    started = time.perf_counter()
+    report = render_batch(
+        symbols=["BTCUSDT", "ETHUSDT"],
+        timeframes=["1h", "1d"],
+        charts=["MarketProfile", "VolumeProfile", "ZigZag", "DirectionalChange", "Plotter"],
+        formats=["png", "html"],
+        output_dir="./output/batch",
+        params={"ZigZag": {"depth": 20}},
+    )
+    failed = report["error"].notna().sum() if "error" in report else 0
+    print(f"Rendered {len(report)} charts in {time.perf_counter() - started:.1f}s ({failed} failed)")
+    print(report.sort_values("total", ascending=False).to_string(index=False))
@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import subprocess
+from statistics import median
+
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# analytics modules and the heavy dependencies they must not pull in at import
+modules = {
+    "scripts.technical.profile_analyzer": ("matplotlib", "scipy", "ccxt", "bokeh"),
+    "scripts.technical.trend_detector": ("matplotlib", "scipy", "ccxt", "bokeh"),
+    "scripts.utils.ohlcv": ("matplotlib", "scipy", "ccxt", "bokeh", "pandas"),
+    "scripts.utils.shared_dataset": ("matplotlib", "scipy", "ccxt", "bokeh", "pandas"),
+    "scripts.utils.instrumentation": ("matplotlib", "scipy", "ccxt", "bokeh", "pandas", "numpy"),
+    "scripts.utils.downsample": ("matplotlib", "scipy", "ccxt", "bokeh"),
+    "scripts.utils.downloader": ("matplotlib", "scipy", "ccxt", "bokeh"),
+    "scripts.utils.live_feed": ("matplotlib", "scipy", "ccxt", "bokeh"),
+}
+runs = 5
+budget = 0.15  # seconds on top of numpy + pandas
+
+probe = """
+import sys, time, json
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+# import `module` in a fresh interpreter, returning seconds and loaded modules
+def measure(module: str) -> tuple[float, set]:
+    output = subprocess.run(
+        [sys.executable, "-c", probe.format(module=module)],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output)
+    return result["elapsed"], set(result["modules"])
+
+
+# scripts/plotting.py run directly (its own directory first on sys.path) must
+# load the analyzers from the same modules, so their fits are recorded in the
+# same instrumentation registry as its own stages
+script_probe = """
+import sys, json, runpy
+import numpy as np, pandas as pd
+sys.path[0] = {scripts!r}
+namespace = runpy.run_path({plotting!r})
+from scripts.utils import instrumentation
+
+instrumentation.enable()
+close = 100 + np.cumsum(np.random.default_rng(0).normal(size=500))
+data = pd.DataFrame(
+    {{"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1.0}},
+    index=pd.date_range("2024-01-01", periods=len(close), freq="1min", name="Date"),
+)
+namespace["Profiler"].VolumeProfile(data).fit()
+namespace["TrendDetector"].ZigZag(data).fit()
+print(json.dumps({{
+    "modules": sorted(name for name in sys.modules if name.endswith("instrumentation")),
+    "stages": sorted(instrumentation.summary()),
+}}))
+"""
+
+
+# run scripts/plotting.py as a script, returning the instrumentation modules and stages
+def check_plotting_script() -> tuple[list, list]:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            script_probe.format(
+                scripts=os.path.join(root, "scripts"),
+                plotting=os.path.join(root, "scripts", "plotting.py"),
+            ),
+        ],
+        cwd=root,
+        env={**os.environ, "MPLBACKEND": "Agg"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output)
+    return result["modules"], result["stages"]
+
+
+baseline = median(measure("numpy, pandas")[0] for _ in range(runs))
+print(f"{'numpy + pandas':40s} {baseline * 1000:8.1f} ms (baseline)")
+
+failures = []
+for module, forbidden in modules.items():
+    samples = [measure(module) for _ in range(runs)]
+    elapsed = median(sample[0] for sample in samples)
+    loaded = {name.split(".")[0] for name in samples[0][1]} & set(forbidden)
+    overhead = elapsed - baseline
+
+    status = "ok"
+    if loaded:
+        status = f"imports {', '.join(sorted(loaded))}"
+        failures.append(module)
+    elif overhead > budget:
+        status = f"over budget by {(overhead - budget) * 1000:.1f} ms"
+        failures.append(module)
+    print(f"{module:40s} {elapsed * 1000:8.1f} ms  {status}")
+
+instrumentation, stages = check_plotting_script()
+status = "ok"
+if instrumentation != ["scripts.utils.instrumentation"] or len(stages) != 2:
+    status = f"loads {', '.join(instrumentation)}, records {', '.join(stages) or 'nothing'}"
+    failures.append("scripts/plotting.py")
+print(f"{'scripts/plotting.py (as a script)':40s} {'':8s}    {status}")
+
+if failures:
+    sys.exit(f"Import regressions: {', '.join(failures)}")
@@ -0,0 +1,50 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pandas as pd
+
+from scripts.plottingv2 import Plotter
+from scripts.technical.indicators import ema, rsi, macd, bollinger, RSI, IndicatorGraph
+
+symbol = "btcusdt"
+timeframe = "4h"
+# read data
+df = pd.read_csv(
+    f"./data/{symbol}{timeframe}.csv", index_col=["Date"], parse_dates=["Date"]
+)
+
+# batch indicators return Series when given one, so they plot by date
+macd_line, signal_line, histogram = macd(df["Close"])
+middle, upper, lower = bollinger(df["Close"], 20, 2.0)
+
+# the streaming state gives the same values one bar at a time
+streamed = RSI(14).run(df["Close"])
+print("RSI batch == streaming:", np.allclose(rsi(df["Close"]), streamed, equal_nan=True))
+
+p = Plotter(df)
+p.plot(
+    instrument=f"{symbol.upper()} {timeframe}",
+    indicators={
+        "EMA 20": {"type": "EMA", "data": ema(df["Close"], 20)},
+        "BB upper": {"type": "BB", "data": upper, "color": "grey"},
+        "BB lower": {"type": "BB", "data": lower, "color": "grey"},
+        "RSI 14": {"type": "RSI", "data": rsi(df["Close"], 14)},
+        "MACD": {"type": "MACD", "data": macd_line},
+    },
+)
+
+# overlapping indicators share their intermediates through the graph: the
+# EMAs are computed once for both the MACD and the EMA overlays
+graph = IndicatorGraph()
+graph.update(symbol, df)
+for name, params in [
+    ("macd_hist", {}),
+    ("ema", {"period": 12}),
+    ("ema", {"period": 26}),
+    ("atr", {"period": 26}),
+]:
+    graph.get(symbol, name, **params)
+print(graph.stats)
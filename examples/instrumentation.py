@@ -0,0 +1,39 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from scripts.utils import instrumentation
+from scripts.technical.profile_analyzer import MarketProfile, VolumeProfile
+from scripts.technical.trend_detector import ZigZag, DirectionalChange
+
+symbol = "btcusdt"
+timeframe = "1m"
+# read data
+df = pd.read_csv(
+    f"./data/{symbol}{timeframe}.csv", index_col=["Date"], parse_dates=["Date"]
+)
+
+os.makedirs("./output", exist_ok=True)
+
+# record every timed stage, export the histograms for Prometheus and log each call
+instrumentation.enable(
+    prometheus_file="./output/metrics.prom", log_file="./output/metrics.jsonl"
+)
+
+for _ in range(20):
+    MarketProfile(df).fit()
+    VolumeProfile(df).fit()
+    ZigZag(df, threshold=1.0).fit()
+    DirectionalChange(df, threshold=1.0).fit()
+
+# writes ./output/metrics.prom a last time
+instrumentation.disable()
+
+for stage, row in instrumentation.summary().items():
+    print(
+        f"{stage:<40} {row['calls']:5d} calls  p50 {row['p50'] * 1e3:8.2f} ms  "
+        f"p99 {row['p99'] * 1e3:8.2f} ms  max {row['max'] * 1e3:8.2f} ms"
+    )
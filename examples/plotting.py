@@ -13,4 +13,5 @@ plotter = Plotting(
     symbol=symbol, timeframe=timeframe, interval=timeframe_to_seconds(timeframe)
 )  # seconds
 # plotter.plot(start="2024-01-01", end="2024-01-02", profile_type="MarketProfile")
-plotter.live(profile_type="VolumeProfile")
+metrics = plotter.live(profile_type="VolumeProfile")
+print(metrics)
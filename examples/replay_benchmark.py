@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+import tempfile
+from itertools import islice
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+from scripts.plotting import Plotting, LiveFeed
+
+symbol = "BTCUSDT"
+timeframe = "1m"
+ticks = 200
+# candles already in the scratch store, the feed resumes from its tail
+seed_rows = 1000
+
+# replay ./data deterministically: one candle per tick, 20ms +- 10ms latency, 1% errors
+replay_options = {
+    "data_dir": "./data",
+    "step": 1,
+    "latency": 0.02,
+    "jitter": 0.01,
+    "error_rate": 0.01,
+    "seed": 42,
+}
+
+plotter = Plotting(symbol=symbol, timeframe=timeframe)
+with tempfile.TemporaryDirectory() as store:
+    # the live feed writes to a scratch store so the replayed csv is never touched
+    csv_name = f"{symbol.lower()}{timeframe}.csv"
+    with open(os.path.join(replay_options["data_dir"], csv_name)) as source:
+        with open(os.path.join(store, csv_name), "w") as seeded:
+            seeded.writelines(islice(source, seed_rows + 1))
+
+    plotter.feed = LiveFeed(
+        "replay",
+        symbol,
+        timeframe,
+        size=100,
+        data_dir=store,
+        exchange_options=replay_options,
+    )
+    plotter.feed.prime()
+
+    plotter.set_titles("VolumeProfile")
+    plotter.fig.canvas.draw()
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for frame in range(ticks):
+        tick_start = time.perf_counter()
+        try:
+            # ingest -> analyze -> render, drawing only the changed artists as blitting does
+            for artist in plotter.update(frame, "replay", "VolumeProfile"):
+                artist.axes.draw_artist(artist)
+        except Exception:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - tick_start)
+    elapsed = time.perf_counter() - started
+    plotter.feed.close()
+
+latencies = np.array(latencies) * 1000
+print(f"ticks: {ticks}, errors: {errors}, throughput: {ticks / elapsed:.1f} ticks/s")
+print(
+    f"latency ms p50: {np.percentile(latencies, 50):.1f}, "
+    f"p90: {np.percentile(latencies, 90):.1f}, p99: {np.percentile(latencies, 99):.1f}"
+)
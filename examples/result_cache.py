@@ -0,0 +1,37 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from scripts.technical.result_cache import ResultCache, CacheableFit
+from scripts.technical.profile_analyzer import MarketProfile, VolumeProfile
+from scripts.technical.trend_detector import ZigZag, DirectionalChange
+
+symbol = "btcusdt"
+timeframe = "1m"
+# read data
+df = pd.read_csv(
+    f"./data/{symbol}{timeframe}.csv", index_col=["Date"], parse_dates=["Date"]
+)
+
+# opt in for every analyzer, results are kept across runs in ./.cache
+cache = ResultCache("./.cache/analyzers", max_bytes=256 * 2**20)
+CacheableFit.use_cache(cache)
+
+for analyzer in (
+    MarketProfile(df),
+    VolumeProfile(df),
+    ZigZag(df, threshold=1.0),
+    DirectionalChange(df, threshold=1.0),
+):
+    started = time.perf_counter()
+    analyzer.fit()
+    print(f"{type(analyzer).__name__:<20} {(time.perf_counter() - started) * 1e3:8.1f} ms")
+
+print(cache.stats())
+
+# drop the ZigZag entries, e.g. after changing its algorithm
+cache.invalidate(ZigZag)
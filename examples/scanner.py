@@ -0,0 +1,27 @@
+import sys
+import os
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from scripts.scanner import scan
+
+if __name__ == "__main__":
+    # every USDT pair of the local 1h store: yesterday's value area, the last
+    # directional change pivot and the nearest support/resistance zone.
+    # Reruns only read the bars appended to the csv files since the last scan.
+    started = time.perf_counter()
+    report = scan(
+        timeframe="1h",
+        quote="USDT",
+        data_dir="./data",
+        profile="VolumeProfile",
+        freq="1D",
+        trend="DirectionalChange",
+        trend_params={"threshold": 2.0},
+        tolerance=0.003,
+        rank_by={"sr_distance": True, "bars_since_confirmation": True},
+    )
+    failed = report["error"].notna().sum() if "error" in report else 0
+    print(f"Scanned {len(report)} symbols in {time.perf_counter() - started:.1f}s ({failed} failed)")
+    print(report.head(20).to_string(index=False))
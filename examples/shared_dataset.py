@@ -0,0 +1,30 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from concurrent.futures import ProcessPoolExecutor
+
+from scripts.utils.ohlcv import OHLCV
+from scripts.utils.shared_dataset import SharedDataset
+from scripts.technical.trend_detector import ZigZag
+
+timeframe = "1m"
+symbols = ["btcusdt", "ethusdt"]
+
+
+# runs in a worker: attach by name, fit on the read-only shared views
+def last_pivot(dataset: str, symbol: str):
+    bars = SharedDataset.attach(dataset)[symbol]
+    return symbol, ZigZag(bars, threshold=1.0, depth=10).fit()[-1]
+
+
+if __name__ == "__main__":
+    # one copy of every series, however many workers read it
+    data = {symbol: OHLCV.from_csv(f"./data/{symbol}{timeframe}.csv") for symbol in symbols}
+    with SharedDataset.publish(data) as dataset:
+        print(dataset)
+        with ProcessPoolExecutor(32) as pool:
+            jobs = [(dataset.name, symbol) for symbol in dataset.symbols]
+            for symbol, pivot in pool.map(last_pivot, *zip(*jobs)):
+                print(symbol, pivot)
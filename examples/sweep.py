@@ -0,0 +1,41 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from scripts.backtest import sweep, load_results
+
+timeframe = "1m"
+symbols = ["btcusdt", "ethusdt"]
+
+if __name__ == "__main__":
+    # read data
+    datasets = {
+        symbol: pd.read_csv(
+            f"./data/{symbol}{timeframe}.csv", index_col=["Date"], parse_dates=["Date"]
+        )
+        for symbol in symbols
+    }
+
+    # zigzag extrema are found once per depth, then connected for each threshold
+    results = sweep(
+        datasets,
+        "zigzag",
+        {"depth": [5, 10, 20], "threshold": [0.25, 0.5, 1.0, 2.0], "mode": ["reversal", "breakout"]},
+        output="./output/sweep/zigzag.npz",
+        cache_dir="./output/sweep/cache",
+    )
+    print(results.sort_values("sharpe", ascending=False).head(10).to_string(index=False))
+
+    # session profiles are fitted once per bin_size, value areas redone per perc
+    sweep(
+        datasets,
+        "profile",
+        {"bin_size": [50, 100, 200], "perc": [60, 70, 80], "mode": ["breakout", "rejection"]},
+        output="./output/sweep/profile.npz",
+        cache_dir="./output/sweep/cache",
+    )
+    results = load_results("./output/sweep/profile.npz", ["symbol", "bin_size", "perc", "mode", "sharpe"])
+    print(results.groupby(["bin_size", "perc"])["sharpe"].mean().unstack())
@@ -0,0 +1,36 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from scripts.plottingv2 import Plotter
+from scripts.technical.indicators import session_vwap, anchored_vwap
+from scripts.technical.trend_detector import ZigZag
+
+symbol = "btcusdt"
+timeframe = "1m"
+# read data
+df = pd.read_csv(
+    f"./data/{symbol}{timeframe}.csv", index_col=["Date"], parse_dates=["Date"]
+)
+
+# daily VWAP with 2 standard deviation bands
+middle, upper, lower = session_vwap(df, "1D", k=2.0)
+
+# VWAP anchored at every zigzag pivot: the bands of one pivot are computed
+# when it is indexed, so any number of pivots costs one pass over the bars
+pivots = ZigZag(df, threshold=1.0).fit()
+anchored = anchored_vwap(df["High"], df["Low"], df["Close"], df["Volume"], pivots)
+last_pivot, _, _ = anchored[-1]
+print(anchored.at(-1)[0])  # every anchored VWAP at the last bar
+
+indicators = {
+    "VWAP": {"type": "VWAP", "data": middle, "color": "black"},
+    "VWAP +2": {"type": "VWAP", "data": upper, "color": "grey"},
+    "VWAP -2": {"type": "VWAP", "data": lower, "color": "grey"},
+}
+p = Plotter(df)
+p.configure(max_graph_over=len(indicators))
+p.plot(instrument=f"{symbol.upper()} {timeframe}", indicators=indicators)
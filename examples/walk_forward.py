@@ -0,0 +1,30 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pandas as pd
+
+from scripts.backtest import walk_forward
+
+symbol = "btcusdt"
+timeframe = "1m"
+
+if __name__ == "__main__":
+    # read data
+    df = pd.read_csv(
+        f"./data/{symbol}{timeframe}.csv", index_col=["Date"], parse_dates=["Date"]
+    )
+
+    # optimize on 2 days, trade the next 12 hours, roll by 12 hours
+    result = walk_forward(
+        df,
+        "zigzag",
+        {"depth": [5, 10, 20], "threshold": [0.25, 0.5, 1.0], "mode": ["reversal", "breakout"]},
+        train="2D",
+        test="12h",
+        objective="sharpe",
+    )
+    print(result.folds[["test_start", "depth", "threshold", "mode", "train_sharpe", "test_sharpe"]])
+    print(pd.Series(result.metrics))
+    result.equity.to_csv(f"./output/{symbol}{timeframe}_walk_forward_equity.csv")
@@ -0,0 +1,12 @@
+from .engine import backtest, BacktestResult
+from .metrics import metrics, bars_per_year
+from .signals import (
+    confirmed_levels,
+    pivot_signals,
+    session_profiles,
+    profile_levels,
+    session_levels,
+    level_signals,
+)
+from .sweep import sweep, expand_grid, save_results, load_results
+from .walk_forward import walk_forward, fold_bounds, WalkForwardResult
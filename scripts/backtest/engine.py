@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from .metrics import bars_per_year, metrics
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """Per-bar series, trades and metrics of one backtest."""
+
+    equity: pd.Series
+    returns: pd.Series
+    positions: pd.Series
+    trades: pd.DataFrame
+    metrics: dict
+
+
+def backtest(
+    data: pd.DataFrame,
+    signal,
+    fee: float = 0.0004,
+    slippage: float = 0.0002,
+    allow_short: bool = True,
+    initial_capital: float = 1.0,
+) -> BacktestResult:
+    """
+    Vectorized backtest of target positions on OHLC bars.
+
+    The signal of a bar is decided on its close and filled at the next bar's
+    open, so it can only use information up to that close. Returns are
+    computed for the whole series at once: the gap from the previous close
+    to the open is earned with the previous position, the open to close move
+    with the new one, and every fill pays `fee` + `slippage` on the traded
+    notional.
+
+    Params:
+    - data: OHLC bars with a DatetimeIndex.
+    - signal: Target position per bar: 1 long, -1 short, 0 flat, fractions for
+      partial size and NaN to hold the current position.
+    - fee: Fee per fill as a fraction of the notional (e.g. 0.0004 = 4 bps).
+    - slippage: Slippage per fill as a fraction of the notional.
+    - allow_short: Clip short targets to flat when False.
+    - initial_capital: Starting equity.
+    """
+    open_ = data["Open"].to_numpy(dtype="float64")
+    close = data["Close"].to_numpy(dtype="float64")
+    n = len(close)
+
+    target = pd.Series(np.asarray(signal, dtype="float64")).ffill().fillna(0.0)
+    target = target.clip(-1.0 if allow_short else 0.0, 1.0).to_numpy()
+
+    # position held during each bar: filled at its open from the previous signal
+    position = np.zeros(n)
+    position[1:] = target[:-1]
+    previous = np.zeros(n)
+    previous[1:] = position[:-1]
+
+    gap = np.zeros(n)
+    gap[1:] = open_[1:] / close[:-1] - 1
+    intrabar = close / open_ - 1
+    rate = fee + slippage
+    cost = np.abs(position - previous) * rate
+
+    returns = (1 + previous * gap) * (1 - cost) * (1 + position * intrabar) - 1
+    equity = initial_capital * np.cumprod(1 + returns)
+
+    trades = _trades(
+        data.index, position, previous, gap, intrabar, open_, close, rate
+    )
+    result_metrics = metrics(
+        returns, position, trades["return"].to_numpy(), bars_per_year(data.index)
+    )
+
+    return BacktestResult(
+        equity=pd.Series(equity, index=data.index, name="equity"),
+        returns=pd.Series(returns, index=data.index, name="returns"),
+        positions=pd.Series(position, index=data.index, name="position"),
+        trades=trades,
+        metrics=result_metrics,
+    )
+
+
+def _trades(
+    index, position, previous, gap, intrabar, open_, close, rate
+) -> pd.DataFrame:
+    """
+    One row per run of constant, non-zero position. Returns are compounded
+    from cumulative log returns: entry cost, open to close moves from the
+    entry bar, gaps up to and including the exit bar's open and exit cost.
+    """
+    n = len(position)
+    changes = np.flatnonzero(position != previous)
+    entries = changes[position[changes] != 0]
+    # a trade ends at the next change of position, or is still open at the end
+    following = np.searchsorted(changes, entries, side="right")
+    exits = np.append(changes, n)[following]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        moves = np.concatenate(([0.0], np.cumsum(np.log1p(position * intrabar))))
+        gaps = np.concatenate(([0.0], np.cumsum(np.log1p(previous * gap))))
+    size = np.abs(position[entries])
+    is_open = exits == n
+    last = np.minimum(exits, n - 1)
+
+    log_return = (
+        moves[exits] - moves[entries]
+        + gaps[np.where(is_open, n, exits + 1)] - gaps[entries + 1]
+        + np.log1p(-size * rate)
+        + np.where(is_open, 0.0, np.log1p(-size * rate))
+    )
+
+    return pd.DataFrame(
+        {
+            "entry": index[entries],
+            "exit": index[last],
+            "position": position[entries],
+            "bars": exits - entries,
+            "entry_price": open_[entries],
+            "exit_price": np.where(is_open, close[last], open_[last]),
+            "return": np.expm1(log_return),
+            "open": is_open,
+        }
+    )
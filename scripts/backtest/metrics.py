@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+
+# bars per year of a (24/7) index, from its median bar spacing
+def bars_per_year(index: pd.DatetimeIndex) -> float:
+    if len(index) < 2:
+        return 1.0
+    spacing = np.median(np.diff(index.as_unit("ns").asi8)) / 1e9
+    return 365 * 24 * 60 * 60 / spacing
+
+
+def metrics(
+    returns: np.ndarray,
+    positions: np.ndarray,
+    trade_returns: np.ndarray,
+    periods: float,
+) -> dict:
+    """
+    Standard performance metrics of per-bar strategy `returns`.
+
+    Params:
+    - returns: Net returns of each bar.
+    - positions: Position held during each bar.
+    - trade_returns: Net return of each trade.
+    - periods: Bars per year, to annualize.
+    """
+    n = len(returns)
+    equity = np.cumprod(1 + returns)
+    total_return = equity[-1] - 1 if n else 0.0
+    years = n / periods
+    mean, std = (returns.mean(), returns.std()) if n else (0.0, 0.0)
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2)) if n else 0.0
+    drawdown = equity / np.maximum.accumulate(equity) - 1 if n else np.zeros(1)
+
+    wins = trade_returns[trade_returns > 0]
+    losses = trade_returns[trade_returns < 0]
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        cagr = (1 + total_return) ** (1 / years) - 1 if years > 0 else np.nan
+        max_drawdown = drawdown.min()
+        values = {
+            "total_return": total_return,
+            "cagr": cagr,
+            "volatility": std * np.sqrt(periods),
+            "sharpe": mean / std * np.sqrt(periods) if std > 0 else np.nan,
+            "sortino": mean / downside * np.sqrt(periods) if downside > 0 else np.nan,
+            "max_drawdown": max_drawdown,
+            "calmar": cagr / -max_drawdown if max_drawdown < 0 else np.nan,
+            "trades": len(trade_returns),
+            "win_rate": len(wins) / len(trade_returns) if len(trade_returns) else np.nan,
+            "profit_factor": wins.sum() / -losses.sum() if len(losses) else np.nan,
+            "avg_trade": trade_returns.mean() if len(trade_returns) else np.nan,
+            "exposure": np.mean(positions != 0) if n else 0.0,
+            "turnover": np.abs(np.diff(positions, prepend=0)).sum(),
+        }
+    # plain python numbers
+    return {
+        name: value.item() if isinstance(value, np.generic) else value
+        for name, value in values.items()
+    }
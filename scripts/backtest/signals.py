@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+
+def confirmed_levels(index: pd.DatetimeIndex, confirmations) -> pd.DataFrame:
+    """
+    Price of the last High and Low pivot known at each bar, from the
+    `confirmations` of a fitted `ZigZag`/`DirectionalChange`. A pivot only
+    counts from its confirmation bar on, NaN before the first one.
+    """
+    levels = pd.DataFrame(np.nan, index=index, columns=["High", "Low"])
+    for label in ("High", "Low"):
+        events = [(date, price) for date, _, price, kind in confirmations if kind == label]
+        if events:
+            dates, prices = zip(*events)
+            positions = index.searchsorted(pd.DatetimeIndex(dates))
+            # the last confirmation of a bar wins, as it replaced the others
+            levels.iloc[positions, levels.columns.get_loc(label)] = prices
+    return levels.ffill()
+
+
+def pivot_signals(
+    index: pd.DatetimeIndex, confirmations, close=None, mode: str = "reversal"
+) -> np.ndarray:
+    """
+    Target positions from trend detector pivots (1 long, -1 short, NaN hold).
+
+    Params:
+    - index: Bars of the backtest.
+    - confirmations: `confirmations` of a fitted `ZigZag`/`DirectionalChange`.
+    - close: Closes of the bars, required for "breakout".
+    - mode: "reversal" goes long at the confirmation of a Low and short at the
+      confirmation of a High. "breakout" goes long on a close above the last
+      confirmed High and short on a close below the last confirmed Low.
+    """
+    signal = np.full(len(index), np.nan)
+    if mode == "reversal":
+        for date, _, _, label in confirmations:
+            signal[index.searchsorted(date)] = 1.0 if label == "Low" else -1.0
+    elif mode == "breakout":
+        if close is None:
+            raise ValueError("`close` is required for breakout signals")
+        levels = confirmed_levels(index, confirmations)
+        close = np.asarray(close, dtype="float64")
+        signal[close > levels["High"].to_numpy()] = 1.0
+        signal[close < levels["Low"].to_numpy()] = -1.0
+    else:
+        raise ValueError(f"Unknown signal mode: {mode}")
+    return signal
+
+
+def session_profiles(
+    data: pd.DataFrame, profile_type: str = "VolumeProfile", freq: str = "1D", **params
+) -> dict:
+    """Fitted profile analyzer of each `freq` session, keyed by session start."""
+    from scripts.technical import profile_analyzer as Profiler
+
+    sessions = data.index.floor(freq)
+    analyzers = {}
+    for session, bars in data.groupby(sessions):
+        analyzer = getattr(Profiler, profile_type)(bars, **params)
+        analyzer.fit()
+        analyzers[session] = analyzer
+    return analyzers
+
+
+def profile_levels(
+    index: pd.DatetimeIndex, profiles: dict, freq: str = "1D", perc=None
+) -> pd.DataFrame:
+    """
+    POC, VAL and VAH of the previous session at each bar, from the
+    `session_profiles` of the same `freq`. With `perc` the value areas are
+    recomputed from the stored profiles, so one fit serves every percentage.
+    """
+    levels = {}
+    for session, fitted in profiles.items():
+        poc, value_area = fitted.poc, fitted.va
+        if perc is not None and perc != fitted.perc:
+            analyzer = type(fitted)(None, bin_size=fitted.bin_size, perc=perc)
+            analyzer.profile = fitted.profile
+            value_area = analyzer.value_area()
+        levels[session] = (poc[1], value_area[0], value_area[1])
+
+    table = pd.DataFrame.from_dict(levels, orient="index", columns=["POC", "VAL", "VAH"])
+    previous = table.shift(1)
+    return previous.reindex(index.floor(freq)).set_axis(index)
+
+
+def session_levels(
+    data: pd.DataFrame, profile_type: str = "VolumeProfile", freq: str = "1D", **params
+) -> pd.DataFrame:
+    """
+    POC, VAL and VAH of the previous `freq` session at each bar.
+
+    Each session's profile is fitted on that session only and applied to the
+    bars of the next one, so the levels carry no look-ahead. NaN during the
+    first session.
+    """
+    profiles = session_profiles(data, profile_type, freq, **params)
+    return profile_levels(data.index, profiles, freq)
+
+
+def level_signals(
+    close,
+    lower,
+    upper,
+    mode: str = "breakout",
+    high=None,
+    low=None,
+    exit=None,
+) -> np.ndarray:
+    """
+    Target positions from price levels such as VAL/VAH (1 long, -1 short,
+    0 flat, NaN hold).
+
+    Params:
+    - close: Closes of the bars.
+    - lower, upper: Level arrays aligned with the bars, e.g. VAL and VAH.
+    - mode: "breakout" goes long on a close above `upper` and short on a close
+      below `lower`. "rejection" needs `high`/`low`: short when a bar trades
+      through `upper` but closes back below it, long when it trades through
+      `lower` and closes back above it.
+    - exit: Optional level, e.g. POC, closing the position when the close
+      crosses it.
+    """
+    close = np.asarray(close, dtype="float64")
+    lower = np.asarray(lower, dtype="float64")
+    upper = np.asarray(upper, dtype="float64")
+    signal = np.full(len(close), np.nan)
+
+    if exit is not None:
+        side = np.sign(close - np.asarray(exit, dtype="float64"))
+        crossed = np.zeros(len(close), dtype=bool)
+        crossed[1:] = (side[1:] != side[:-1]) & (side[:-1] != 0)
+        signal[crossed] = 0.0
+
+    if mode == "breakout":
+        signal[close > upper] = 1.0
+        signal[close < lower] = -1.0
+    elif mode == "rejection":
+        if high is None or low is None:
+            raise ValueError("`high` and `low` are required for rejection signals")
+        high = np.asarray(high, dtype="float64")
+        low = np.asarray(low, dtype="float64")
+        signal[(high >= upper) & (close < upper)] = -1.0
+        signal[(low <= lower) & (close > lower)] = 1.0
+    else:
+        raise ValueError(f"Unknown signal mode: {mode}")
+    return signal
@@ -0,0 +1,366 @@
+import hashlib
+import itertools
+import json
+import os
+import pickle
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from scripts.utils.ohlcv import COLUMNS, OHLCV
+from scripts.utils.shared_dataset import SharedDataset
+from .engine import backtest
+from .signals import pivot_signals, session_profiles, profile_levels, level_signals
+
+
+def expand_grid(**grid) -> list[dict]:
+    """
+    Every combination of the `grid` values, in order. Lists (and tuples) are
+    swept, any other value is fixed for all combinations.
+
+    >>> expand_grid(depth=[5, 10], threshold=[0.5, 1.0], mode="reversal")
+    [{'depth': 5, 'threshold': 0.5, 'mode': 'reversal'}, ...]
+    """
+    values = [v if isinstance(v, (list, tuple)) else [v] for v in grid.values()]
+    return [dict(zip(grid, combination)) for combination in itertools.product(*values)]
+
+
+# Strategies
+# Each one is split at its expensive intermediate: `stage` depends on the
+# `stage_params` only and is computed once per symbol and combination of them,
+# `signal` turns it into target positions for each remaining combination.
+def _zigzag_stage(data, depth):
+    from scripts.technical.trend_detector import ZigZag
+
+    detector = ZigZag(data, depth=depth)
+    return detector.find_pivots(
+        data["Close"].to_numpy(), data["High"].to_numpy(), data["Low"].to_numpy()
+    )
+
+
+def _zigzag_signal(data, extrema, depth, threshold, mode="reversal"):
+    from scripts.technical.trend_detector import ZigZag
+
+    detector = ZigZag(data, threshold=threshold, depth=depth)
+    detector.connect_pivots(extrema)
+    return pivot_signals(data.index, detector.confirmations, data["Close"], mode)
+
+
+def _directional_change_stage(data, threshold):
+    from scripts.technical.trend_detector import DirectionalChange
+
+    detector = DirectionalChange(data, threshold=threshold)
+    detector.fit()
+    return detector.confirmations
+
+
+def _directional_change_signal(data, confirmations, threshold, mode="reversal"):
+    return pivot_signals(data.index, confirmations, data["Close"], mode)
+
+
+def _profile_stage(data, bin_size, profile_type="VolumeProfile", freq="1D"):
+    profiles = session_profiles(data, profile_type, freq, bin_size=bin_size)
+    # keep the fitted profiles, not the bars they were fitted on
+    detached = {}
+    for session, fitted in profiles.items():
+        analyzer = type(fitted)(None, bin_size=fitted.bin_size, perc=fitted.perc)
+        analyzer.profile, analyzer.poc, analyzer.va = fitted.profile, fitted.poc, fitted.va
+        detached[session] = analyzer
+    return detached
+
+
+def _profile_signal(
+    data, profiles, bin_size, perc, profile_type="VolumeProfile", freq="1D",
+    mode="rejection", exit=True,
+):
+    levels = profile_levels(data.index, profiles, freq, perc)
+    return level_signals(
+        data["Close"],
+        levels["VAL"],
+        levels["VAH"],
+        mode=mode,
+        high=data["High"],
+        low=data["Low"],
+        exit=levels["POC"] if exit else None,
+    )
+
+
+STRATEGIES = {
+    "zigzag": {"stage_params": ("depth",), "stage": _zigzag_stage, "signal": _zigzag_signal},
+    "directional_change": {
+        "stage_params": ("threshold",),
+        "stage": _directional_change_stage,
+        "signal": _directional_change_signal,
+    },
+    "profile": {
+        "stage_params": ("bin_size", "profile_type", "freq"),
+        "stage": _profile_stage,
+        "signal": _profile_signal,
+    },
+}
+
+
+def sweep(
+    datasets: dict,
+    strategy: str,
+    grid: dict,
+    output: str | Path | None = None,
+    processes: int | None = None,
+    cache_dir: str | Path | None = None,
+    progress: bool = True,
+    **backtest_params,
+) -> pd.DataFrame:
+    """
+    Backtest every combination of `grid` on every dataset.
+
+    Combinations sharing a symbol and the strategy's stage parameters form
+    one task, so their intermediate (ZigZag extrema for a `depth`, session
+    profiles for a `bin_size`) is computed once and reused for every
+    `threshold`/`perc`/`mode`. Intermediates are also stored in `cache_dir`
+    under a hash of the bars and parameters, so later sweeps over the same
+    data skip them. Tasks run on a process pool reading the bars from shared
+    memory, nothing is copied per task.
+
+    Params:
+    - datasets: Bars per symbol, DataFrames or `OHLCV`.
+    - strategy: "zigzag" (depth, threshold, mode), "directional_change"
+      (threshold, mode) or "profile" (bin_size, perc, profile_type, freq,
+      mode, exit).
+    - grid: Values per parameter, see `expand_grid`.
+    - output: Columnar result file, ".parquet" (needs pyarrow) or ".npz".
+    - processes: Pool size, all CPUs by default, 0 runs in this process.
+    - cache_dir: Directory of the intermediate cache, none by default.
+    - progress: Print progress and ETA to stderr.
+    - backtest_params: Passed on to `backtest` (fee, slippage, ...).
+
+    Returns one row per symbol and combination: the parameters and the
+    backtest metrics.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    stage_params = STRATEGIES[strategy]["stage_params"]
+    combinations = expand_grid(**grid)
+
+    arrays = {
+        symbol: data if isinstance(data, OHLCV) else OHLCV.from_frame(data)
+        for symbol, data in datasets.items()
+    }
+    digests = {symbol: _digest(bars) for symbol, bars in arrays.items()}
+
+    # one task per symbol and stage combination
+    tasks = {}
+    for symbol in arrays:
+        for number, params in enumerate(combinations):
+            stage = tuple((name, params[name]) for name in stage_params if name in params)
+            tasks.setdefault((symbol, stage), []).append((number, params))
+    tasks = [
+        (symbol, strategy, dict(stage), jobs, digests[symbol], cache_dir, backtest_params)
+        for (symbol, stage), jobs in tasks.items()
+    ]
+
+    order = {symbol: i for i, symbol in enumerate(arrays)}
+    rows = []
+    meter = _Progress(len(arrays) * len(combinations), progress)
+    with _shared_pool(arrays, processes) as pool:
+        for (symbol, _, _, jobs, *_), result in _map(pool, _run, tasks):
+            rows.extend((order[symbol], *row) for row in result)
+            meter.update(len(jobs))
+    meter.close()
+
+    rows.sort(key=lambda row: row[:2])
+    results = pd.DataFrame([row for _, _, row in rows])
+    if output is not None:
+        save_results(results, output)
+    return results
+
+
+def _run(symbol, strategy, stage_params, jobs, digest, cache_dir, backtest_params):
+    """
+    Compute (or load) the intermediate of one task and backtest its jobs,
+    returns (job number, row) pairs.
+    """
+    data = _dataset(symbol)
+    functions = STRATEGIES[strategy]
+    intermediate = _intermediate(data, strategy, stage_params, digest, cache_dir)
+
+    rows = []
+    for number, params in jobs:
+        signal = functions["signal"](data, intermediate, **params)
+        result = backtest(data, signal, **backtest_params)
+        rows.append((number, {"symbol": symbol, **params, **result.metrics}))
+    return rows
+
+
+# Shared memory
+# The parent publishes every symbol's OHLCV columns once, workers attach to
+# them read-only and build their DataFrames on top without copying.
+_shared = None
+_datasets = {}
+
+
+@contextmanager
+def _shared_pool(arrays: dict, processes: int | None):
+    """
+    Process pool whose workers read `arrays` (symbol -> `OHLCV`) from a
+    `SharedDataset`, or None for processes=0, where `_map` runs the tasks here.
+    """
+    global _datasets
+    if processes == 0:
+        _datasets = {symbol: bars.to_frame() for symbol, bars in arrays.items()}
+        try:
+            yield None
+        finally:
+            _datasets = {}
+        return
+
+    with SharedDataset.publish(arrays) as dataset:
+        with ProcessPoolExecutor(processes, initializer=_attach, initargs=(dataset.name,)) as pool:
+            yield pool
+
+
+def _map(pool, function, tasks):
+    """(task, result) pairs of `function(*task)`, in order of completion."""
+    if pool is None:
+        for task in tasks:
+            yield task, function(*task)
+        return
+    futures = {pool.submit(function, *task): task for task in tasks}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def _attach(name: str):
+    global _shared
+    _shared = SharedDataset.attach(name)
+
+
+def _dataset(symbol: str) -> pd.DataFrame:
+    if symbol not in _datasets:
+        _datasets[symbol] = _shared.frame(symbol)
+    return _datasets[symbol]
+
+
+# Intermediate cache
+# Keyed by a hash of the bars, strategy and stage parameters. The last few are
+# kept in memory for the tasks a worker runs next, all of them in `cache_dir`.
+_intermediates = OrderedDict()
+_MEMORY_ITEMS = 8
+# bump when a stage's result changes (analyzer code or layout), older pickles
+# in a persistent `cache_dir` are then never hit
+CACHE_VERSION = 1
+
+
+def _intermediate(data, strategy, stage_params, digest, cache_dir):
+    key = _key(digest, strategy, stage_params)
+    if key in _intermediates:
+        _intermediates.move_to_end(key)
+        return _intermediates[key]
+    intermediate = _cache_load(cache_dir, key)
+    if intermediate is None:
+        intermediate = STRATEGIES[strategy]["stage"](data, **stage_params)
+        _cache_store(cache_dir, key, intermediate)
+    _intermediates[key] = intermediate
+    if len(_intermediates) > _MEMORY_ITEMS:
+        _intermediates.popitem(last=False)
+    return intermediate
+
+
+def _digest(bars: OHLCV) -> str:
+    digest = hashlib.sha1()
+    for column in (bars.dates, *(bars[name] for name in COLUMNS)):
+        digest.update(np.ascontiguousarray(column).data)
+    return digest.hexdigest()
+
+
+def _key(digest: str, strategy: str, stage_params: dict) -> str:
+    params = json.dumps(stage_params, sort_keys=True, default=str)
+    text = f"{CACHE_VERSION}:{digest}:{strategy}:{params}"
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _cache_load(cache_dir, key):
+    if cache_dir is None:
+        return None
+    path = Path(cache_dir) / f"{key}.pkl"
+    try:
+        with open(path, "rb") as file:
+            return pickle.load(file)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # missing, partial, or pickled by code that no longer exists
+        return None
+
+
+def _cache_store(cache_dir, key, value):
+    if cache_dir is None:
+        return
+    path = Path(cache_dir) / f"{key}.pkl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # write then rename, so concurrent workers never read a partial file
+    temporary = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporary, "wb") as file:
+        pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+
+
+# Result file
+def save_results(results: pd.DataFrame, path: str | Path) -> None:
+    """
+    Write `results` column by column: parquet for a ".parquet" path, else an
+    uncompressed ".npz" with one array per column (strings as unicode
+    arrays, no pickles).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".parquet":
+        results.to_parquet(path, index=False)
+        return
+    columns = {}
+    for name, column in results.items():
+        values = column.to_numpy()
+        if values.dtype == object:
+            values = column.astype(str).to_numpy(dtype=str)
+        columns[name] = values
+    np.savez(path, **columns)
+
+
+def load_results(path: str | Path, columns=None) -> pd.DataFrame:
+    """Read a result file written by `save_results`, optionally only `columns`."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, columns=columns)
+    with np.load(path, allow_pickle=False) as archive:
+        names = archive.files if columns is None else columns
+        return pd.DataFrame({name: archive[name] for name in names})
+
+
+class _Progress:
+    """Done/total, elapsed time and ETA of a run, on one stderr line."""
+
+    def __init__(self, total: int, enabled: bool = True, label: str = "sweep"):
+        self.total = total
+        self.label = label
+        self.done = 0
+        self.enabled = enabled
+        self.start = time.perf_counter()
+
+    def update(self, count: int = 1):
+        self.done += count
+        if not self.enabled:
+            return
+        elapsed = time.perf_counter() - self.start
+        eta = elapsed / self.done * (self.total - self.done)
+        percent = 100 * self.done / self.total if self.total else 100.0
+        sys.stderr.write(
+            f"\r{self.label} {self.done}/{self.total} ({percent:.0f}%) "
+            f"elapsed {elapsed:.1f}s eta {eta:.1f}s"
+        )
+        sys.stderr.flush()
+
+    def close(self):
+        if self.enabled and self.done:
+            sys.stderr.write("\n")
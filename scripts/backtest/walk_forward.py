@@ -0,0 +1,224 @@
+import math
+import tempfile
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from scripts.utils.ohlcv import OHLCV
+from .engine import backtest
+from .metrics import bars_per_year, metrics
+from .sweep import (
+    STRATEGIES,
+    expand_grid,
+    _Progress,
+    _dataset,
+    _digest,
+    _intermediate,
+    _map,
+    _shared_pool,
+)
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    """Folds with their chosen parameters, and the stitched out-of-sample run."""
+
+    folds: pd.DataFrame
+    equity: pd.Series
+    returns: pd.Series
+    positions: pd.Series
+    trades: pd.DataFrame
+    metrics: dict
+
+
+def fold_bounds(
+    index: pd.DatetimeIndex, train, test, step=None, anchored: bool = False
+) -> list[tuple[int, int, int, int]]:
+    """
+    Row positions (train start, train end, test start, test end) of rolling
+    folds, ends exclusive. Each test window follows its train window and
+    the folds advance by `step` (default `test`); with `anchored` the train
+    windows all start at the first bar and grow instead.
+
+    `train`, `test` and `step` are durations ("30D", `pd.Timedelta`) or
+    numbers of bars.
+    """
+    step = test if step is None else step
+    if all(isinstance(value, (int, np.integer)) for value in (train, test, step)):
+        positions = np.arange(len(index))
+        starts = positions[train::step]
+        edges = [(0 if anchored else s - train, s, min(s + test, len(index))) for s in starts]
+    else:
+        train, test, step = (pd.Timedelta(value) for value in (train, test, step))
+        starts = pd.date_range(index[0] + train, index[-1], freq=step)
+        edges = [
+            (
+                0 if anchored else index.searchsorted(s - train),
+                index.searchsorted(s),
+                index.searchsorted(s + test),
+            )
+            for s in starts
+        ]
+    return [(int(a), int(b), int(b), int(c)) for a, b, c in edges if a < b < c]
+
+
+def walk_forward(
+    data,
+    strategy: str,
+    grid: dict,
+    train="30D",
+    test="7D",
+    step=None,
+    anchored: bool = False,
+    objective: str = "sharpe",
+    processes: int | None = None,
+    cache_dir=None,
+    progress: bool = True,
+    **backtest_params,
+) -> WalkForwardResult:
+    """
+    Walk-forward optimization of a `sweep` strategy.
+
+    Every combination of `grid` is backtested on each train fold and the
+    best by `objective` (higher is better) is run on the following test
+    fold. The test runs are stitched into one out-of-sample equity curve.
+
+    Nothing is recomputed per fold: the strategies' signals are causal, so
+    each intermediate (ZigZag extrema, DirectionalChange state, session
+    profiles) and each combination's signal is computed once on the whole
+    history, carrying the state of the earlier bars into every fold, and
+    only the backtests are run per fold. On the shared-memory pool of `sweep`,
+    training runs one task per parameter group, which scores its combinations
+    on every train fold in turn (so each signal is computed once), then the
+    test folds run in parallel. When test folds overlap (`step < test`), a
+    fold's returns, positions and trades count only until the next one starts.
+
+    Params:
+    - data: Bars, a DataFrame or `OHLCV`.
+    - strategy, grid: As for `sweep`.
+    - train, test, step, anchored: Fold layout, see `fold_bounds`.
+    - objective: Metric of `metrics` maximized on the train folds.
+    - processes: Pool size, all CPUs by default, 0 runs in this process.
+    - cache_dir: Directory of the intermediate cache, a temporary one by default.
+    - progress: Print progress and ETA to stderr.
+    - backtest_params: Passed on to `backtest` (fee, slippage, ...).
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    bars = data if isinstance(data, OHLCV) else OHLCV.from_frame(data)
+    index = pd.DatetimeIndex(bars.index, name="Date")
+    folds = fold_bounds(index, train, test, step, anchored)
+    if not folds:
+        raise ValueError("History is too short for a single train and test fold")
+
+    combinations = expand_grid(**grid)
+    stage_params = STRATEGIES[strategy]["stage_params"]
+    groups = {}
+    for number, params in enumerate(combinations):
+        stage = tuple((name, params[name]) for name in stage_params if name in params)
+        groups.setdefault(stage, []).append((number, params))
+
+    with tempfile.TemporaryDirectory() as temporary:
+        cache_dir = temporary if cache_dir is None else cache_dir
+        digest = _digest(bars)
+        with _shared_pool({"data": bars}, processes) as pool:
+            # score every combination on every train fold
+            scores = np.full((len(folds), len(combinations)), -np.inf)
+            tasks = [
+                (strategy, dict(stage), jobs, folds, objective, digest, cache_dir, backtest_params)
+                for stage, jobs in groups.items()
+            ]
+            meter = _Progress(len(combinations), progress, "walk-forward")
+            for (_, _, jobs, *_), result in _map(pool, _train, tasks):
+                for number, fold_scores in result:
+                    scores[:, number] = fold_scores
+                meter.update(len(jobs))
+            meter.close()
+
+            # run the best combination of each fold on its test fold
+            best = scores.argmax(axis=1)
+            tasks = [
+                (strategy, combinations[number], fold, digest, cache_dir, backtest_params)
+                for fold, number in zip(folds, best)
+            ]
+            runs = {}
+            for task, result in _map(pool, _test, tasks):
+                runs[task[2]] = result
+
+    rows, returns, positions, trades = [], [], [], []
+    for number, (fold, params) in enumerate(zip(folds, (combinations[i] for i in best))):
+        a, b, c, d = fold
+        test_returns, test_positions, test_trades, test_metrics = runs[fold]
+        rows.append(
+            {
+                "fold": number,
+                "train_start": index[a],
+                "train_end": index[b - 1],
+                "test_start": index[c],
+                "test_end": index[d - 1],
+                **params,
+                f"train_{objective}": scores[number].max(),
+                **{f"test_{name}": value for name, value in test_metrics.items()},
+            }
+        )
+        returns.append(pd.Series(test_returns, index=index[c:d]))
+        positions.append(pd.Series(test_positions, index=index[c:d]))
+        if number + 1 < len(folds):
+            # the next fold takes over from its start
+            test_trades = test_trades[test_trades["entry"] < index[folds[number + 1][2]]]
+        trades.append(test_trades)
+
+    # overlapping test folds (step < test): a fold takes over from its start
+    returns = pd.concat(returns)
+    positions = pd.concat(positions)
+    keep = ~returns.index.duplicated(keep="last")
+    returns, positions = returns[keep].rename("returns"), positions[keep].rename("position")
+    trades = pd.concat(trades, ignore_index=True)
+    equity = (1 + returns).cumprod().rename("equity")
+
+    return WalkForwardResult(
+        folds=pd.DataFrame(rows),
+        equity=equity,
+        returns=returns,
+        positions=positions,
+        trades=trades,
+        metrics=metrics(
+            returns.to_numpy(),
+            positions.to_numpy(),
+            trades["return"].to_numpy(),
+            bars_per_year(returns.index),
+        ),
+    )
+
+
+def _train(strategy, stage_params, jobs, folds, objective, digest, cache_dir, backtest_params):
+    """`objective` of each job on each train fold, as (job number, scores) pairs."""
+    data = _dataset("data")
+    intermediate = _intermediate(data, strategy, stage_params, digest, cache_dir)
+    results = []
+    for number, params in jobs:
+        signal = STRATEGIES[strategy]["signal"](data, intermediate, **params)
+        scores = []
+        for a, b, _, _ in folds:
+            score = backtest(data.iloc[a:b], signal[a:b], **backtest_params).metrics[objective]
+            scores.append(-math.inf if score is None or math.isnan(score) else score)
+        results.append((number, scores))
+    return results
+
+
+def _test(strategy, params, fold, digest, cache_dir, backtest_params):
+    """Returns, positions, trades and metrics of `params` on a test fold."""
+    data = _dataset("data")
+    stage_params = {
+        name: params[name] for name in STRATEGIES[strategy]["stage_params"] if name in params
+    }
+    intermediate = _intermediate(data, strategy, stage_params, digest, cache_dir)
+    signal = STRATEGIES[strategy]["signal"](data, intermediate, **params)
+    _, _, c, d = fold
+    result = backtest(data.iloc[c:d], signal[c:d], **backtest_params)
+    return (
+        result.returns.to_numpy(),
+        result.positions.to_numpy(),
+        result.trades,
+        result.metrics,
+    )
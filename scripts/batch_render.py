@@ -0,0 +1,193 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from pathlib import Path
+
+import pandas as pd
+
+from scripts.utils.shared_dataset import SharedDataset
+
+PROFILE_CHARTS = ("MarketProfile", "VolumeProfile")
+TREND_CHARTS = ("ZigZag", "DirectionalChange")
+
+# per-worker state: matplotlib figures reused across jobs, keyed by chart kind,
+# and the data published by `render_batch`
+_figures = {}
+_shared = None
+
+
+def _init_worker(dataset: str | None = None):
+    """Use the headless Agg backend in each worker process."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+    global _shared
+    if dataset is not None:
+        _shared = SharedDataset.attach(dataset)
+
+
+def _load(data_dir: str, symbol: str, timeframe: str, start, end) -> pd.DataFrame:
+    key = f"{symbol.lower()}{timeframe}"
+    if _shared is not None and key in _shared:
+        return _shared.frame(key)
+    csv_file = Path(data_dir) / f"{key}.csv"
+    data = pd.read_csv(csv_file, index_col=["Date"], parse_dates=["Date"])
+    return data.loc[start:end]
+
+
+def render_chart(
+    symbol: str,
+    timeframe: str,
+    chart: str,
+    fmt: str,
+    output_dir: str,
+    data_dir: str = "./data",
+    start: str | None = None,
+    end: str | None = None,
+    params: dict | None = None,
+) -> dict:
+    """
+    Load one symbol/timeframe from the local store, fit `chart` and write it
+    to `output_dir` as `fmt` ("png", "svg" or, for "Plotter", "html").
+
+    Returns the output path and the seconds spent loading, fitting and rendering.
+    """
+    import matplotlib.pyplot as plt
+
+    timings = {}
+    started = time.perf_counter()
+    data = _load(data_dir, symbol, timeframe, start, end)
+    timings["load"] = time.perf_counter() - started
+
+    output_path = Path(output_dir) / f"{symbol.lower()}{timeframe}-{chart}.{fmt}"
+    params = params or {}
+
+    started = time.perf_counter()
+    if chart in PROFILE_CHARTS:
+        from scripts.technical import profile_analyzer
+
+        analyzer = getattr(profile_analyzer, chart)(data, **params)
+        analyzer.fit()
+        # as the analyzers create their own figure
+        figure = {"figsize": (20, 8), "facecolor": "black"}
+    elif chart in TREND_CHARTS:
+        from scripts.technical import trend_detector
+
+        analyzer = getattr(trend_detector, chart)(data, **params)
+        analyzer.fit()
+        figure = {"figsize": (20, 6)}
+    elif chart == "Plotter":
+        from scripts.plottingv2 import Plotter
+
+        analyzer = Plotter(data)
+        analyzer.configure(**params)
+    else:
+        raise ValueError(f"Unknown chart type: {chart}")
+    timings["fit"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if chart == "Plotter":
+        analyzer.plot(
+            instrument=f"{symbol} {timeframe}",
+            show_fig=False,
+            output_path=str(output_path),
+        )
+    else:
+        if chart not in _figures:
+            _figures[chart] = plt.figure(**figure)
+        analyzer.plot(fig=_figures[chart], save_path=output_path)
+    timings["render"] = time.perf_counter() - started
+
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "chart": chart,
+        "path": str(output_path),
+        **timings,
+        "total": sum(timings.values()),
+    }
+
+
+def render_batch(
+    symbols: list[str],
+    timeframes: list[str],
+    charts: list[str] = PROFILE_CHARTS,
+    formats: list[str] = ("png",),
+    output_dir: str = "./output/batch",
+    data_dir: str = "./data",
+    start: str | None = None,
+    end: str | None = None,
+    params: dict | None = None,
+    processes: int | None = None,
+) -> pd.DataFrame:
+    """
+    Render every (symbol, timeframe, chart, format) combination headlessly on
+    a process pool.
+
+    Params:
+    - symbols: Trading pairs in the local store (e.g., ["BTCUSDT", "ETHUSDT"]).
+    - timeframes: Timeframes (e.g., ["1h", "1d"]).
+    - charts: "MarketProfile", "VolumeProfile", "ZigZag", "DirectionalChange"
+      or "Plotter" (html only).
+    - formats: Output formats, "png"/"svg" for matplotlib charts, "html" for Plotter.
+    - output_dir: Directory the charts are written to.
+    - data_dir: Directory of the local csv store.
+    - start, end: Optional date range of the data to chart.
+    - params: Keyword arguments per chart type, e.g. {"ZigZag": {"depth": 20}}.
+    - processes: Number of worker processes (default: number of CPUs).
+
+    Returns one row per chart with its path and load/fit/render timings, or
+    the error if it failed.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    params = params or {}
+
+    jobs = [
+        (symbol, timeframe, chart, fmt)
+        for symbol, timeframe, chart, fmt in product(symbols, timeframes, charts, formats)
+        if (fmt == "html") == (chart == "Plotter")
+    ]
+
+    results = []
+
+    # read each series once and share it with every worker, instead of each
+    # job reading (and holding) its own copy; unreadable ones fail per job
+    series = {}
+    for symbol, timeframe in {(symbol, timeframe) for symbol, timeframe, *_ in jobs}:
+        try:
+            series[f"{symbol.lower()}{timeframe}"] = _load(data_dir, symbol, timeframe, start, end)
+        except (OSError, ValueError):
+            pass
+
+    with SharedDataset.publish(series) as dataset, ProcessPoolExecutor(
+        max_workers=processes or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(dataset.name,),
+    ) as pool:
+        futures = {
+            pool.submit(
+                render_chart,
+                symbol,
+                timeframe,
+                chart,
+                fmt,
+                output_dir,
+                data_dir,
+                start,
+                end,
+                params.get(chart),
+            ): (symbol, timeframe, chart, fmt)
+            for symbol, timeframe, chart, fmt in jobs
+        }
+        for future in as_completed(futures):
+            symbol, timeframe, chart, fmt = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(
+                    {"symbol": symbol, "timeframe": timeframe, "chart": chart, "error": repr(e)}
+                )
+
+    return pd.DataFrame(results)
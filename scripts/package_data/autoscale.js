@@ -1,6 +1,6 @@
 if (!window.autoscale_range) {
     window.autoscale_range = function (range, min, max, pad = true) {
-        if (min != Infinity && max != Infinity) {
+        if (min != Infinity && max != -Infinity) {
             pad = pad ? (max - min) * 0.05 : 0;
             range.start = min - pad
             range.end = max + pad
@@ -8,79 +8,98 @@ if (!window.autoscale_range) {
     }
 }
 
-clearTimeout(window.autoscale_timeout);
-
-window.autoscale_timeout = setTimeout(function () {
-    "use strict"
-
-    let start_index = cb_obj.start,
-        end_index = cb_obj.end;
-
-    let i = Math.max(Math.floor(start_index), 0),
-        j = Math.min(Math.ceil(end_index), source.data["High"].length);
-
-    let min = Math.min.apply(null, source.data["Low"].slice(i, j)),
-        max = Math.max.apply(null, source.data["High"].slice(i, j));
-
-    autoscale_range(y_range, min, max, true)
-
-    try {
-        if (top_range) {
-            let max = Math.max.apply(null, top_source.data['High'].slice(i, j)),
-                min = Math.min.apply(null, top_source.data['Low'].slice(i, j));
-            autoscale_range(top_range, min, max, true);
+if (!window.autoscale_bounds) {
+    // rows of source within [start, end]: positional, or by binary search on
+    // the "index" column when the source holds a subset of rows (LOD tiers)
+    window.autoscale_bounds = function (source, start, end) {
+        const x = source.data["index"],
+            n = source.data["High"].length;
+        if (!x || x.length == 0 || (x[0] == 0 && x[x.length - 1] == n - 1)) {
+            return [Math.max(Math.floor(start), 0), Math.min(Math.ceil(end), n)];
         }
-    } catch (error) {
-        console.error('No top range');
+        let bisect = function (value) {
+            let lo = 0,
+                hi = x.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (x[mid] < value) lo = mid + 1;
+                else hi = mid;
+            }
+            return lo;
+        };
+        return [Math.max(bisect(start) - 1, 0), Math.min(bisect(end) + 1, n)];
     }
+}
 
-    try {
-        if (bot_range_1) {
-            let max = Math.max.apply(null, bot_source_1.data['High'].slice(i, j)),
-                min = Math.min.apply(null, bot_source_1.data['Low'].slice(i, j));
-            autoscale_range(bot_range_1, min, max, true);
+if (!window.autoscale_extent) {
+    // min of `low` and max of `high` over [i, j), skipping NaN (indicator warm-up)
+    window.autoscale_extent = function (low, high, i, j) {
+        let min = Infinity,
+            max = -Infinity;
+        for (let k = i; k < j; k++) {
+            if (low[k] < min) min = low[k];
+            if (high[k] > max) max = high[k];
         }
-    } catch (error) {
-        console.error('No bottom_1 range');
+        return [min, max];
     }
+}
 
-    try {
-        if (bot_range_2) {
-            let max = Math.max.apply(null, bot_source_2.data['High'].slice(i, j)),
-                min = Math.min.apply(null, bot_source_2.data['Low'].slice(i, j));
-            autoscale_range(bot_range_2, min, max, true);
-        }
-    } catch (error) {
-        console.error('No bottom_2 range');
-    }
+if (!window.autoscale_query) {
+    // min/max of rows [i, j) from the block segment tree built in Python:
+    // partial blocks at both ends are scanned, whole blocks cost O(log n)
+    window.autoscale_query = function (pyramid, block, low, high, i, j) {
+        const tree_min = pyramid.data["min"],
+            tree_max = pyramid.data["max"],
+            size = tree_min.length / 2;
 
-    try {
-        if (bot_range_3) {
-            let max = Math.max.apply(null, bot_source_3.data['High'].slice(i, j)),
-                min = Math.min.apply(null, bot_source_3.data['Low'].slice(i, j));
-            autoscale_range(bot_range_3, min, max, true);
+        let bi = Math.ceil(i / block),
+            bj = Math.floor(j / block);
+        if (bi >= bj) {
+            return autoscale_extent(low, high, i, j);
         }
-    } catch (error) {
-        console.error('No bottom_3 range');
-    }
 
-    try {
-        if (bot_range_4) {
-            let max = Math.max.apply(null, bot_source_4.data['High'].slice(i, j)),
-                min = Math.min.apply(null, bot_source_4.data['Low'].slice(i, j));
-            autoscale_range(bot_range_4, min, max, true);
+        let [min, max] = autoscale_extent(low, high, i, bi * block),
+            [tail_min, tail_max] = autoscale_extent(low, high, bj * block, j);
+        if (tail_min < min) min = tail_min;
+        if (tail_max > max) max = tail_max;
+
+        for (let l = bi + size, r = bj + size; l < r; l >>= 1, r >>= 1) {
+            if (l & 1) {
+                if (tree_min[l] < min) min = tree_min[l];
+                if (tree_max[l] > max) max = tree_max[l];
+                l++;
+            }
+            if (r & 1) {
+                r--;
+                if (tree_min[r] < min) min = tree_min[r];
+                if (tree_max[r] > max) max = tree_max[r];
+            }
         }
-    } catch (error) {
-        console.error('No bottom_4 range');
+        return [min, max];
     }
+}
 
-    try {
-        if (bot_range_5) {
-            let max = Math.max.apply(null, bot_source_5.data['High'].slice(i, j)),
-                min = Math.min.apply(null, bot_source_5.data['Low'].slice(i, j));
-            autoscale_range(bot_range_5, min, max, true);
-        }
-    } catch (error) {
-        console.error('No bottom_5 range');
+clearTimeout(window.autoscale_timeout);
+
+window.autoscale_timeout = setTimeout(function () {
+    "use strict"
+
+    let start_index = cb_obj.start,
+        end_index = cb_obj.end;
+
+    let [si, sj] = autoscale_bounds(source, start_index, end_index);
+    let [min, max] = autoscale_query(
+        pyramid, block, source.data["Low"], source.data["High"], si, sj
+    );
+
+    autoscale_range(y_range, min, max, true)
+
+    // indicator figures below the main chart, scaled on their own column
+    for (let k = 0; k < bottom_ranges.length; k++) {
+        let values = bottom_sources[k].data[bottom_columns[k]],
+            i = Math.max(Math.floor(start_index), 0),
+            j = Math.min(Math.ceil(end_index), values.length);
+        let [min, max] = autoscale_query(bottom_pyramids[k], block, values, values, i, j);
+        autoscale_range(bottom_ranges[k], min, max, true);
     }
 }, 50);
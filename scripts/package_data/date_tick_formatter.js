@@ -0,0 +1,12 @@
+// Label an x tick (row position) with the date of that row, e.g. "Jan 05 2024".
+// `dates` holds one int64 timestamp in ms per row, shared by all subplots.
+const ts = dates.data["Date"][Math.round(tick)];
+if (ts === undefined) {
+    return "";
+}
+
+const d = new Date(Number(ts)),
+    months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+    day = String(d.getUTCDate()).padStart(2, "0");
+
+return `${months[d.getUTCMonth()]} ${day} ${d.getUTCFullYear()}`;
@@ -0,0 +1,40 @@
+if (!window.lod_bisect) {
+    window.lod_bisect = function (values, x) {
+        let lo = 0,
+            hi = values.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (values[mid] < x) lo = mid + 1;
+            else hi = mid;
+        }
+        return lo;
+    }
+}
+
+clearTimeout(window.lod_timeout);
+
+window.lod_timeout = setTimeout(function () {
+    "use strict"
+
+    const start = cb_obj.start,
+        end = cb_obj.end,
+        span = end - start;
+
+    // tiers are ordered coarsest first: take the finest one that keeps the
+    // visible window under lod_points candles
+    let t = 0;
+    while (t < tiers.length - 1 && span / buckets[t + 1] <= lod_points) {
+        t++;
+    }
+
+    // keep one extra window on each side so panning doesn't show gaps
+    const tier = tiers[t].data,
+        i = Math.max(lod_bisect(tier["index"], start - span) - 1, 0),
+        j = Math.min(lod_bisect(tier["index"], end + span) + 1, tier["index"].length);
+
+    const data = {};
+    for (const key of Object.keys(tier)) {
+        data[key] = tier[key].slice(i, j);
+    }
+    source.data = data;
+}, 50);
@@ -1,23 +1,41 @@
 import sys
 import os
 
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "")))
+# the repository root, so that running this file directly imports the same
+# `scripts.*` modules (and instrumentation registry) as everything else
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 
-import technical.profile_analyzer as Profiler
-from utils.downloader import downloader
-from utils.ccxt_helpers import timeframe_to_seconds
+import scripts.technical.profile_analyzer as Profiler
+import scripts.technical.trend_detector as TrendDetector
+from scripts.utils.downloader import downloader
+from scripts.utils.instrumentation import timed, timer
+from scripts.utils.live_feed import LiveFeed
+from scripts.utils.live_worker import LiveWorker
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Data and analytics of one live tick, produced off the GUI thread."""
+
+    data: pd.DataFrame
+    profile: pd.DataFrame
+    poc: tuple
+    value_area: tuple
+    profile_type: str
+    pivots: tuple = ()
 
 
 class Plotting:
     def __init__(
-        self, symbol: str, timeframe: str = "5m", interval: int = 1
+        self, symbol: str, timeframe: str = "5m", interval: int = 1, max_bins: int = 500
     ):
         """
         Initializes the live plotter for Market Profile.
@@ -27,11 +45,15 @@ class Plotting:
         - timeframe: Timeframe (e.g., "1h").
         - limit: Number of candles to fetch.
         - interval: Update interval in seconds.
+        - max_bins: Size of the pool of profile bars, larger profiles are drawn
+          with adjacent bins merged.
         """
         self.symbol = symbol
         self.timeframe = timeframe
         self.interval = interval
+        self.max_bins = max_bins
         self.data_path = Path(f"./data/{symbol.lower()}{timeframe}.csv")
+        self.feed = None  # in-memory feed of the last candles in live mode
 
         # Create figure and axes
         self.fig, self.axes = plt.subplots(
@@ -52,9 +74,33 @@ class Plotting:
         self.poc_line_1 = self.axes[1].axhline(
             0, color="white", linestyle="-", linewidth=1.5
         )
-        self.profile_bars = None  # Market Profile bars
+        (self.pivot_line,) = self.axes[0].plot(
+            [], [], color="#F2F6D0", linestyle="--", linewidth=1, marker="o", markersize=4
+        )
 
-        self.texts = {}  # Dictionary to hold text labels
+        # Fixed pool of profile bars, updated in place on every frame
+        # convert hex to rbg: #ffb22c ---> (255, 178, 44) ---> (1, 0.7, 0.17) --- (num of rgb / 255)
+        self.bar_colors = np.tile([1, 0.7, 0.17, 1.0], (max_bins, 1))
+        self.profile_bars = self.axes[1].barh(
+            np.zeros(max_bins),
+            np.zeros(max_bins),
+            height=0,
+            color=self.bar_colors,
+            edgecolor="black",
+        )
+        for bar in self.profile_bars:
+            bar.set_visible(False)
+
+        # Dictionary to hold text labels
+        self.texts = {
+            label: self.axes[1].text(
+                0, 0, f"◀ {label}", fontsize=8, fontweight="bold", color="white"
+            )
+            for label in ("POC", "VAL", "VAH")
+        }
+        self.limits = None  # (xlim, ylim, profile xlim) of the last full draw
+        self.worker = None  # background producer of snapshots in live mode
+        self.artists = []  # artists of the last drawn snapshot, blitted again on idle frames
 
         # Configure Axes
         for ax in self.axes:
@@ -71,6 +117,7 @@ class Plotting:
         self.axes[1].invert_xaxis()
         self.axes[1].yaxis.tick_right()
 
+    @timed("get_data")
     def get_data(self, exchange_id: str, start: str | None, end: str | None, is_live: bool = False):
         """Loads data from a local file or downloads it if missing."""
 
@@ -87,25 +134,18 @@ class Plotting:
         def load_data():
             """Helper function to load data from the local file if it exists."""
             if self.data_path.exists():
-                return pd.read_csv(self.data_path, index_col=["Date"], parse_dates=["Date"])
+                with timer("csv_parse"):
+                    return pd.read_csv(self.data_path, index_col=["Date"], parse_dates=["Date"])
             return None
 
         # plot realtime price
         if is_live:
-            # set start date to download data
-            since = None
-            csv_data = load_data()
-            if csv_data is None:
-                since = (datetime.now() - timedelta(seconds=(timeframe_to_seconds(self.timeframe) * 100 * 86400)))
-            else:
-                since = csv_data.index[-1]
-
-            download_data(start=since)
-
-            # Read only the last 100 rows instead of the entire file
-            csv_data = pd.read_csv(self.data_path, index_col=["Date"], parse_dates=["Date"])
-            return csv_data[-100:] if len(csv_data) > 100 else csv_data
-        
+            # the feed reads the local store once, then only fetches candles newer than its head
+            if self.feed is None:
+                self.feed = LiveFeed(exchange_id, self.symbol, self.timeframe, size=100)
+                return self.feed.prime()
+            return self.feed.refresh()
+
         # plot static price
         if start is None:
             raise ValueError("start date is required but missing")
@@ -137,130 +177,191 @@ class Plotting:
         data = self.get_data(exchange_id, start, end)
         profile, poc, value_area = getattr(Profiler, profile_type)(data).fit()
 
-        # ** LEFT CHART: Price time series **
-        self.price_line.set_data(data.index, data["Close"])
-        self.poc_line_0.set_ydata([poc[1]])
-
-        self.axes[0].set_xlim(data.index.min(), data.index.max())
-        self.axes[0].set_ylim(data["Low"].min(), data["High"].max())
-
-        # **RIGHT CHART: Market Profile (Price Distribution)**
-        alphas = np.where(
-            (profile["Price"] >= value_area[0]) & (profile["Price"] <= value_area[1]),
-            1,
-            0.5,
-        )
-        # convert hex to rbg: #ffb22c ---> (255, 178, 44) ---> (1, 0.7, 0.17) --- (num of rgb / 255)
-        colors = np.row_stack([[1, 0.7, 0.17, a] for a in alphas])
-
-        # Plot to chart
-        self.profile_bars = self.axes[1].barh(
-            profile["Price"][:-1],
-            (
-                profile["TPOs"][:-1]
-                if profile_type == "MarketProfile"
-                else profile["Volume"][:-1]
-            ),
-            orientation="horizontal",
-            height=np.diff(profile["Price"]),
-            color=colors,
-            edgecolor="black",
-        )
-        self.poc_line_1.set_ydata([poc[1]])
-
-        # Update text labels
-        label_positions = {"POC": poc[1], "VAL": value_area[0], "VAH": value_area[1]}
-        for label, y in label_positions.items():
-            if label not in self.texts:
-                self.texts[label] = self.axes[1].text(
-                    0, y, f"◀ {label}", fontsize=8, fontweight="bold", color="white"
-                )
-            else:
-                self.texts[label].set_position((0, y))
+        self.render(data, profile, poc, value_area, profile_type, outside_alpha=0.5)
+        self.set_titles(profile_type)
 
         # kde
         # axes[1].plot(self.pdf * sigma, price_range, color="#F2F6D0", linestyle="--", linewidth=1.5)
         # axes[1].scatter(self.pdf[peaks] * sigma, price_levels, color="#F2F6D0", s=50, marker='x')
-        self.axes[1].set_title(
-            "Market Profile" if profile_type == "MarketProfile" else "Volume Profile",
-            fontweight="bold",
-            color="#FFB22C",
-        )
 
         # Show plot
         plt.show()
 
-    def update(self, frame, exchange_id: str, profile_type: str):
-        """Plot price and market/volume profile based on historical price data and realtime."""
-        # Get price data
-        data = self.get_data(exchange_id, start=None, end=None, is_live=True)
+    @timed("snapshot")
+    def snapshot(
+        self, exchange_id: str, profile_type: str, trend_type: str | None = None
+    ) -> Snapshot:
+        """Fetch the latest data and compute the profile (and pivots) of one tick."""
+        # Copy out of the feed buffer, which the next tick overwrites
+        data = self.get_data(exchange_id, start=None, end=None, is_live=True).copy()
 
         # Compute profile
         profile, poc, value_area = getattr(Profiler, profile_type)(data).fit()
 
+        pivots = ()
+        if trend_type is not None:
+            pivots = tuple(getattr(TrendDetector, trend_type)(data).fit())
+
+        return Snapshot(data, profile, tuple(poc), tuple(value_area), profile_type, pivots)
+
+    def update(self, frame, exchange_id: str, profile_type: str):
+        """Plot price and market/volume profile based on historical price data and realtime."""
+        return self.draw_snapshot(self.snapshot(exchange_id, profile_type))
+
+    @timed("plot_update")
+    def draw_snapshot(self, snapshot: Snapshot):
+        artists, limits_changed = self.render(
+            snapshot.data,
+            snapshot.profile,
+            snapshot.poc,
+            snapshot.value_area,
+            snapshot.profile_type,
+            outside_alpha=0.3,
+            pivots=snapshot.pivots,
+        )
+
+        # New limits move ticks and grid, which are not blitted: redraw the
+        # static parts once so the animation caches a fresh background
+        if limits_changed:
+            self.fig.canvas.draw()
+
+        self.artists = artists
+        return artists
+
+    def render_latest(self, frame):
+        """Animation callback: render the newest snapshot of the worker, if any."""
+        snapshot = self.worker.latest()
+        if snapshot is None:
+            # an empty list would make the animation fall back to a full draw,
+            # which leaves out the animated artists: blit the last ones again
+            return self.artists
+        return self.draw_snapshot(snapshot)
+
+    def render(
+        self,
+        data,
+        profile,
+        poc,
+        value_area,
+        profile_type: str,
+        outside_alpha: float,
+        pivots=(),
+    ):
+        """
+        Update the persistent artists in place.
+
+        Returns the artists that changed and whether the axes limits changed.
+        """
+        column = "TPOs" if profile_type == "MarketProfile" else "Volume"
+        prices = profile["Price"].to_numpy()
+        heights = np.diff(prices)
+        values = profile[column].to_numpy()[: len(heights)]
+        # barh centers bars on y
+        bottoms = prices[: len(heights)] - heights / 2
+        tops = bottoms + heights
+        if len(heights) > self.max_bins:
+            # merge adjacent bins so the whole profile fits the pool of bars
+            starts = np.arange(0, len(heights), -(-len(heights) // self.max_bins))
+            values = np.add.reduceat(values, starts)
+            tops = tops[np.append(starts[1:] - 1, len(heights) - 1)]
+            bottoms = bottoms[starts]
+        centers = (bottoms + tops) / 2
+        n = len(values)
+
         # ** Update Price Chart **
         self.price_line.set_data(data.index, data["Close"])
         self.poc_line_0.set_ydata([poc[1]])
-
-        self.axes[0].set_xlim(data.index.min(), data.index.max())
-        self.axes[0].set_ylim(data["Low"].min(), data["High"].max())
+        if pivots:
+            pivot_dates, pivot_prices, _ = zip(*pivots)
+            self.pivot_line.set_data(pivot_dates, pivot_prices)
+        else:
+            self.pivot_line.set_data([], [])
 
         # ** Update Profiler Chart **
-        alphas = np.where(
-            (profile["Price"] >= value_area[0]) & (profile["Price"] <= value_area[1]),
+        self.bar_colors[:n, 3] = np.where(
+            (centers >= value_area[0]) & (centers <= value_area[1]),
             1,
-            0.3,
-        )
-        colors = np.row_stack([[1, 0.7, 0.17, a] for a in alphas])
-
-        # Remove old bars before plotting new ones
-        if self.profile_bars is not None:
-            for bar in self.profile_bars:
-                bar.remove()
-
-        # Plot bar chart
-        self.profile_bars = self.axes[1].barh(
-            profile["Price"][:-1],
-            (
-                profile["TPOs"][:-1]
-                if profile_type == "MarketProfile"
-                else profile["Volume"][:-1]
-            ),
-            orientation="horizontal",
-            height=np.diff(profile["Price"]),
-            color=colors,
-            edgecolor="black",
+            outside_alpha,
         )
+        for i, bar in enumerate(self.profile_bars):
+            if i < n:
+                bar.set_y(bottoms[i])
+                bar.set_height(tops[i] - bottoms[i])
+                bar.set_width(values[i])
+                bar.set_facecolor(self.bar_colors[i])
+                bar.set_visible(True)
+            elif bar.get_visible():
+                bar.set_visible(False)
 
         self.poc_line_1.set_ydata([poc[1]])
 
         # Update text labels
         label_positions = {"POC": poc[1], "VAL": value_area[0], "VAH": value_area[1]}
         for label, y in label_positions.items():
-            if label not in self.texts:
-                self.texts[label] = self.axes[1].text(
-                    0, y, f"◀ {label}", fontsize=8, fontweight="bold", color="white"
-                )
-            else:
-                self.texts[label].set_position((0, y))
+            self.texts[label].set_position((0, y))
+
+        # Profile width grows in steps so a forming candle doesn't rescale every frame
+        profile_xlim = self.limits[2] if self.limits else 1
+        value_max = values.max() if n else 0
+        if value_max > profile_xlim or 0 < value_max < profile_xlim / 2:
+            profile_xlim = value_max * 1.25
+
+        limits = (
+            (data.index.min(), data.index.max()),
+            (data["Low"].min(), data["High"].max()),
+            profile_xlim,
+        )
+        limits_changed = limits != self.limits
+        if limits_changed:
+            self.axes[0].set_xlim(*limits[0])
+            self.axes[0].set_ylim(*limits[1])
+            self.axes[1].set_xlim(profile_xlim, 0)  # inverted
+            self.limits = limits
+
+        artists = [self.price_line, self.pivot_line, self.poc_line_0, self.poc_line_1]
+        artists.extend(self.profile_bars[:n])
+        artists.extend(self.texts.values())
+
+        return artists, limits_changed
 
+    def set_titles(self, profile_type: str):
         self.axes[1].set_title(
             "Market Profile" if profile_type == "MarketProfile" else "Volume Profile",
             fontweight="bold",
             color="#FFB22C",
         )
 
-        self.fig.canvas.draw_idle()
+    def live(
+        self,
+        exchange_id: str = "binance",
+        profile_type: str = "MarketProfile",
+        trend_type: str | None = None,
+        render_interval: float = 0.1,
+    ):
+        """
+        Fetch and compute on a background thread, render the newest snapshot
+        every `render_interval` seconds on the GUI thread.
 
-    def live(self, exchange_id: str = "binance", profile_type: str = "MarketProfile"):
-        anim = FuncAnimation(
+        Returns the metrics of the background worker once the window is closed.
+        """
+        self.set_titles(profile_type)
+        self.worker = LiveWorker(
+            lambda: self.snapshot(exchange_id, profile_type, trend_type),
+            interval=self.interval,
+        )
+        self.worker.start()
+        self.anim = FuncAnimation(
             self.fig,
-            self.update,
-            interval=self.interval * 1000,
+            self.render_latest,
+            interval=render_interval * 1000,
             cache_frame_data=False,
-            fargs=(
-                exchange_id,
-                profile_type,
-            ),
+            blit=True,
         )
-        plt.show()
+        try:
+            plt.show()
+        finally:
+            self.worker.stop()
+            # the feed's writer is a daemon thread: flush the closed candles it holds
+            if self.feed is not None:
+                self.feed.close()
+        return self.worker.metrics.as_dict()
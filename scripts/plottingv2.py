@@ -1,15 +1,18 @@
+import numpy as np
 import pandas as pd
 from typing import Union
 
 from importlib import resources as pkg_resources
 
-from bokeh.io import curdoc, output_notebook
+from bokeh.io import curdoc, output_notebook, save
 from bokeh.plotting import figure, output_file, show
-from bokeh.layouts import gridplot, layout
+from bokeh.layouts import gridplot, layout, row
 from bokeh.transform import factor_cmap
 from bokeh.models import (
     ColumnDataSource,
+    Span,
     CustomJS,
+    CustomJSTickFormatter,
     HoverTool,
     CrosshairTool,
     NumeralTickFormatter,
@@ -18,6 +21,9 @@ from bokeh.models import (
 from bokeh.models.annotations import Title
 
 from scripts import package_data as pkgdata
+from scripts.utils.downsample import lttb, minmax_ohlc
+from scripts.utils.instrumentation import timed
+from scripts.utils.live_worker import LiveWorker
 
 
 class Plotter:
@@ -33,6 +39,9 @@ class Plotter:
 
     plot()
         Creates a trading chart of OHLC price data and indicators.
+
+    serve(feed)
+        Serves a live, streaming chart of a LiveFeed on a local Bokeh server.
     """
 
     def __init__(self, data: Union[pd.Series, pd.DataFrame] = None):
@@ -46,11 +55,17 @@ class Plotter:
         self._bottom_fig_height = 150
         self._jupyter_notebook = False
         self._line_chart = False
-
+        self._lod_points = None
+        self._lod_max_points = 500_000
+        self._lod_factor = 4
+        self._autoscale_block = 64
+        self._output_backend = "canvas"
+
+        # `serve` takes its data from a feed, only `plot` needs it here
+        self._data = None
         if data is None:
-            raise ValueError("Data is required but missing!")
-
-        if isinstance(data, pd.Series):
+            pass
+        elif isinstance(data, pd.Series):
             self._data = self._reindex_data(data)
             self._line_chart = True
         elif isinstance(data, pd.DataFrame):
@@ -61,6 +76,10 @@ class Plotter:
         # Load Javascript code for auto-scaling
         self._autoscale_args = {}
         self._autoscale_code = pkg_resources.read_text(pkgdata, "autoscale.js")
+        self._lod_code = pkg_resources.read_text(pkgdata, "lod.js")
+        self._date_tick_code = pkg_resources.read_text(
+            pkgdata, "date_tick_formatter.js"
+        )
 
     def add_tool(self, tool_name: str):
         """Adds a tool to the plot.
@@ -90,6 +109,9 @@ class Plotter:
         bottom_fig_height: int = None,
         jupyter_notebook: bool = None,
         chart_theme: str = None,
+        lod_points: int = None,
+        lod_max_points: int = None,
+        output_backend: str = None,
     ) -> None:
         """Configures the plot settings.
 
@@ -121,6 +143,23 @@ class Plotter:
         chart_theme : bool, optional
             The theme of the Bokeh chart generated. The default is "caliber".
 
+        lod_points : int, optional
+            Enables level-of-detail rendering when the data has more rows than
+            this: the main chart shows at most about this many candles (or
+            line points), roughly the pixel width of the chart. The default is
+            None (disabled).
+
+        lod_max_points : int, optional
+            Budget of rows embedded in the document across all resolution
+            tiers. Finer tiers are dropped once it is exceeded. The default is
+            500,000.
+
+        output_backend : str, optional
+            Bokeh output backend of every figure: "canvas", "webgl" or "svg".
+            "webgl" draws candles, lines and profile bars on the GPU, which
+            keeps charts of hundreds of thousands of glyphs interactive. The
+            default is "canvas".
+
         Returns
         -------
         None
@@ -153,36 +192,97 @@ class Plotter:
         self._chart_theme = (
             chart_theme if chart_theme is not None else self._chart_theme
         )
+        self._lod_points = lod_points if lod_points is not None else self._lod_points
+        self._lod_max_points = (
+            lod_max_points if lod_max_points is not None else self._lod_max_points
+        )
+        self._output_backend = (
+            output_backend if output_backend is not None else self._output_backend
+        )
 
     def plot(
-        self, instrument: str = None, indicators: dict = None, show_fig: bool = True
-    ) -> None:
-        """Creates a trading chart of OHLC price data and indicators."""
+        self,
+        instrument: str = None,
+        indicators: dict = None,
+        show_fig: bool = True,
+        output_path: str = "./output/web/indiview-chart.html",
+        profile: str = None,
+        profile_params: dict = None,
+    ):
+        """Creates a trading chart of OHLC price data and indicators.
+
+        When `show_fig` is True the chart is shown: written to `output_path` and
+        opened in a browser, or inline in a notebook. Otherwise it is only
+        saved to `output_path`. The final figure is returned.
+
+        `profile` ("MarketProfile" or "VolumeProfile") adds a profile panel
+        right of the candles, sharing their y range, with POC, VAL and VAH
+        marked on both. `profile_params` are passed to the analyzer, e.g.
+        {"bin_size": 200}.
+        """
+        if self._data is None:
+            raise ValueError("Data is required but missing!")
+        if profile is not None and self._line_chart:
+            raise ValueError("A profile panel requires OHLCV data.")
+
         if instrument is None:
             title_string = "Plotter IndiView"
         else:
             title_string = f"Plotter IndiView - {instrument}"
-        output_file("./output/web/indiview-chart.html", title=title_string)
+        output_file(output_path, title=title_string)
 
         # Add base data
-        source = ColumnDataSource(self._data)
+        lod = self._lod_points is not None and len(self._data) > self._lod_points
+        if lod:
+            # Coarsest tier is shown first, finer ones are swapped in on zoom
+            tiers, buckets = self._create_lod_tiers()
+            source = ColumnDataSource(dict(tiers[0].data))
+        else:
+            source = ColumnDataSource(self._data)
 
         # Main plot
         if self._line_chart:
-            source.add(self._data.plot_data, "High")
-            source.add(self._data.plot_data, "Low")
+            if not lod:
+                source.add(self._data.plot_data, "High")
+                source.add(self._data.plot_data, "Low")
             main_plot = self._create_main_plot(source)
         else:
-            source.add(
-                (self._data["Close"] >= self._data["Open"])
-                .values.astype("uint8")
-                .astype(str),
-                "change",
-            )
+            if not lod:
+                source.add(
+                    (self._data["Close"] >= self._data["Open"])
+                    .values.astype("uint8")
+                    .astype(str),
+                    "change",
+                )
             main_plot = self._plot_candle(source)
 
         # Initialize auto scale arguments
-        self._autoscale_args = {"y_range": main_plot.y_range, "source": source}
+        self._autoscale_args = {
+            "y_range": main_plot.y_range,
+            "source": source,
+            "block": self._autoscale_block,
+            "bottom_ranges": [],
+            "bottom_sources": [],
+            "bottom_columns": [],
+            "bottom_pyramids": [],
+        }
+        if lod:
+            # Autoscale on the finest embedded tier rather than the displayed one
+            self._autoscale_args["source"] = tiers[-1]
+            lod_callback = CustomJS(
+                args=dict(
+                    source=source,
+                    tiers=tiers,
+                    buckets=buckets,
+                    lod_points=self._lod_points,
+                ),
+                code=self._lod_code,
+            )
+            main_plot.x_range.js_on_change("end", lod_callback)
+        self._autoscale_args["pyramid"] = self._create_autoscale_pyramid(
+            self._autoscale_args["source"].data["Low"],
+            self._autoscale_args["source"].data["High"],
+        )
 
         # Indicators
         bottom_figs = []
@@ -193,19 +293,35 @@ class Plotter:
         callback = CustomJS(args=self._autoscale_args, code=self._autoscale_code)
         main_plot.x_range.js_on_change("end", callback)
 
+        # Profile panel, scaled with the main chart through the shared y range
+        profile_plot = None
+        if profile is not None:
+            profile_plot = self._plot_profile(profile, main_plot, profile_params)
+
         # Compile plots for final figure
         plots = [main_plot] + bottom_figs
         linked_crosshair = CrosshairTool(dimensions="both")
 
+        # One int64 array of timestamps (ms), shared by the tick formatter of
+        # every subplot and formatted in the browser
+        dates = ColumnDataSource(
+            {
+                "Date": pd.to_datetime(self._data["Date"])
+                .to_numpy()
+                .astype("datetime64[ms]")
+                .astype("int64")
+            }
+        )
+        date_formatter = CustomJSTickFormatter(
+            args=dict(dates=dates), code=self._date_tick_code
+        )
+
         titled = 0
         t = Title()
         t.text = title_string
         for plot in plots:
             if plot is not None:
-                plot.xaxis.major_label_overrides = {
-                    i: date.strftime("%b %d %Y")
-                    for i, date in enumerate(pd.to_datetime(self._data["Date"]))
-                }
+                plot.xaxis.formatter = date_formatter
                 plot.xaxis.bounds = (0, self._data.index[-1])
                 plot.sizing_mode = "stretch_width"
 
@@ -216,9 +332,20 @@ class Plotter:
                 plot.add_tools(linked_crosshair)
 
         # Construct final figure
+        if profile_plot is None:
+            children = plots
+            ncols = 1
+        else:
+            profile_plot.add_tools(linked_crosshair)
+            # The profile has no drag/scroll tools, it defers to the main chart's
+            # so the merged toolbar keeps pan and wheel zoom active
+            profile_plot.toolbar.active_drag = main_plot.toolbar.active_drag
+            profile_plot.toolbar.active_scroll = main_plot.toolbar.active_scroll
+            children = [[main_plot, profile_plot]] + [[plot, None] for plot in bottom_figs]
+            ncols = None
         fig = gridplot(
-            plots,
-            ncols=1,
+            children,
+            ncols=ncols,
             toolbar_location="right",
             toolbar_options=dict(logo=None),
             merge_tools=True,
@@ -232,6 +359,232 @@ class Plotter:
             if self._jupyter_notebook:
                 output_notebook()
             show(fig)
+        else:
+            save(fig, filename=output_path, title=title_string)
+
+        return fig
+
+    def serve(
+        self,
+        feed,
+        profile_type: str = "VolumeProfile",
+        indicators: dict = None,
+        rollover: int = 500,
+        interval: float = 1.0,
+        port: int = 5006,
+        show_browser: bool = True,
+    ) -> None:
+        """Serves a live chart of a LiveFeed on a local Bokeh server.
+
+        All data comes from `feed`, so the Plotter can be created without any,
+        e.g. `Plotter().serve(feed)`.
+
+        Parameters
+        ----------
+        feed : LiveFeed
+            The live feed to chart (see scripts.utils.live_feed).
+
+        profile_type : str, optional
+            "MarketProfile" or "VolumeProfile". The default is "VolumeProfile".
+
+        indicators : dict, optional
+            Mapping of a line name to a function taking the feed window as a
+            DataFrame and returning a Series aligned with it, e.g.
+            `lambda data: ema(data["Close"], 20)` or a streaming
+            `LiveIndicator(RSI(14))` (see scripts.technical.indicators). The
+            default is None.
+
+        rollover : int, optional
+            Number of candles kept in the browser. The default is 500.
+
+        interval : float, optional
+            Seconds between feed refreshes. The default is 1.0.
+
+        port : int, optional
+            Port of the Bokeh server. The default is 5006.
+
+        show_browser : bool, optional
+            Open the chart in a browser once the server is up. The default is True.
+
+        Returns
+        -------
+        None
+            Blocks while the server runs.
+
+        """
+        from bokeh.server.server import Server
+
+        app = self.live_app(feed, profile_type, indicators, rollover, interval)
+        server = Server({"/": app}, port=port, num_procs=1)
+        server.start()
+        if show_browser:
+            server.io_loop.add_callback(server.show, "/")
+        server.io_loop.start()
+
+    def live_app(
+        self,
+        feed,
+        profile_type: str = "VolumeProfile",
+        indicators: dict = None,
+        rollover: int = 500,
+        interval: float = 1.0,
+    ):
+        """Returns a Bokeh application function streaming `feed` (see `serve`).
+
+        Refreshes run on a background LiveWorker. Each update streams only the
+        candles newer than the last one sent, with `rollover`, and patches the
+        last candle while it is still forming. Profile bars are patched where
+        they changed. The worker runs while at least one session is open.
+        """
+        from scripts.technical import profile_analyzer as Profiler
+
+        indicators = indicators or {}
+        column = self._profile_column(profile_type)
+
+        @timed("snapshot")
+        def produce():
+            # Copy out of the feed buffer, which the next refresh overwrites
+            data = feed.refresh().copy()
+            profile, poc, value_area = getattr(Profiler, profile_type)(data).fit()
+            lines = {
+                name: func(data).to_numpy(copy=True) for name, func in indicators.items()
+            }
+            return data, profile, poc, value_area, lines
+
+        worker = LiveWorker(produce, interval=interval)
+
+        # Sessions run on the server loop, they share the newest snapshot
+        shared = {"seq": 0, "snapshot": None, "sessions": 0}
+
+        def session_destroyed(session_context):
+            shared["sessions"] -= 1
+            if not shared["sessions"]:
+                worker.stop()
+
+        def current():
+            snapshot = worker.latest()
+            if snapshot is not None:
+                shared["seq"] += 1
+                shared["snapshot"] = snapshot
+            return shared["seq"], shared["snapshot"]
+
+        def app(doc):
+            shared["sessions"] += 1
+            worker.start()
+            doc.on_session_destroyed(session_destroyed)
+
+            columns = ["Date", "Open", "High", "Low", "Close", "Volume", "change"]
+            source = ColumnDataSource({name: [] for name in columns + list(indicators)})
+            profile_source = ColumnDataSource(
+                {"price": [], "value": [], "height": [], "alpha": []}
+            )
+            state = {"seq": 0, "last": None, "width": None}
+
+            candle_plot = figure(
+                width=self._ohlc_width,
+                height=self._ohlc_height,
+                tools=self._fig_tools,
+                x_axis_type="datetime",
+                active_drag="pan",
+                active_scroll="wheel_zoom",
+                output_backend=self._output_backend,
+            )
+            candle_plot.x_range.follow = "end"
+            candle_plot.x_range.range_padding = 0
+            candle_plot.segment(
+                "Date", "High", "Date", "Low", color="black", source=source
+            )
+            candles = candle_plot.vbar(
+                "Date",
+                1,
+                "Open",
+                "Close",
+                source=source,
+                line_color="black",
+                fill_color=factor_cmap("change", ["#F2583E", "#D5E1DD"], ["0", "1"]),
+            )
+            colours = ["red", "blue", "orange", "green", "black", "yellow"]
+            for i, name in enumerate(indicators):
+                candle_plot.line(
+                    "Date",
+                    name,
+                    source=source,
+                    line_width=1.5,
+                    legend_label=name,
+                    line_color=colours[i % len(colours)],
+                )
+
+            profile_plot, levels = self._create_profile_plot(
+                profile_source, candle_plot, profile_type
+            )
+
+            @timed("plot_update")
+            def update():
+                seq, snapshot = current()
+                if snapshot is None or seq == state["seq"]:
+                    return
+                state["seq"] = seq
+                data, profile, poc, value_area, lines = snapshot
+
+                dates = data.index.as_unit("ms").asi8
+                if state["width"] is None and len(dates) > 1:
+                    state["width"] = float(np.median(np.diff(dates))) * 0.7
+                    candles.glyph.width = state["width"]
+                    candle_plot.x_range.follow_interval = state["width"] / 0.7 * rollover
+
+                # Own, writable arrays: Bokeh patches streamed columns in place
+                rows = {
+                    "Date": dates.copy(),
+                    **{name: data[name].to_numpy(copy=True) for name in columns[1:-1]},
+                    "change": (data["Close"] >= data["Open"])
+                    .to_numpy()
+                    .astype("uint8")
+                    .astype(str),
+                    **lines,
+                }
+
+                # Patch the candle sent last time, it may have been forming
+                start = 0
+                if state["last"] is not None:
+                    start = int(np.searchsorted(dates, state["last"]))
+                    if start < len(dates) and dates[start] == state["last"]:
+                        last = len(source.data["Date"]) - 1
+                        source.patch(
+                            {name: [(last, values[start])] for name, values in rows.items()}
+                        )
+                        start += 1
+
+                if start < len(dates):
+                    source.stream(
+                        {name: values[start:] for name, values in rows.items()},
+                        rollover=rollover,
+                    )
+                state["last"] = dates[-1]
+
+                # Profile bars: replace on shape change, otherwise patch changed bins
+                bars = self._profile_bars(profile, column, value_area)
+                if len(profile_source.data["price"]) != len(bars["price"]):
+                    profile_source.data = bars
+                else:
+                    patches = {}
+                    for name, values in bars.items():
+                        changed = np.flatnonzero(
+                            np.asarray(profile_source.data[name]) != values
+                        )
+                        if len(changed):
+                            patches[name] = [(int(i), values[i]) for i in changed]
+                    if patches:
+                        profile_source.patch(patches)
+
+                levels["POC"].location = poc[1]
+                levels["VAL"].location = value_area[0]
+                levels["VAH"].location = value_area[1]
+
+            doc.add_periodic_callback(update, min(interval, 0.25) * 1000)
+            doc.add_root(row(candle_plot, profile_plot, sizing_mode="stretch_width"))
+            doc.theme = self._chart_theme
+
+        return app
 
     def _reindex_data(self, data: Union[pd.DataFrame, pd.Series]) -> pd.DataFrame:
         if isinstance(data, pd.Series):
@@ -255,9 +608,10 @@ class Plotter:
             tools=self._fig_tools,
             active_drag="pan",
             active_scroll="wheel_zoom",
+            output_backend=self._output_backend,
         )
 
-        fig.line("data_index", "plot_data", line_color=line_color, source=source)
+        fig.line("index", "plot_data", line_color=line_color, source=source)
 
         return fig
 
@@ -282,6 +636,7 @@ class Plotter:
             tools=self._fig_tools,
             active_drag="pan",
             active_scroll="wheel_zoom",
+            output_backend=self._output_backend,
         )
 
         candle_plot.segment(
@@ -289,7 +644,7 @@ class Plotter:
         )
         candles = candle_plot.vbar(
             "index",
-            0.7,
+            "width" if "width" in source.data else 0.7,
             "Open",
             "Close",
             source=source,
@@ -308,6 +663,143 @@ class Plotter:
 
         return candle_plot
 
+    def _plot_profile(self, profile_type: str, linked_fig, params: dict = None):
+        """
+        Fit `profile_type` on the price data and plot it as horizontal bars
+        on a new figure sharing the y range of `linked_fig`.
+        """
+        from scripts.technical import profile_analyzer as Profiler
+
+        profile, poc, value_area = getattr(Profiler, profile_type)(
+            self._data, **(params or {})
+        ).fit()
+        source = ColumnDataSource(
+            self._profile_bars(profile, self._profile_column(profile_type), value_area)
+        )
+        fig, levels = self._create_profile_plot(source, linked_fig, profile_type)
+        levels["POC"].location = poc[1]
+        levels["VAL"].location = value_area[0]
+        levels["VAH"].location = value_area[1]
+
+        return fig
+
+    def _create_profile_plot(self, source: ColumnDataSource, linked_fig, title: str):
+        """
+        Figure of profile bars from `source` (see `_profile_bars`), a quarter
+        of the width of `linked_fig` and sharing its y range. Returns the
+        figure and the POC/VAL/VAH spans, which are drawn across `linked_fig`
+        (and POC across the profile too) once their location is set.
+        """
+        fig = figure(
+            width=linked_fig.width // 4,
+            height=linked_fig.height,
+            y_range=linked_fig.y_range,
+            tools="",
+            toolbar_location=None,
+            title=title,
+            output_backend=self._output_backend,
+        )
+        fig.hbar(
+            y="price",
+            right="value",
+            height="height",
+            fill_alpha="alpha",
+            fill_color="#FFB22C",
+            line_color="black",
+            source=source,
+        )
+
+        levels = {
+            label: Span(dimension="width", line_color=colour, line_width=1.5)
+            for label, colour in [("POC", "black"), ("VAL", "grey"), ("VAH", "grey")]
+        }
+        for span in levels.values():
+            linked_fig.add_layout(span)
+        fig.add_layout(levels["POC"])
+
+        return fig, levels
+
+    @staticmethod
+    def _profile_column(profile_type: str) -> str:
+        return "TPOs" if profile_type == "MarketProfile" else "Volume"
+
+    @staticmethod
+    def _profile_bars(profile: pd.DataFrame, column: str, value_area) -> dict:
+        """Bar columns of a fitted profile, faded outside the value area."""
+        prices = profile["Price"].to_numpy(copy=True)
+        step = np.abs(np.diff(prices)).max() if len(prices) > 1 else 1.0
+        return {
+            "price": prices,
+            "value": profile[column].to_numpy(copy=True),
+            "height": np.full(len(prices), step),
+            "alpha": np.where(
+                (prices >= value_area[0]) & (prices <= value_area[1]), 1, 0.3
+            ),
+        }
+
+    def _create_lod_tiers(self):
+        """
+        Build resolution tiers of the price data, coarsest first.
+
+        Each tier divides the bucket size of the previous one by `_lod_factor`,
+        until full resolution or until the row budget `_lod_max_points` is
+        spent. Candles are aggregated with min/max (OHLC preserving), lines
+        are downsampled with LTTB. The "index" column keeps the position of
+        each row in the full data, so tiers share the x axis.
+        """
+        n = len(self._data)
+        bucket = int(np.ceil(n / self._lod_points))
+        tiers, buckets = [], []
+        total = 0
+        while True:
+            rows = int(np.ceil(n / bucket))
+            if tiers and total + rows > self._lod_max_points:
+                break
+            tiers.append(ColumnDataSource(self._lod_tier(bucket)))
+            buckets.append(bucket)
+            total += rows
+            if bucket == 1:
+                break
+            bucket = max(bucket // self._lod_factor, 1)
+
+        return tiers, buckets
+
+    def _lod_tier(self, bucket: int) -> dict:
+        """Columns of the main chart data downsampled by `bucket` rows."""
+        dates = self._data["Date"].to_numpy()
+        if self._line_chart:
+            values = self._data["plot_data"].to_numpy()
+            keep = lttb(np.arange(len(values)), values, int(np.ceil(len(values) / bucket)))
+            return {
+                "index": keep,
+                "data_index": keep,
+                "Date": dates[keep],
+                "plot_data": values[keep],
+                "High": values[keep],
+                "Low": values[keep],
+            }
+
+        starts, sizes, open_, high, low, close, volume = minmax_ohlc(
+            *(
+                self._data[column].to_numpy()
+                for column in ["Open", "High", "Low", "Close", "Volume"]
+            ),
+            bucket,
+        )
+        return {
+            # candles are centered on the rows they cover
+            "index": starts + (sizes - 1) / 2,
+            "data_index": starts,
+            "width": sizes * 0.7,
+            "Date": dates[starts],
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": volume,
+            "change": (close >= open_).astype("uint8").astype(str),
+        }
+
     def _plot_indicators(self, indicators: dict, linked_fig):
         """
         Plot indicators based on indicator type. If indicator type is `over`, it will be plotted on top
@@ -316,9 +808,16 @@ class Plotter:
         plot_type = {
             "MACD": "below",
             "MA": "over",
+            "EMA": "over",
+            "BB": "over",
+            "VWAP": "over",
             "RSI": "below",
+            "ATR": "below",
         }
 
+        # All indicators share one source, aligned to the chart rows at once
+        indicator_source = self._create_indicator_source(indicators)
+
         # Plot indicators
         graph_over = 0
         graph_below = 0
@@ -326,31 +825,14 @@ class Plotter:
         colours = ["red", "blue", "orange", "green", "black", "yellow"]
 
         for indicator in indicators:
-            indi_type = indicator[indicator]["type"]
+            indi_type = indicators[indicator]["type"]
 
             if indi_type in plot_type:
                 if plot_type[indi_type] == "over" and graph_over < self._max_graph_over:
-                    if isinstance(indicators[indicator]["data"], pd.Series):
-                        # Timeseries provided, merge indexes
-                        if indicators[indicator]["data"].name is None:
-                            indicators[indicator]["data"].name = "data"
-                        merged_indicator_data = pd.merge(
-                            self._data,
-                            indicators[indicator]["data"],
-                            left_on="Date",
-                            right_index=True,
-                        )
-                        line_data = merged_indicator_data[
-                            indicators[indicator]["data"].name
-                        ]
-                        x_vals = line_data.index
-                        y_vals = line_data.values
-                    else:
-                        raise Exception("Plot data must be a timeseries.")
-
                     linked_fig.line(
-                        x_vals,
-                        y_vals,
+                        "index",
+                        indicator,
+                        source=indicator_source,
                         line_width=1.5,
                         legend_label=indicator,
                         line_color=(
@@ -364,25 +846,17 @@ class Plotter:
                     plot_type[indi_type] == "below"
                     and graph_below < self._max_graph_below
                 ):
-                    if isinstance(indicator[indicator]["data"], pd.Series):
-                        # Timeseries provided, merge indexes
-                        if indicators[indicator]["data"].name is None:
-                            indicators[indicator]["data"].name = "data"
-                        line_source = self._create_line_source(
-                            indicators[indicator]["data"]
-                        )
-                    else:
-                        raise Exception("Plot data must be a timeseries.")
-
                     new_fig = self._plot_line(
-                        line_source,
+                        indicator_source,
                         linked_fig,
-                        indicators[indicator]["data"].name,
+                        indicator,
                         new_fig=True,
                         legend_label=indicator,
                         fig_height=130,
                     )
-                    self._add_to_autoscale_args(line_source, new_fig.y_range)
+                    self._add_to_autoscale_args(
+                        indicator_source, new_fig.y_range, indicator
+                    )
 
                     graph_below += 1
                     bottom_figs.append(new_fig)
@@ -390,17 +864,16 @@ class Plotter:
                 # The indicator plot type is not recognised - plotting on new fig
                 if graph_below < self._max_graph_below:
                     print(f"Indicator type {indi_type} not recognised in Plotter.")
-                    line_source = self._create_line_source(
-                        indicators[indicator]["data"]
-                    )
                     new_fig = self._plot_line(
-                        line_source,
+                        indicator_source,
                         linked_fig,
-                        indicators[indicator]["data"].name,
+                        indicator,
                         new_fig=True,
                         fig_height=130,
                     )
-                    self._add_to_autoscale_args(line_source, new_fig.y_range)
+                    self._add_to_autoscale_args(
+                        indicator_source, new_fig.y_range, indicator
+                    )
 
                     graph_below += 1
                     bottom_figs.append(new_fig)
@@ -416,6 +889,7 @@ class Plotter:
         fig_height: float = 150,
         fig_title: str = None,
         line_colour: str = "black",
+        legend_label: str = None,
     ):
         if new_fig:
             fig = figure(
@@ -426,15 +900,19 @@ class Plotter:
                 active_drag="pan",
                 active_scroll="wheel_zoom",
                 x_range=linked_fig.x_range,
+                output_backend=self._output_backend,
             )
         else:
             fig = linked_fig
 
-        fig.line("data_index", column_name, line_color=line_colour, source=source)
+        line_kwargs = {} if legend_label is None else {"legend_label": legend_label}
+        fig.line(
+            "index", column_name, line_color=line_colour, source=source, **line_kwargs
+        )
 
         return fig
 
-    def _add_to_autoscale_args(self, source: ColumnDataSource, y_range):
+    def _add_to_autoscale_args(self, source: ColumnDataSource, y_range, column: str):
         """
         Parameters
         ----------
@@ -444,35 +922,71 @@ class Plotter:
         y_range : Bokeh Range
             The y_range attribute of the chart.
 
+        column : str
+            The column of `source` the chart is scaled to.
+
         """
-        added = False
-        range_key = "bottom_range_1"
-        source_key = "bottom_source_1"
-        while not added:
-            if range_key not in self._autoscale_args:
-                # Keys can be added
-                self._autoscale_args[range_key] = y_range
-                self._autoscale_args[source_key] = source
-                added = True
-            else:
-                # Increment key
-                range_key = range_key[:-1] + str(int(range_key[-1]) + 1)
-                source_key = source_key[:-1] + str(int(source_key[-1]) + 1)
-
-    def _create_line_source(self, indicator_data):
-        """Create ColumnDataSource from indicator line data."""
-        # Overwrite indicator data name to prevent conflict
-        data_name = "plot_data"
-        indicator_data.name = data_name
-        merged_indicator_data = pd.merge(
-            self._data, indicator_data, left_on="Date", right_index=True
+        self._autoscale_args["bottom_ranges"].append(y_range)
+        self._autoscale_args["bottom_sources"].append(source)
+        self._autoscale_args["bottom_columns"].append(column)
+        self._autoscale_args["bottom_pyramids"].append(
+            self._create_autoscale_pyramid(source.data[column], source.data[column])
         )
-        merged_indicator_data.fillna(method="bfill", inplace=True)
-        data_name = indicator_data.name
-        line_source = ColumnDataSource(merged_indicator_data[[data_name, "data_index"]])
-        line_source.add(merged_indicator_data[data_name].values, "High")
-        line_source.add(merged_indicator_data[data_name].values, "Low")
-        return line_source
+
+    def _create_autoscale_pyramid(self, low, high) -> ColumnDataSource:
+        """
+        Min/max segment tree over blocks of `_autoscale_block` rows, used by
+        autoscale.js to answer the min/max of any row range in O(log n).
+
+        Block b is stored at leaf `size + b` and node k holds the min/max of
+        nodes 2k and 2k + 1, with `size` the block count rounded up to a power
+        of two. NaN values are ignored.
+        """
+        low = np.asarray(low, dtype="float64")
+        high = np.asarray(high, dtype="float64")
+        block = self._autoscale_block
+        starts = np.arange(0, len(low), block)
+        size = 1 << max(int(np.ceil(np.log2(max(len(starts), 1)))), 0)
+
+        tree_min = np.full(2 * size, np.inf)
+        tree_max = np.full(2 * size, -np.inf)
+        if len(starts):
+            with np.errstate(invalid="ignore"):
+                tree_min[size : size + len(starts)] = np.fmin.reduceat(low, starts)
+                tree_max[size : size + len(starts)] = np.fmax.reduceat(high, starts)
+        # Build one level at a time: nodes [level, 2 * level) from their children
+        level = size // 2
+        while level:
+            children = slice(2 * level, 4 * level, 2)
+            right = slice(2 * level + 1, 4 * level, 2)
+            tree_min[level : 2 * level] = np.fmin(tree_min[children], tree_min[right])
+            tree_max[level : 2 * level] = np.fmax(tree_max[children], tree_max[right])
+            level //= 2
+
+        return ColumnDataSource({"min": tree_min, "max": tree_max})
+
+    def _create_indicator_source(self, indicators: dict) -> ColumnDataSource:
+        """
+        Create one ColumnDataSource holding every indicator line.
+
+        The series are outer-joined once and reindexed once to the chart dates,
+        so each column is positional (NaN where an indicator has no value) and
+        only the row position and the indicator values are sent to the browser.
+        """
+        for indicator in indicators:
+            if not isinstance(indicators[indicator]["data"], pd.Series):
+                raise Exception("Plot data must be a timeseries.")
+
+        aligned = pd.concat(
+            {indicator: indicators[indicator]["data"] for indicator in indicators},
+            axis=1,
+        ).reindex(pd.DatetimeIndex(self._data["Date"]))
+
+        columns = {"index": self._data.index.to_numpy()}
+        for indicator in indicators:
+            columns[indicator] = aligned[indicator].to_numpy()
+
+        return ColumnDataSource(columns)
 
 
 if __name__ == "__main__":
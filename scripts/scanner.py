@@ -0,0 +1,285 @@
+import hashlib
+import io
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.utils.ohlcv import OHLCV
+
+
+# default ranking: closest to a support/resistance zone first, then to the POC
+RANK_BY = {"sr_distance": True, "poc_distance": True}
+
+
+def store_symbols(data_dir: str = "./data", timeframe: str = "1h", quote: str = "USDT") -> list[str]:
+    """Symbols of the local csv store with the `quote` currency and `timeframe`."""
+    suffix = f"{quote}{timeframe}.csv".lower()
+    return sorted(
+        path.name[: -len(f"{timeframe}.csv")].upper()
+        for path in Path(data_dir).glob("*.csv")
+        if path.name.endswith(suffix)
+    )
+
+
+def sync_store(csv_file: str | Path, store_dir: str | Path) -> OHLCV:
+    """
+    Bring the memory-mapped `OHLCV` copy of a store csv up to date and load it.
+
+    The csv is append-only when written by `backfill`, so only the bytes after
+    the last synced offset are parsed and appended. A csv rewritten in place
+    (e.g. by `stored_csv`) is detected by the line ending at that offset no
+    longer being the last synced row, and converted again.
+    """
+    csv_file, store_dir = Path(csv_file), Path(store_dir)
+    meta_file = store_dir / "sync.json"
+    size = csv_file.stat().st_size
+    meta = json.loads(meta_file.read_text()) if meta_file.exists() else None
+
+    if meta is not None and meta["csv_size"] == size:
+        return OHLCV.load(store_dir)
+
+    appended = _appended_rows(csv_file, meta, size, store_dir) if meta else None
+    if appended is None:
+        OHLCV.from_csv(csv_file).save(store_dir)
+    else:
+        new, size = appended
+        if len(new):
+            new.append(store_dir)
+
+    # write the offset atomically, after the rows it covers
+    tmp_file = meta_file.with_suffix(".tmp")
+    tmp_file.write_text(json.dumps({"csv_size": size, "last_line": _last_line(csv_file, size)}))
+    tmp_file.replace(meta_file)
+    return OHLCV.load(store_dir)
+
+
+def _last_line(csv_file: Path, offset: int) -> str:
+    """The line ending at byte `offset` of the csv, with its newline."""
+    with open(csv_file, "rb") as f:
+        f.seek(max(0, offset - 1024))
+        before = f.read(offset - f.tell())
+    return before[before.rfind(b"\n", 0, len(before) - 1) + 1 :].decode()
+
+
+def _appended_rows(
+    csv_file: Path, meta: dict, size: int, store_dir: Path
+) -> tuple[OHLCV, int] | None:
+    """
+    Rows added after the synced offset and the offset after them, None if
+    the csv was rewritten.
+    """
+    offset = meta["csv_size"]
+    # the synced part must still end with the last synced row
+    if size < offset or _last_line(csv_file, offset) != meta.get("last_line"):
+        return None
+    dates = np.load(store_dir / "dates.npy", mmap_mode="r")
+    if not len(dates):
+        return None
+    with open(csv_file, "rb") as f:
+        header = f.readline()
+        f.seek(offset)
+        appended = f.read(size - offset)
+
+    # a partly written last line is left for the next sync
+    complete = appended[: appended.rfind(b"\n") + 1]
+    if not complete.strip():
+        return OHLCV(*([] for _ in range(6))), offset + len(complete)
+    data = pd.read_csv(io.BytesIO(header + complete), index_col=["Date"], parse_dates=["Date"])
+    data = data[data.index.as_unit("ms").asi8 > int(dates[-1])]
+    return OHLCV.from_frame(data), offset + len(complete)
+
+
+def sr_zones(prices, tolerance: float = 0.005) -> list[tuple[float, float, int]]:
+    """
+    Support/resistance zones from pivot prices: sorted prices within
+    `tolerance` (relative) of their neighbour are merged into one zone.
+    Returns (low, high, touches) per zone.
+    """
+    prices = np.sort(np.asarray(prices, dtype="float64"))
+    if not len(prices):
+        return []
+    breaks = np.flatnonzero(np.diff(prices) > prices[:-1] * tolerance) + 1
+    return [
+        (float(zone[0]), float(zone[-1]), len(zone)) for zone in np.split(prices, breaks)
+    ]
+
+
+def scan_symbol(
+    symbol: str,
+    timeframe: str,
+    data_dir: str = "./data",
+    store_dir: str | None = None,
+    profile: str = "VolumeProfile",
+    profile_params: dict | None = None,
+    freq: str = "1D",
+    trend: str = "DirectionalChange",
+    trend_params: dict | None = None,
+    lookback: int = 5000,
+    max_pivots: int = 50,
+    tolerance: float = 0.005,
+) -> dict:
+    """
+    Sync one symbol's store and compute its scan row, resuming from the state
+    of the previous scan. See `scan` for the parameters.
+    """
+    from scripts.technical import profile_analyzer, trend_detector
+
+    profile_params = profile_params or {}
+    trend_params = trend_params or {}
+    csv_file = Path(data_dir) / f"{symbol.lower()}{timeframe}.csv"
+    store = Path(store_dir or Path(data_dir) / "ohlcv") / f"{symbol.lower()}{timeframe}"
+    bars = sync_store(csv_file, store)
+    n = len(bars)
+
+    # the state is only valid for the same analyzers and parameters
+    config = json.dumps(
+        [profile, profile_params, freq, trend, trend_params, lookback, max_pivots],
+        sort_keys=True,
+        default=str,
+    )
+    state_file = store / f"scan-{hashlib.sha1(config.encode()).hexdigest()[:12]}.pkl"
+    state = {}
+    if state_file.exists():
+        with open(state_file, "rb") as f:
+            state = pickle.load(f)
+        # a converted again store can differ anywhere, start over
+        if state.get("rows", 0) > n or (
+            state.get("rows") and int(bars.dates[state["rows"] - 1]) != state["last_date"]
+        ):
+            state = {}
+    if state.get("rows") == n:
+        return state["row"]
+
+    # previous completed session, fitted once per session
+    last = pd.Timestamp(bars.index[-1])
+    previous = bars.between(end=last.floor(freq) - pd.Timedelta(1, "ms"))
+    session = pd.Timestamp(previous.index[-1]).floor(freq) if len(previous) else None
+    if session is not None and state.get("session") != session:
+        analyzer = getattr(profile_analyzer, profile)(
+            previous.between(start=session), **profile_params
+        )
+        _, poc, value_area = analyzer.fit()
+        state["session"], state["levels"] = session, (poc[1], *value_area)
+
+    # confirmed pivots: DirectionalChange resumes on the new bars only, ZigZag
+    # is refitted on the last `lookback` bars
+    if trend == "DirectionalChange":
+        detector = trend_detector.DirectionalChange(bars, **trend_params)
+        pivots = detector.find_pivots(bars.close, bars.high, bars.low, state.get("trend"))
+        state["trend"] = detector.state
+        confirmed = state.get("pivots", []) + [
+            (i, idx, price, label)
+            for i, (idx, price, label) in zip(detector.confirmed_at, pivots)
+        ]
+    else:
+        offset = max(0, n - lookback)
+        detector = getattr(trend_detector, trend)(bars[offset:], **trend_params)
+        detector.fit()
+        confirmed = [
+            (*np.searchsorted(bars.index, [date, pivot]).tolist(), price, label)
+            for date, pivot, price, label in detector.confirmations
+        ]
+    state["pivots"] = confirmed[-max_pivots:]
+
+    close = float(bars.close[-1])
+    row = {"symbol": symbol, "date": last, "close": close}
+    if "levels" in state:
+        poc, val, vah = state["levels"]
+        row.update(
+            poc=poc,
+            val=val,
+            vah=vah,
+            value_area="above" if close > vah else "below" if close < val else "inside",
+            poc_distance=abs(close / poc - 1),
+        )
+    if confirmed:
+        i, idx, price, label = confirmed[-1]
+        row.update(
+            pivot_date=pd.Timestamp(bars.index[idx]),
+            pivot_price=price,
+            pivot_label=label,
+            bars_since_confirmation=n - 1 - i,
+        )
+    zones = sr_zones([price for _, _, price, _ in state["pivots"]], tolerance)
+    if zones:
+        low, high, touches = min(
+            zones, key=lambda zone: max(zone[0] - close, close - zone[1], 0)
+        )
+        row.update(
+            sr_low=low,
+            sr_high=high,
+            sr_touches=touches,
+            sr_distance=max(low - close, close - high, 0) / close,
+        )
+
+    state.update(rows=n, last_date=int(bars.dates[-1]), row=row)
+    tmp_file = state_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_file.replace(state_file)
+    return row
+
+
+def scan(
+    symbols: list[str] | None = None,
+    timeframe: str = "1h",
+    quote: str = "USDT",
+    data_dir: str = "./data",
+    store_dir: str | None = None,
+    rank_by: dict | None = None,
+    processes: int | None = None,
+    **params,
+) -> pd.DataFrame:
+    """
+    Scan every symbol of the local store on a process pool and rank them.
+
+    Each symbol's csv is synced into a memory-mapped `OHLCV` store, then the
+    profile of the previous completed `freq` session, the last confirmed
+    pivot and the support/resistance zones of the recent pivots are computed.
+    Everything is resumed from the state of the previous scan: a rerun after
+    one new bar parses that bar from the csv, steps the DirectionalChange
+    detector over it and only refits the profile when a session closed.
+
+    Params:
+    - symbols: Symbols to scan (default: every `quote` pair in the store).
+    - timeframe: Timeframe of the store files (e.g. "1h").
+    - quote: Quote currency used to find the symbols.
+    - data_dir: Directory of the local csv store.
+    - store_dir: Directory of the memory-mapped copies (default: data_dir/ohlcv).
+    - rank_by: Columns to sort by, mapped to ascending (default: `RANK_BY`).
+    - processes: Number of worker processes (default: number of CPUs).
+    - params: Passed on to `scan_symbol`: profile ("VolumeProfile" or
+      "MarketProfile"), profile_params, freq, trend ("DirectionalChange" or
+      "ZigZag"), trend_params, lookback (ZigZag bars), max_pivots and
+      tolerance (zone width).
+
+    Returns one row per symbol with its rank, or the error if it failed.
+    """
+    symbols = store_symbols(data_dir, timeframe, quote) if symbols is None else symbols
+    rank_by = RANK_BY if rank_by is None else rank_by
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=processes or os.cpu_count()) as pool:
+        futures = {
+            pool.submit(scan_symbol, symbol, timeframe, data_dir, store_dir, **params): symbol
+            for symbol in symbols
+        }
+        for future in as_completed(futures):
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                rows.append({"symbol": futures[future], "error": repr(e)})
+
+    report = pd.DataFrame(rows)
+    columns = [column for column in rank_by if column in report]
+    if columns:
+        report = report.sort_values(
+            columns, ascending=[rank_by[column] for column in columns], na_position="last"
+        )
+    report.insert(0, "rank", range(1, len(report) + 1))
+    return report.reset_index(drop=True)
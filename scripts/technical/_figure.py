@@ -0,0 +1,8 @@
+def show_or_save(fig, save_path=None):
+    """Show `fig`, or write it to `save_path` (format from the extension)."""
+    if save_path is None:
+        import matplotlib.pyplot as plt
+
+        plt.show()
+    else:
+        fig.savefig(save_path, facecolor=fig.get_facecolor())
@@ -0,0 +1,17 @@
+from .ema import ema, EMA
+from .rsi import rsi, RSI
+from .macd import macd, MACD
+from .atr import atr, true_range, ATR
+from .bollinger import bollinger, Bollinger
+from .vwap import (
+    vwap,
+    session_vwap,
+    anchored_vwap,
+    AnchoredBands,
+    anchor_positions,
+    typical_price,
+    VWAP,
+    AnchoredVWAP,
+)
+from .live import LiveIndicator
+from .graph import IndicatorGraph
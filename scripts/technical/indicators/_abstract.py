@@ -0,0 +1,43 @@
+import copy
+import math
+from abc import ABC, abstractmethod
+import numpy as np
+
+
+class __Indicator(ABC):
+    """
+    Streaming indicator state: `update` consumes one closed bar in O(1) and
+    returns the current value (NaN while warming up).
+    """
+
+    def __init__(self, period: int | None = None):
+        super().__init__()
+        if period is not None and period < 1:
+            raise ValueError(f"period must be positive, got {period}")
+        self.__period = period
+        self.value = np.nan
+
+    @property
+    def period(self):
+        return self.__period
+
+    @property
+    def ready(self) -> bool:
+        if isinstance(self.value, tuple):
+            return not any(map(math.isnan, self.value))
+        return not math.isnan(self.value)
+
+    @abstractmethod
+    def update(self, *values):
+        pass
+
+    def peek(self, *values):
+        """Value if `values` closed the next bar, without consuming them."""
+        return copy.deepcopy(self).update(*values)
+
+    def run(self, *arrays):
+        """Stream whole arrays through `update`, returning the values per bar."""
+        values = [self.update(*row) for row in zip(*arrays)]
+        if values and isinstance(values[0], tuple):
+            return tuple(np.array(column) for column in zip(*values))
+        return np.array(values, dtype="float64")
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+
+# float64 array of a Series, array or list
+def as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype="float64")
+
+
+# return `result` as a Series when the input was one, so it plots by date
+def like(result: np.ndarray, values):
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return result
+
+
+# exponential smoothing with factor `alpha`, seeded with the mean of the first
+# `period` values after any leading NaN, as the streaming EMA does
+def smooth(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) == 0 or len(values) - valid[0] < period:
+        return out
+
+    seed = valid[0] + period - 1
+    head = np.concatenate(([values[valid[0] : seed + 1].mean()], values[seed + 1 :]))
+    # y[t] = (1 - alpha) * y[t - 1] + alpha * x[t], run in C by pandas
+    out[seed:] = pd.Series(head).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out
+
+
+# `smooth` of values[start:] continuing from prev[start - 1], falling back to a
+# full pass while the seed is not complete
+def smooth_from(
+    values: np.ndarray, period: int, alpha: float, prev: np.ndarray | None, start: int
+) -> np.ndarray:
+    if prev is None or start == 0 or np.isnan(prev[start - 1]):
+        return smooth(values, period, alpha)[start:]
+    head = np.concatenate(([prev[start - 1]], values[start:]))
+    return pd.Series(head).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
@@ -0,0 +1,35 @@
+import numpy as np
+
+from ._abstract import __Indicator
+from ._batch import as_array, like, smooth
+from .ema import EMA
+
+
+def true_range(high, low, close):
+    """High - low, widened to the previous close when the bar gaps."""
+    high, low, prev_close = as_array(high), as_array(low), as_array(close)
+    prev_close = np.concatenate(([np.nan], prev_close[:-1]))
+    # fmax skips the missing previous close of the first bar
+    return np.fmax(
+        high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))
+    )
+
+
+def atr(high, low, close, period: int = 14):
+    """Average true range with Wilder's smoothing (alpha = 1 / period)."""
+    return like(smooth(true_range(high, low, close), period, 1 / period), close)
+
+
+class ATR(__Indicator):
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.__average = EMA(period, alpha=1 / period)
+        self.__close = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        value = high - low
+        if self.__close is not None:
+            value = max(value, abs(high - self.__close), abs(low - self.__close))
+        self.__close = close
+        self.value = self.__average.update(value)
+        return self.value
@@ -0,0 +1,53 @@
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from ._abstract import __Indicator
+from ._batch import as_array, like
+
+
+def bollinger(close, period: int = 20, k: float = 2.0):
+    """
+    Bollinger bands: the `period` simple moving average and the bands `k`
+    (population) standard deviations above and below it.
+
+    Returns the middle, upper and lower bands.
+    """
+    rolling = pd.Series(as_array(close)).rolling(period)
+    middle = rolling.mean().to_numpy()
+    deviation = k * rolling.std(ddof=0).to_numpy()
+    return (
+        like(middle, close),
+        like(middle + deviation, close),
+        like(middle - deviation, close),
+    )
+
+
+class Bollinger(__Indicator):
+    def __init__(self, period: int = 20, k: float = 2.0):
+        super().__init__(period)
+        self.__k = k
+        self.__window = deque(maxlen=period)
+        self.__mean = 0.0
+        self.__m2 = 0.0
+        self.value = (np.nan,) * 3
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        # Welford's mean and sum of squared deviations over a sliding window
+        if len(self.__window) < self.period:
+            self.__window.append(close)
+            delta = close - self.__mean
+            self.__mean += delta / len(self.__window)
+            self.__m2 += delta * (close - self.__mean)
+        else:
+            oldest = self.__window[0]
+            self.__window.append(close)
+            mean = self.__mean + (close - oldest) / self.period
+            self.__m2 += (close - oldest) * (close - mean + oldest - self.__mean)
+            self.__mean = mean
+
+        if len(self.__window) == self.period:
+            deviation = self.__k * math.sqrt(max(self.__m2, 0.0) / self.period)
+            self.value = (self.__mean, self.__mean + deviation, self.__mean - deviation)
+        return self.value
@@ -0,0 +1,44 @@
+import math
+
+from ._abstract import __Indicator
+from ._batch import as_array, like, smooth
+
+
+def ema(values, period: int = 20, alpha: float | None = None):
+    """
+    Exponential moving average with `alpha` = 2 / (period + 1), seeded with
+    the simple average of the first `period` values.
+
+    Params:
+    - values: Series or array of prices.
+    - period: Number of bars of the seed average.
+    - alpha: Smoothing factor, overrides the one derived from `period`
+      (1 / period gives Wilder's smoothing).
+    """
+    alpha = 2 / (period + 1) if alpha is None else alpha
+    return like(smooth(as_array(values), period, alpha), values)
+
+
+class EMA(__Indicator):
+    def __init__(self, period: int = 20, alpha: float | None = None):
+        super().__init__(period)
+        self.__alpha = 2 / (period + 1) if alpha is None else alpha
+        self.__seed = 0.0
+        self.__count = 0
+
+    @property
+    def alpha(self):
+        return self.__alpha
+
+    def update(self, value: float) -> float:
+        if math.isnan(value):
+            return self.value
+        if self.__count < self.period:
+            # average of the first `period` values seeds the recursion
+            self.__seed += value
+            self.__count += 1
+            if self.__count == self.period:
+                self.value = self.__seed / self.period
+        else:
+            self.value = (1 - self.__alpha) * self.value + self.__alpha * value
+        return self.value
@@ -0,0 +1,283 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from ._batch import as_array, smooth_from
+from .atr import true_range
+from .rsi import _rsi as rsi_from
+
+
+# node name -> compute(graph, series_id, prev, start, **params), returning the
+# values of rows [start:] given the cached values `prev` of rows [:start]
+_nodes = {}
+
+# public indicator name -> function of its params returning the node key
+_aliases = {}
+
+
+def _node(name: str):
+    def register(compute):
+        _nodes[name] = compute
+        return compute
+
+    return register
+
+
+def _key(node: str, /, **params) -> tuple:
+    return (node, tuple(sorted(params.items())))
+
+
+def _column(column: str) -> tuple:
+    return _key("column", name=column)
+
+
+@_node("smooth")
+def _smooth(graph, series_id, prev, start, of, period, alpha):
+    return smooth_from(graph.values(series_id, of), period, alpha, prev, start)
+
+
+@_node("change")
+def _change(graph, series_id, prev, start, column):
+    values = graph.values(series_id, _column(column))
+    if start == 0:
+        return np.diff(values, prepend=np.nan)
+    # one bar before `start` is needed for its change
+    return np.diff(values[start - 1 :])
+
+
+@_node("gain")
+def _gain(graph, series_id, prev, start, column):
+    return np.maximum(graph.values(series_id, _key("change", column=column))[start:], 0.0)
+
+
+@_node("loss")
+def _loss(graph, series_id, prev, start, column):
+    return np.maximum(-graph.values(series_id, _key("change", column=column))[start:], 0.0)
+
+
+@_node("rsi")
+def _rsi(graph, series_id, prev, start, period, column):
+    wilder = {"period": period, "alpha": 1 / period}
+    gain = graph.values(series_id, _key("smooth", of=_key("gain", column=column), **wilder))
+    loss = graph.values(series_id, _key("smooth", of=_key("loss", column=column), **wilder))
+    return rsi_from(gain[start:], loss[start:])
+
+
+@_node("true_range")
+def _true_range(graph, series_id, prev, start):
+    begin = max(start - 1, 0)
+    high, low, close = (
+        graph.values(series_id, _column(column))[begin:]
+        for column in ("High", "Low", "Close")
+    )
+    return true_range(high, low, close)[start - begin :]
+
+
+@_node("macd")
+def _macd(graph, series_id, prev, start, fast, slow, column):
+    fast_ema = graph.values(series_id, _aliases["ema"](period=fast, column=column))
+    slow_ema = graph.values(series_id, _aliases["ema"](period=slow, column=column))
+    return fast_ema[start:] - slow_ema[start:]
+
+
+@_node("macd_hist")
+def _macd_hist(graph, series_id, prev, start, fast, slow, signal, column):
+    line = graph.values(series_id, _key("macd", fast=fast, slow=slow, column=column))
+    signal_line = graph.values(
+        series_id,
+        _aliases["macd_signal"](fast=fast, slow=slow, signal=signal, column=column),
+    )
+    return line[start:] - signal_line[start:]
+
+
+@_node("rolling_mean")
+def _rolling_mean(graph, series_id, prev, start, period, column):
+    begin = max(start - period + 1, 0)
+    values = graph.values(series_id, _column(column))[begin:]
+    return pd.Series(values).rolling(period).mean().to_numpy()[start - begin :]
+
+
+@_node("rolling_std")
+def _rolling_std(graph, series_id, prev, start, period, column):
+    begin = max(start - period + 1, 0)
+    values = graph.values(series_id, _column(column))[begin:]
+    return pd.Series(values).rolling(period).std(ddof=0).to_numpy()[start - begin :]
+
+
+@_node("bollinger")
+def _bollinger(graph, series_id, prev, start, period, k, column):
+    middle = graph.values(series_id, _key("rolling_mean", period=period, column=column))
+    std = graph.values(series_id, _key("rolling_std", period=period, column=column))
+    return middle[start:] + k * std[start:]
+
+
+_aliases.update(
+    {
+        "ema": lambda period=20, column="Close": _key(
+            "smooth", of=_column(column), period=period, alpha=2 / (period + 1)
+        ),
+        "rsi": lambda period=14, column="Close": _key(
+            "rsi", period=period, column=column
+        ),
+        "macd": lambda fast=12, slow=26, column="Close": _key(
+            "macd", fast=fast, slow=slow, column=column
+        ),
+        "macd_signal": lambda fast=12, slow=26, signal=9, column="Close": _key(
+            "smooth",
+            of=_key("macd", fast=fast, slow=slow, column=column),
+            period=signal,
+            alpha=2 / (signal + 1),
+        ),
+        "macd_hist": lambda fast=12, slow=26, signal=9, column="Close": _key(
+            "macd_hist", fast=fast, slow=slow, signal=signal, column=column
+        ),
+        "true_range": lambda: _key("true_range"),
+        "atr": lambda period=14: _key(
+            "smooth", of=_key("true_range"), period=period, alpha=1 / period
+        ),
+        "bollinger_middle": lambda period=20, column="Close": _key(
+            "rolling_mean", period=period, column=column
+        ),
+        "bollinger_upper": lambda period=20, k=2.0, column="Close": _key(
+            "bollinger", period=period, k=k, column=column
+        ),
+        "bollinger_lower": lambda period=20, k=2.0, column="Close": _key(
+            "bollinger", period=period, k=-k, column=column
+        ),
+    }
+)
+
+
+class IndicatorGraph:
+    """
+    Memoizing graph of indicators over named price series.
+
+    Every indicator is a node keyed by (series id, function, params) whose
+    inputs are other nodes, so intermediates shared by several indicators
+    (the EMAs of a MACD and of an EMA overlay, the true range of several
+    ATRs, ...) are computed once. Results are cached with LRU eviction under
+    `max_bytes`. When a series is updated, cached nodes are only invalidated
+    from its first changed bar and are extended from there on the next `get`,
+    so appending a bar costs O(new bars) per node.
+
+    Params:
+    - max_bytes: Memory budget of the cached results (default 256 MB).
+
+    Example:
+        graph = IndicatorGraph()
+        graph.update("btc", data)
+        line = graph.get("btc", "macd", fast=12, slow=26)
+        signal = graph.get("btc", "macd_signal", fast=12, slow=26, signal=9)
+        fast = graph.get("btc", "ema", period=12)  # cached by the MACD
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024**2):
+        self.max_bytes = max_bytes
+        self._series = {}
+        self._cache = OrderedDict()  # key -> (values, number of valid bars)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "computed_bars": 0, "evictions": 0}
+
+    @staticmethod
+    def indicators() -> list[str]:
+        """Names accepted by `get`."""
+        return sorted(_aliases)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def update(self, series_id, data) -> int:
+        """
+        Set the OHLCV data of `series_id` (a DataFrame or a mapping of column
+        arrays), invalidating cached nodes from the first bar that differs
+        from the previous data. Returns that bar.
+        """
+        columns = {
+            name: as_array(data[name])
+            for name in data.keys()
+            if np.asarray(data[name]).dtype.kind in "fiu"
+        }
+        with self._lock:
+            previous = self._series.get(series_id)
+            self._series[series_id] = columns
+            first = self._first_change(previous, columns)
+            stale = [
+                key
+                for key, (_, valid) in self._cache.items()
+                if key[0] == series_id and valid > first
+            ]
+            for key in stale:
+                self._cache[key] = (self._cache[key][0], first)
+        return first
+
+    def remove(self, series_id) -> None:
+        """Drop the data and the cached nodes of `series_id`."""
+        with self._lock:
+            self._series.pop(series_id, None)
+            for key in [key for key in self._cache if key[0] == series_id]:
+                self._bytes -= self._cache.pop(key)[0].nbytes
+
+    def get(self, series_id, name: str, **params) -> np.ndarray:
+        """Values of indicator `name` (see `indicators()`) over `series_id`."""
+        if name not in _aliases:
+            raise ValueError(f"Unknown indicator: {name}")
+        return self.values(series_id, _aliases[name](**params))
+
+    def values(self, series_id, key: tuple) -> np.ndarray:
+        """Values of the node `key`, computed or extended as needed."""
+        name, params = key
+        if name == "column":
+            return self._series[series_id][dict(params)["name"]]
+
+        with self._lock:
+            n = len(next(iter(self._series[series_id].values())))
+            cached = self._cache.get((series_id, key))
+            if cached is not None:
+                self._cache.move_to_end((series_id, key))
+                values, valid = cached
+                if valid == n == len(values):
+                    self.stats["hits"] += 1
+                    return values
+                start = min(valid, n)
+                prev = values[:start]
+            else:
+                prev, start = None, 0
+
+            self.stats["misses"] += 1
+            tail = _nodes[name](self, series_id, prev, start, **dict(params))
+            values = tail if start == 0 else np.concatenate((prev, tail))
+            values.flags.writeable = False
+            self.stats["computed_bars"] += n - start
+
+            self._store((series_id, key), values)
+            return values
+
+    def _store(self, key: tuple, values: np.ndarray) -> None:
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._bytes -= old[0].nbytes
+        self._cache[key] = (values, len(values))
+        self._bytes += values.nbytes
+        # evict least recently used nodes, never the one just stored
+        while self._bytes > self.max_bytes and len(self._cache) > 1:
+            _, (evicted, _) = self._cache.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.stats["evictions"] += 1
+
+    @staticmethod
+    def _first_change(previous: dict | None, columns: dict) -> int:
+        if previous is None or previous.keys() != columns.keys():
+            return 0
+        n = min(len(next(iter(previous.values()))), len(next(iter(columns.values()))))
+        first = n
+        for name, values in columns.items():
+            old = previous[name][:n]
+            changed = np.flatnonzero(
+                (old != values[:n]) & ~(np.isnan(old) & np.isnan(values[:n]))
+            )
+            if len(changed):
+                first = min(first, int(changed[0]))
+        return first
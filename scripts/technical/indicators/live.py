@@ -0,0 +1,49 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+
+class LiveIndicator:
+    """
+    Runs a streaming indicator over the window of a live feed.
+
+    Called with the current window (a DataFrame whose last row is the forming
+    candle), it applies each closed candle to the indicator once and peeks the
+    forming one, so every tick costs O(new candles) instead of a recompute of
+    the window. Returns a Series aligned with the window, which is what
+    `Plotter.serve` and `Plotter.live_app` expect from an indicator function.
+
+    Params:
+    - indicator: Streaming indicator, e.g. RSI(14).
+    - columns: Columns passed to `update`, e.g. ("High", "Low", "Close") for ATR.
+    - key: Item of a tuple valued indicator to return, e.g. 0 for the MACD line.
+    - maxlen: Number of past values kept to realign with the window.
+    """
+
+    def __init__(self, indicator, columns=("Close",), key: int = None, maxlen=10_000):
+        self.indicator = indicator
+        self.columns = list(columns)
+        self.key = key
+        self.maxlen = maxlen
+        self._history = OrderedDict()
+        self._last = None
+
+    def __call__(self, data: pd.DataFrame) -> pd.Series:
+        dates = data.index.as_unit("ms").asi8
+        rows = data[self.columns].to_numpy("float64")
+
+        # closed candles not seen yet, then the forming one
+        start = 0 if self._last is None else int(np.searchsorted(dates, self._last, "right"))
+        for ts, row in zip(dates[start:-1], rows[start:-1]):
+            self._history[ts] = self._select(self.indicator.update(*row))
+            self._last = ts
+        while len(self._history) > self.maxlen:
+            self._history.popitem(last=False)
+
+        values = [self._history.get(ts, np.nan) for ts in dates[:-1]]
+        if len(dates):
+            values.append(self._select(self.indicator.peek(*rows[-1])))
+        return pd.Series(values, index=data.index, dtype="float64")
+
+    def _select(self, value):
+        return value if self.key is None else value[self.key]
@@ -0,0 +1,35 @@
+from ._abstract import __Indicator
+from ._batch import as_array, like, smooth
+from .ema import EMA
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    Moving average convergence divergence.
+
+    Returns the MACD line (fast EMA - slow EMA), its signal line (EMA of the
+    MACD line from its first value) and the histogram (MACD - signal).
+    """
+    prices = as_array(close)
+    line = smooth(prices, fast, 2 / (fast + 1)) - smooth(prices, slow, 2 / (slow + 1))
+    signal_line = smooth(line, signal, 2 / (signal + 1))
+    return (
+        like(line, close),
+        like(signal_line, close),
+        like(line - signal_line, close),
+    )
+
+
+class MACD(__Indicator):
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__(slow)
+        self.__fast = EMA(fast)
+        self.__slow = EMA(slow)
+        self.__signal = EMA(signal)
+        self.value = (float("nan"),) * 3
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        line = self.__fast.update(close) - self.__slow.update(close)
+        signal_line = self.__signal.update(line)
+        self.value = (line, signal_line, line - signal_line)
+        return self.value
@@ -0,0 +1,45 @@
+import numpy as np
+
+from ._abstract import __Indicator
+from ._batch import as_array, like, smooth
+from .ema import EMA
+
+
+# 100 - 100 / (1 + gain / loss), 100 without losses and 50 on a flat market
+def _rsi(gain, loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100 - 100 / (1 + gain / loss)
+    return np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), value)
+
+
+def rsi(close, period: int = 14):
+    """
+    Wilder's relative strength index: average gains and losses of the close
+    are smoothed with alpha = 1 / period. The first value is at `period`.
+    """
+    # the first bar has no change, smoothing starts after it
+    change = np.diff(as_array(close), prepend=np.nan)
+    gain = smooth(np.maximum(change, 0.0), period, 1 / period)
+    loss = smooth(np.maximum(-change, 0.0), period, 1 / period)
+    return like(_rsi(gain, loss), close)
+
+
+class RSI(__Indicator):
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.__gain = EMA(period, alpha=1 / period)
+        self.__loss = EMA(period, alpha=1 / period)
+        self.__close = None
+
+    def update(self, close: float) -> float:
+        if self.__close is not None:
+            change = close - self.__close
+            gain = self.__gain.update(max(change, 0.0))
+            loss = self.__loss.update(max(-change, 0.0))
+            if self.__gain.ready:
+                if loss == 0:
+                    self.value = 100.0 if gain > 0 else 50.0
+                else:
+                    self.value = 100 - 100 / (1 + gain / loss)
+        self.__close = close
+        return self.value
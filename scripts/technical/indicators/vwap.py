@@ -0,0 +1,271 @@
+import math
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+from ._abstract import __Indicator
+from ._batch import as_array, like
+
+
+def typical_price(high, low, close):
+    return (as_array(high) + as_array(low) + as_array(close)) / 3
+
+
+# mean and k standard deviations from volume weighted sums of prices centered
+# on `ref`; centering keeps the variance from cancelling out at large prices
+def _bands(volume, weighted, squared, ref, k):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = weighted / volume
+        deviation = k * np.sqrt(np.maximum(squared / volume - mean**2, 0.0))
+    return ref + mean, ref + mean + deviation, ref + mean - deviation
+
+
+def vwap(high, low, close, volume, sessions=None, k: float = 1.0):
+    """
+    Volume weighted average price of the typical price (high + low + close) / 3
+    and its bands `k` volume weighted standard deviations around it.
+
+    Params:
+    - high, low, close, volume: Series or arrays of the bars.
+    - sessions: Session label of each bar (e.g. its day), the VWAP restarts
+      whenever it changes. None for one VWAP from the first bar.
+    - k: Width of the bands in standard deviations.
+
+    Returns the VWAP, upper and lower bands.
+    """
+    price = typical_price(high, low, close)
+    volume = as_array(volume)
+    ref = price[0] if len(price) else 0.0
+    centered = price - ref
+
+    sums = pd.DataFrame(
+        {"volume": volume, "weighted": volume * centered, "squared": volume * centered**2}
+    )
+    if sessions is None:
+        sums = sums.cumsum()
+    else:
+        labels = np.asarray(sessions)
+        starts = np.ones(len(labels), dtype=bool)
+        starts[1:] = labels[1:] != labels[:-1]
+        # one segmented cumulative sum over all sessions at once
+        sums = sums.groupby(np.cumsum(starts)).cumsum()
+
+    bands = _bands(
+        sums["volume"].to_numpy(),
+        sums["weighted"].to_numpy(),
+        sums["squared"].to_numpy(),
+        ref,
+        k,
+    )
+    return tuple(like(band, close) for band in bands)
+
+
+def session_vwap(data: pd.DataFrame, freq: str = "1D", k: float = 1.0):
+    """VWAP bands restarting every `freq` session (e.g. "1D", "1W") of the index."""
+    sessions = data.index.floor(freq).asi8
+    return vwap(data["High"], data["Low"], data["Close"], data["Volume"], sessions, k)
+
+
+def anchor_positions(index: pd.DatetimeIndex, anchors) -> np.ndarray:
+    """
+    Bar positions of `anchors`: timestamps, or pivots as returned by the
+    trend detectors (date, price, label), mapped to the bar at or after them.
+    """
+    dates = [anchor[0] if isinstance(anchor, tuple) else anchor for anchor in anchors]
+    return index.searchsorted(pd.DatetimeIndex(dates))
+
+
+@dataclass(frozen=True)
+class AnchoredBands:
+    """
+    VWAP bands of many anchors, kept as the cumulative sums of the bars they
+    share: O(bars + anchors) memory however many anchors there are. The bands
+    of an anchor are only computed when it is indexed, over its own window.
+    """
+
+    sums: np.ndarray  # (3, bars + 1), totals of bars [0, t) at column t
+    positions: np.ndarray  # anchor bar of each anchor
+    stops: np.ndarray  # end (exclusive) of each anchor's window
+    ref: float
+    k: float
+    index: pd.Index | None = None  # dates of the bars, for Series output
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, i: int):
+        """VWAP, upper and lower band of anchor `i` over its window."""
+        anchor, stop = self.positions[i], self.stops[i]
+        # an anchor at bar a sees sums[:, t + 1] - sums[:, a] at bar t
+        totals = self.sums[:, anchor + 1 : stop + 1] - self.sums[:, anchor, None]
+        bands = _bands(*totals, self.ref, self.k)
+        if self.index is None:
+            return bands
+        return tuple(pd.Series(band, index=self.index[anchor:stop]) for band in bands)
+
+    def at(self, bar: int):
+        """
+        VWAP, upper and lower band of every anchor at bar position `bar`, NaN
+        for anchors whose window does not cover it. Series indexed by the
+        anchor dates when the bars have an index.
+        """
+        n = self.sums.shape[1] - 1
+        bar = bar + n if bar < 0 else bar
+        anchors = np.minimum(self.positions, n)
+        totals = self.sums[:, bar + 1, None] - self.sums[:, anchors]
+        bands = _bands(*totals, self.ref, self.k)
+        outside = (bar < self.positions) | (bar >= self.stops)
+        for band in bands:
+            band[outside] = np.nan
+        if self.index is None:
+            return bands
+        labels = self.index[np.minimum(self.positions, max(n - 1, 0))]
+        return tuple(pd.Series(band, index=labels) for band in bands)
+
+
+def anchored_vwap(high, low, close, volume, anchors, k: float = 1.0, length=None):
+    """
+    VWAP bands from each anchor bar onwards, for all anchors from one set of
+    cumulative sums of the bars.
+
+    Params:
+    - high, low, close, volume: Series or arrays of the bars.
+    - anchors: Bar positions, or, for Series input, timestamps or the pivots
+      of `ZigZag`/`DirectionalChange` (see `anchor_positions`).
+    - k: Width of the bands in standard deviations.
+    - length: Number of bars each anchored VWAP runs for (default: to the end).
+
+    Returns `AnchoredBands`: `bands[i]` are the VWAP, upper and lower bands of
+    anchor i over its window, `bands.at(bar)` the values of every anchor at
+    one bar. Series (indexed by date) for Series input, arrays otherwise.
+    """
+    price = typical_price(high, low, close)
+    volume = as_array(volume)
+    if isinstance(close, pd.Series) and not np.issubdtype(
+        np.asarray(anchors).dtype, np.integer
+    ):
+        positions = anchor_positions(close.index, anchors)
+    else:
+        positions = np.asarray(anchors, dtype="int64")
+
+    n = len(price)
+    ref = price[0] if n else 0.0
+    centered = price - ref
+    sums = np.zeros((3, n + 1))
+    np.cumsum(volume, out=sums[0, 1:])
+    np.cumsum(volume * centered, out=sums[1, 1:])
+    np.cumsum(volume * centered**2, out=sums[2, 1:])
+
+    positions = np.minimum(positions, n)
+    stops = np.full(len(positions), n) if length is None else np.minimum(positions + length, n)
+    return AnchoredBands(
+        sums,
+        positions,
+        stops,
+        ref,
+        k,
+        close.index if isinstance(close, pd.Series) else None,
+    )
+
+
+class VWAP(__Indicator):
+    """
+    Streaming VWAP bands. Passing a `session` label to `update` restarts the
+    VWAP whenever it changes, e.g. `timestamp // 86_400_000` for daily sessions.
+    """
+
+    def __init__(self, k: float = 1.0):
+        super().__init__()
+        self.__k = k
+        self.__ref = None
+        self.__session = None
+        self.__sums = [0.0, 0.0, 0.0]
+        self.value = (np.nan,) * 3
+
+    def update(self, high, low, close, volume, session=None):
+        price = (high + low + close) / 3
+        if self.__ref is None:
+            self.__ref = price
+        if session != self.__session:
+            self.__session = session
+            self.__sums = [0.0, 0.0, 0.0]
+
+        centered = price - self.__ref
+        self.__sums[0] += volume
+        self.__sums[1] += volume * centered
+        self.__sums[2] += volume * centered * centered
+
+        total, weighted, squared = self.__sums
+        if total > 0:
+            mean = weighted / total
+            deviation = self.__k * math.sqrt(max(squared / total - mean * mean, 0.0))
+            mean += self.__ref
+            self.value = (mean, mean + deviation, mean - deviation)
+        return self.value
+
+
+class AnchoredVWAP(__Indicator):
+    """
+    Streaming VWAP bands from any number of anchor bars, in O(anchors) per bar.
+
+    The cumulative sums of every bar are kept, so anchors can be added at
+    past bars, e.g. at a pivot once the trend detector has confirmed it.
+    `update` returns the VWAP, upper and lower bands as arrays, one value
+    per anchor in the order they were added.
+    """
+
+    def __init__(self, k: float = 1.0):
+        super().__init__()
+        self.__k = k
+        self.__ref = None
+        self.__sums = np.zeros((1024, 3))
+        self.__bars = 0
+        self.__anchors = np.zeros(0, dtype="int64")
+        self.value = (np.zeros(0),) * 3
+
+    @property
+    def bars(self):
+        return self.__bars
+
+    @property
+    def anchors(self):
+        return self.__anchors
+
+    @property
+    def ready(self) -> bool:
+        return len(self.__anchors) > 0
+
+    def add_anchor(self, bar: int | None = None) -> None:
+        """Anchor at bar position `bar`, by default the next bar to arrive."""
+        bar = self.__bars if bar is None else bar
+        if not 0 <= bar <= self.__bars:
+            raise ValueError(f"anchor bar {bar} is not in [0, {self.__bars}]")
+        self.__anchors = np.append(self.__anchors, bar)
+
+    def update(self, high, low, close, volume):
+        if self.__ref is None:
+            self.__ref = (high + low + close) / 3
+        totals = self.__totals(high, low, close, volume, self.__ref)
+        if self.__bars + 1 == len(self.__sums):
+            self.__sums = np.concatenate((self.__sums, np.zeros_like(self.__sums)))
+        self.__bars += 1
+        self.__sums[self.__bars] = totals
+        self.value = self.__value(totals, self.__ref)
+        return self.value
+
+    def peek(self, high, low, close, volume):
+        # the first bar would become the reference price, without setting it
+        ref = (high + low + close) / 3 if self.__ref is None else self.__ref
+        return self.__value(self.__totals(high, low, close, volume, ref), ref)
+
+    def __totals(self, high, low, close, volume, ref):
+        centered = (high + low + close) / 3 - ref
+        return self.__sums[self.__bars] + (
+            volume,
+            volume * centered,
+            volume * centered * centered,
+        )
+
+    def __value(self, totals, ref):
+        since = totals - self.__sums[self.__anchors]
+        return _bands(since[:, 0], since[:, 1], since[:, 2], ref, self.__k)
@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 
+from .._figure import show_or_save
+from ..result_cache import CacheableFit
 
-class __ProfileAnalyzer(ABC):
+
+class __ProfileAnalyzer(ABC, CacheableFit):
     def __init__(self, data: pd.DataFrame, bin_size: int, perc: int):
         super().__init__()
         self.__data = data
@@ -61,5 +65,29 @@ class __ProfileAnalyzer(ABC):
         pass
 
     @abstractmethod
-    def plot(self):
+    def plot(self, fig=None, save_path=None):
         pass
+
+    # result cache, see `CacheableFit`: the profile columns and value area,
+    # the POC is found again from the profile
+    def _cache_params(self):
+        return {"bin_size": self.bin_size, "perc": self.perc}
+
+    def _dump_result(self):
+        arrays = {f"profile_{name}": self.profile[name].to_numpy() for name in self.profile}
+        arrays["profile_index"] = self.profile.index.to_numpy()
+        arrays["va"] = np.asarray(self.va, dtype="float64")
+        return arrays
+
+    def _load_result(self, arrays):
+        columns = {
+            name[len("profile_") :]: values
+            for name, values in arrays.items()
+            if name.startswith("profile_") and name != "profile_index"
+        }
+        self.profile = pd.DataFrame(columns, index=pd.Index(arrays["profile_index"]))
+        self.poc = type(self).poc(self)
+        self.va = tuple(arrays["va"])
+        return self.profile, self.poc, self.va
+
+    show_or_save = staticmethod(show_or_save)
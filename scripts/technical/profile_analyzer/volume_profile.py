@@ -1,6 +1,5 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 from ._abstract import __ProfileAnalyzer
 
@@ -13,17 +12,26 @@ class VolumeProfile(__ProfileAnalyzer):
         if self.data is None:
             raise ValueError("Error: `data` is required but missing")
 
-        price_min = self.data["Low"].min()
-        price_max = self.data["High"].max()
+        # plain arrays work for both a DataFrame and an OHLCV container
+        lows = np.asarray(self.data["Low"])
+        highs = np.asarray(self.data["High"])
+        volumes = np.asarray(self.data["Volume"])
+
+        price_min = lows.min()
+        price_max = highs.max()
         bins, bin_step = np.linspace(price_min, price_max, self.bin_size, retstep=True)
         volume_counts = np.zeros(len(bins))
 
-        for _, row in self.data.iterrows():
-            price_range = np.arange(row["Low"], row["High"], bin_step)
+        for low, high, volume in zip(lows, highs, volumes):
+            price_range = np.arange(low, high, bin_step)
+            if not len(price_range):
+                continue
             indicies = np.digitize(price_range, bins)
-            for idx in indicies:
-                if 0 <= idx < len(volume_counts):
-                    volume_counts[idx] += row["Volume"] / len(price_range)
+            np.add.at(
+                volume_counts,
+                indicies[indicies < len(volume_counts)],
+                volume / len(price_range),
+            )
 
         profile = pd.DataFrame({"Price": np.round(bins, 2), "Volume": volume_counts})
         profile = profile.sort_values(by="Price", ascending=False)
@@ -56,14 +64,19 @@ class VolumeProfile(__ProfileAnalyzer):
 
         return (min(value_prices), max(value_prices))
 
-    def plot(self):
-        # Create figure and axes
-        fig, axes = plt.subplots(
+    def plot(self, fig=None, save_path: str | None = None):
+        # matplotlib is only needed for plotting, keep it out of fit()
+        import matplotlib.pyplot as plt
+
+        # Create figure and axes, or reuse the given figure
+        if fig is None:
+            fig = plt.figure(figsize=(20, 8), facecolor="black")
+        else:
+            fig.clear()
+        axes = fig.subplots(
             1,
             2,
-            figsize=(20, 8),
             gridspec_kw={"width_ratios": [3, 1]},
-            facecolor="black",
             sharey=True,
         )
         fig.subplots_adjust(wspace=0)
@@ -144,5 +157,5 @@ class VolumeProfile(__ProfileAnalyzer):
         axes[1].invert_xaxis()
         axes[1].grid(True, linestyle="--", linewidth=0.5, color="#F2F6D0", alpha=0.5)
 
-        # Show plot
-        plt.show()
+        # Show or save plot
+        self.show_or_save(fig, save_path)
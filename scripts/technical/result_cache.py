@@ -0,0 +1,209 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from ..utils.instrumentation import count, timed
+
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+# bump when the stored layout changes, older entries are then never hit
+VERSION = 2
+
+
+def fingerprint(data) -> str:
+    """
+    Fast hash of an analyzer's input: the OHLCV columns it has and its index,
+    hashed as raw bytes. A DataFrame and an `OHLCV` holding the same bars
+    hash differently (index units differ), which only costs a miss.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    columns = [name for name in COLUMNS if _has_column(data, name)]
+    digest.update(",".join(columns).encode())
+    for name in columns:
+        digest.update(np.ascontiguousarray(np.asarray(data[name], dtype="float64")).data)
+    index = np.asarray(data.index)
+    if index.dtype.kind in "iuMm":
+        digest.update(np.ascontiguousarray(index).view("uint8").data)
+    else:
+        digest.update(str(index.tolist()).encode())
+    return digest.hexdigest()
+
+
+def _has_column(data, name: str) -> bool:
+    try:
+        data[name]
+    except (KeyError, AttributeError):
+        return False
+    return True
+
+
+class ResultCache:
+    """
+    Size-bounded on-disk cache of analyzer results, keyed by content.
+
+    Each entry is an uncompressed `.npz` of the arrays an analyzer needs to
+    restore its fit, named `<Class>-<key>.npz` where the key hashes the input
+    bars (`fingerprint`), the class and its parameters. Hits refresh the
+    file's mtime and the least recently used entries are evicted once the
+    directory grows over `max_bytes`. Writes are atomic, so several processes
+    can share a directory.
+
+    Params:
+    - directory: Where the entries are stored.
+    - max_bytes: Size limit of the directory.
+    """
+
+    def __init__(self, directory: str | Path = "./.cache/analyzers", max_bytes: int = 512 * 2**20):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+    def key(self, analyzer) -> str:
+        """Cache key of `analyzer` with its current data and parameters."""
+        params = json.dumps(analyzer._cache_params(), sort_keys=True, default=str)
+        text = f"{VERSION}:{type(analyzer).__qualname__}:{params}:{fingerprint(analyzer.data)}"
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.directory / f"{kind}-{key}.npz"
+
+    def get(self, kind: str, key: str) -> dict | None:
+        """Arrays stored under `key`, None on a miss."""
+        path = self._path(kind, key)
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                arrays = {name: archive[name] for name in archive.files}
+        except (FileNotFoundError, zipfile.BadZipFile, ValueError, OSError):
+            with self.__lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        with self.__lock:
+            self.hits += 1
+        return arrays
+
+    def put(self, kind: str, key: str, arrays: dict) -> None:
+        path = self._path(kind, key)
+        tmp_file = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_file, "wb") as f:
+            np.savez(f, **arrays)
+        tmp_file.replace(path)
+        self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def invalidate(self, target=None) -> int:
+        """
+        Remove entries: all of them for None, those of an analyzer class (or
+        class name), or the one of an analyzer instance with its current data
+        and parameters. Returns the number removed.
+        """
+        if target is None:
+            paths = list(self.directory.glob("*.npz"))
+        elif isinstance(target, (str, type)):
+            kind = target if isinstance(target, str) else target.__qualname__
+            paths = list(self.directory.glob(f"{kind}-*.npz"))
+        else:
+            paths = [self._path(type(target).__qualname__, self.key(target))]
+        removed = 0
+        for path in paths:
+            if path.exists():
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        return self.invalidate()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __repr__(self):
+        return f"ResultCache({str(self.directory)!r}, max_bytes={self.max_bytes})"
+
+
+class CacheableFit:
+    """
+    Opt-in result caching for analyzers.
+
+    Every `fit` defined by a subclass is wrapped: while a `ResultCache` is set
+    with `use_cache`, a fit on bars and parameters seen before restores its
+    result from the cache instead of computing it. Setting the cache on a
+    base class enables it for all its subclasses, `use_cache(None)` on a
+    subclass disables it there again.
+
+    Subclasses provide `_cache_params()`, `_dump_result()` (arrays) and
+    `_load_result(arrays)` (sets the fitted state, returns what `fit` returns).
+
+    The wrapped `fit` is also timed as the "fit" stage, labelled with the
+    analyzer, for `scripts.utils.instrumentation`.
+    """
+
+    result_cache: ResultCache | None = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "fit" in cls.__dict__ and not getattr(cls.__dict__["fit"], "__isabstractmethod__", False):
+            cls.fit = timed("fit", analyzer=cls.__name__)(_cached_fit(cls.__dict__["fit"]))
+
+    @classmethod
+    def use_cache(cls, cache: ResultCache | None) -> None:
+        cls.result_cache = cache
+
+
+def _cached_fit(fit):
+    @functools.wraps(fit)
+    def wrapper(self, *args, **kwargs):
+        cache = type(self).result_cache
+        if cache is None or args or kwargs or self.data is None:
+            return fit(self, *args, **kwargs)
+        kind, key = type(self).__qualname__, cache.key(self)
+        arrays = cache.get(kind, key)
+        if arrays is not None:
+            count("cache_hits", analyzer=kind)
+            return self._load_result(arrays)
+        count("cache_misses", analyzer=kind)
+        result = fit(self)
+        cache.put(kind, key, self._dump_result())
+        return result
+
+    return wrapper
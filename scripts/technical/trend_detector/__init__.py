@@ -1,2 +1,2 @@
-from zigzag import ZigZag
-from directional_change import DirectionalChange
+from .zigzag import ZigZag
+from .directional_change import DirectionalChange
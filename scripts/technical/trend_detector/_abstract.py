@@ -1,14 +1,18 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
+from .._figure import show_or_save
+from ..result_cache import CacheableFit
 
-class __TrendDetector(ABC):
+
+class __TrendDetector(ABC, CacheableFit):
     def __init__(self, data: pd.DataFrame, threshold: float):
         super().__init__()
         self.__data = data
         self.__threshold = threshold / 100
         self.__pivots = []
+        self.__confirmations = []
 
     @property
     def data(self):
@@ -26,6 +30,19 @@ class __TrendDetector(ABC):
     def pivots(self, pivots):
         self.__pivots = pivots
 
+    @property
+    def confirmations(self):
+        """
+        (confirmation date, pivot date, price, label) of every pivot at the bar
+        it became known, in order. Pivots later replaced by the detector are
+        listed too, so signals built from these have no look-ahead.
+        """
+        return self.__confirmations
+
+    @confirmations.setter
+    def confirmations(self, confirmations):
+        self.__confirmations = confirmations
+
     @abstractmethod
     def find_pivots(self, close, high, low):
         pass
@@ -34,26 +51,80 @@ class __TrendDetector(ABC):
     def fit(self):
         pass
 
-    def plot(self):
-        plt.figure(figsize=(20, 6))
-        plt.plot(
+    # result cache, see `CacheableFit`: pivots are stored by bar position
+    def _cache_params(self):
+        return {"threshold": self.threshold}
+
+    def _dump_result(self):
+        index = np.asarray(self.data.index)
+
+        def bars(dates):
+            return np.searchsorted(index, np.asarray(dates, dtype=index.dtype))
+
+        pivot_dates, pivot_prices, pivot_labels = zip(*self.pivots) if self.pivots else ((),) * 3
+        confirmed = list(zip(*self.confirmations)) if self.confirmations else [()] * 4
+        return {
+            "pivot_bar": bars(pivot_dates),
+            "pivot_price": np.asarray(pivot_prices, dtype="float64"),
+            "pivot_high": np.asarray([label == "High" for label in pivot_labels], dtype=bool),
+            "confirmed_bar": bars(confirmed[0]),
+            "confirmed_pivot_bar": bars(confirmed[1]),
+            "confirmed_price": np.asarray(confirmed[2], dtype="float64"),
+            "confirmed_high": np.asarray([label == "High" for label in confirmed[3]], dtype=bool),
+        }
+
+    def _load_result(self, arrays):
+        index = self.data.index
+        # iterating a taken index keeps its scalar type (Timestamp, datetime64)
+        self.pivots = list(
+            zip(
+                index[arrays["pivot_bar"]],
+                arrays["pivot_price"],
+                np.where(arrays["pivot_high"], "High", "Low").tolist(),
+            )
+        )
+        self.confirmations = list(
+            zip(
+                index[arrays["confirmed_bar"]],
+                index[arrays["confirmed_pivot_bar"]],
+                arrays["confirmed_price"],
+                np.where(arrays["confirmed_high"], "High", "Low").tolist(),
+            )
+        )
+        return self.pivots
+
+    def plot(self, fig=None):
+        # matplotlib is only needed for plotting, keep it out of fit()
+        import matplotlib.pyplot as plt
+
+        # Create figure and axes, or reuse the given figure
+        if fig is None:
+            fig = plt.figure(figsize=(20, 6))
+        else:
+            fig.clear()
+        ax = fig.subplots()
+        ax.plot(
             self.data.index, self.data["Close"], label="Price", color="blue", alpha=0.5
         )
 
         if self.pivots:
             pivot_dates, pivot_prices, pivot_labels = zip(*self.pivots)
-            plt.scatter(
+            ax.scatter(
                 pivot_dates,
                 pivot_prices,
                 c=["green" if label == "High" else "red" for label in pivot_labels],
                 label="Pivots",
             )
-            plt.plot(
+            ax.plot(
                 pivot_dates, pivot_prices, color="black", linestyle="--", alpha=0.6
             )
 
-        plt.xlabel("Date")
-        plt.ylabel("Price")
-        plt.legend()
-        plt.xticks(rotation=45)
-        plt.grid()
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Price")
+        ax.legend()
+        ax.tick_params(axis="x", labelrotation=45)
+        ax.grid()
+
+        return ax
+
+    show_or_save = staticmethod(show_or_save)
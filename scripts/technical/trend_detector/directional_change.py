@@ -1,5 +1,5 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from ._abstract import __TrendDetector
 
@@ -7,6 +7,8 @@ from ._abstract import __TrendDetector
 class DirectionalChange(__TrendDetector):
     def __init__(self, data: pd.DataFrame, threshold=5.0):
         super().__init__(data, threshold)
+        self.__confirmed_at = []
+        self.__state = None
 
     def obstacle_trend_market(self, close):
         """todo:
@@ -15,24 +17,41 @@ class DirectionalChange(__TrendDetector):
         """
         pass
 
-    def find_pivots(self, close, high, low):
-        # initial value
-        up_zig = False
-        peak = high[0]
-        peak_idx = 0
-        valley = low[0]
-        valley_idx = 0
+    @property
+    def state(self):
+        """Where `find_pivots` stopped, pass it back to resume on more bars."""
+        return self.__state
 
-        # variable to store points
+    @property
+    def confirmed_at(self):
+        """Bar confirming each pivot of the last `find_pivots` call."""
+        return self.__confirmed_at
+
+    def find_pivots(self, close, high, low, state=None):
+        # initial value, or the state of a previous call on the same bars if
+        # they were extended since, so only the new bars are visited
+        if state is None:
+            up_zig = False
+            peak = high[0]
+            peak_idx = 0
+            valley = low[0]
+            valley_idx = 0
+            start = 1
+        else:
+            up_zig, peak, peak_idx, valley, valley_idx, start = state
+
+        # variable to store points and the bars confirming them
         pivot_points = []
+        confirmed_at = []
 
-        for i in range(1, len(close)):
+        for i in range(start, len(close)):
             if up_zig:
                 if peak < high[i]:
                     peak = high[i]
                     peak_idx = i
                 elif close[i] <= peak * (1 - self.threshold):
                     pivot_points.append((peak_idx, peak, "High"))
+                    confirmed_at.append(i)
 
                     up_zig = False
                     valley = low[i]
@@ -43,28 +62,53 @@ class DirectionalChange(__TrendDetector):
                     valley_idx = i
                 elif close[i] >= valley * (1 + self.threshold):
                     pivot_points.append((valley_idx, valley, "Low"))
+                    confirmed_at.append(i)
 
                     up_zig = True
                     peak = high[i]
                     peak_idx = i
 
+        self.__confirmed_at = confirmed_at
+        self.__state = (up_zig, peak, peak_idx, valley, valley_idx, len(close))
         return pivot_points
 
     def fit(self):
         # convert series to numpy
-        close = self.data["Close"].to_numpy()
-        high = self.data["High"].to_numpy()
-        low = self.data["Low"].to_numpy()
+        close = np.asarray(self.data["Close"])
+        high = np.asarray(self.data["High"])
+        low = np.asarray(self.data["Low"])
 
         # find points
         pivot_points = self.find_pivots(close, high, low)
         self.pivots = [
             (self.data.index[idx], price, label) for idx, price, label in pivot_points
         ]
+        self.confirmations = [
+            (self.data.index[i], date, price, label)
+            for i, (date, price, label) in zip(self.__confirmed_at, self.pivots)
+        ]
 
         return self.pivots
 
-    def plot(self):
-        super().plot()
-        plt.title("Directional Change Algorithm")
-        plt.show()
+    # the cached result also restores where `find_pivots` stopped, to resume from it
+    def _dump_result(self):
+        up_zig, peak, peak_idx, valley, valley_idx, start = self.__state
+        return {
+            **super()._dump_result(),
+            "state_up_zig": np.asarray(up_zig, dtype=bool),
+            "state_prices": np.asarray([peak, valley], dtype="float64"),
+            "state_bars": np.asarray([peak_idx, valley_idx, start], dtype="int64"),
+            "confirmed_at": np.asarray(self.__confirmed_at, dtype="int64"),
+        }
+
+    def _load_result(self, arrays):
+        peak, valley = arrays["state_prices"].tolist()
+        peak_idx, valley_idx, start = arrays["state_bars"].tolist()
+        self.__state = (bool(arrays["state_up_zig"]), peak, peak_idx, valley, valley_idx, start)
+        self.__confirmed_at = arrays["confirmed_at"].tolist()
+        return super()._load_result(arrays)
+
+    def plot(self, fig=None, save_path: str | None = None):
+        ax = super().plot(fig)
+        ax.set_title("Directional Change Algorithm")
+        self.show_or_save(ax.figure, save_path)
@@ -1,11 +1,23 @@
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.signal import argrelextrema
 
 from ._abstract import __TrendDetector
 
 
+# indices where `comparator(data[i], data[i +- k])` holds for k in 1..order,
+# clipping at the edges like scipy.signal.argrelextrema without importing scipy
+def argrelextrema(data: np.ndarray, comparator, order: int = 1) -> tuple[np.ndarray]:
+    data = np.asarray(data)
+    positions = np.arange(len(data))
+    results = np.ones(len(data), dtype=bool)
+    for shift in range(1, order + 1):
+        results &= comparator(data, data[np.minimum(positions + shift, len(data) - 1)])
+        results &= comparator(data, data[np.maximum(positions - shift, 0)])
+        if not results.any():
+            break
+    return np.nonzero(results)
+
+
 class ZigZag(__TrendDetector):
     def __init__(self, data: pd.DataFrame, threshold=5.0, depth=10):
         super().__init__(data, threshold)
@@ -15,6 +27,9 @@ class ZigZag(__TrendDetector):
     def depth(self):
         return self.__depth
 
+    def _cache_params(self):
+        return {**super()._cache_params(), "depth": self.depth}
+
     def find_pivots(self, close, high, low):
         pivots = []
         # find peaks
@@ -40,16 +55,35 @@ class ZigZag(__TrendDetector):
         return sorted(pivots)
 
     def fit(self):
-        close = self.data["Close"].to_numpy()
-        high = self.data["High"].to_numpy()
-        low = self.data["Low"].to_numpy()
+        close = np.asarray(self.data["Close"])
+        high = np.asarray(self.data["High"])
+        low = np.asarray(self.data["Low"])
         # Find pivots
-        detected_pivots = self.find_pivots(close, high, low)
+        return self.connect_pivots(self.find_pivots(close, high, low))
+
+    def connect_pivots(self, detected_pivots):
+        """
+        Keep the pivots of `find_pivots` that move at least `threshold` from
+        the previous zigzag point. Only this step depends on `threshold`, so
+        the extrema of a `depth` can be found once and connected for many
+        thresholds.
+        """
+        n = len(self.data.index)
         if not detected_pivots:
+            self.pivots, self.confirmations = [], []
             return []
 
+        # A pivot is known once `depth` bars follow it, record each zigzag
+        # point as it is accepted or replaced
+        confirmed = []
+
+        def confirm(pivot):
+            if pivot[0] + self.depth < n:
+                confirmed.append((pivot[0] + self.depth, *pivot))
+
         # Assume the first pivot is always one of zigzag points
         zigzag_points = [detected_pivots[0]]
+        confirm(detected_pivots[0])
         for i in range(1, len(detected_pivots)):
             last_pivot = zigzag_points[-1]
             current_pivot = detected_pivots[i]
@@ -59,6 +93,7 @@ class ZigZag(__TrendDetector):
 
                 if price_change >= self.threshold:
                     zigzag_points.append(current_pivot)
+                    confirm(current_pivot)
 
             else:
                 if len(zigzag_points) > 2:
@@ -76,18 +111,24 @@ class ZigZag(__TrendDetector):
                             and current_pivot[1] >= last_pivot[1]
                         ):
                             zigzag_points[-1] = current_pivot
+                            confirm(current_pivot)
                         elif (
                             current_pivot[2] == "Low"
                             and current_pivot[1] <= last_pivot[1]
                         ):
                             zigzag_points[-1] = current_pivot
+                            confirm(current_pivot)
 
         self.pivots = [
             (self.data.index[i], price, label) for i, price, label in zigzag_points
         ]
+        self.confirmations = [
+            (self.data.index[j], self.data.index[i], price, label)
+            for j, i, price, label in sorted(confirmed, key=lambda event: event[0])
+        ]
         return self.pivots
 
-    def plot(self):
-        super().plot()
-        plt.title("Zigzag Algorithm")
-        plt.show()
+    def plot(self, fig=None, save_path: str | None = None):
+        ax = super().plot(fig)
+        ax.set_title("Zigzag Algorithm")
+        self.show_or_save(ax.figure, save_path)
@@ -1,20 +1,176 @@
-import ccxt
-from ccxt.base.types import Any
+import hashlib
+import json
+import os
+import time
+import asyncio
+import threading
+import weakref
+from pathlib import Path
+from typing import Any
 
 
-def get_exchange(exchange_id: str) -> Any:
+MARKETS_CACHE_DIR = Path("./data/.markets")
+MARKETS_TTL = 24 * 60 * 60  # seconds
+
+# seconds per timeframe unit, as in ccxt.Exchange.parse_timeframe
+TIMEFRAME_UNITS = {
+    "y": 60 * 60 * 24 * 365,
+    "M": 60 * 60 * 24 * 30,
+    "w": 60 * 60 * 24 * 7,
+    "d": 60 * 60 * 24,
+    "h": 60 * 60,
+    "m": 60,
+    "s": 1,
+}
+
+# process-wide exchange pool, keyed by exchange id and options
+_exchanges: dict[tuple, Any] = {}
+_exchanges_lock = threading.Lock()
+# async exchanges per event loop, dropped with the loop: a loop id can be
+# reused by a new loop, which must not get a client bound to the dead one
+_async_exchanges: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+    weakref.WeakKeyDictionary()
+)
+# one lock per key, so a slow market load only holds up callers of that key
+_key_locks: dict[tuple, threading.Lock] = {}
+
+
+def _replay_exchange(config: dict) -> Any:
+    from .replay_exchange import ReplayExchange
+
+    return ReplayExchange(config)
+
+
+# exchange ids served by local classes instead of ccxt
+_exchange_factories = {"replay": _replay_exchange}
+
+
+def register_exchange(exchange_id: str, factory) -> None:
+    """
+    Make `get_exchange(exchange_id, options)` return `factory(options)` instead
+    of a ccxt exchange, e.g. for replay or test doubles.
+    """
+    with _exchanges_lock:
+        _exchange_factories[exchange_id] = factory
+
+
+def _options_key(options: dict | None) -> str:
+    return json.dumps(options or {}, sort_keys=True, default=str)
+
+
+def get_exchange(
+    exchange_id: str, options: dict | None = None, markets_ttl: int = MARKETS_TTL
+) -> Any:
     """
     Configure exchange by id to get from ccxt ('binance', 'okx', 'kucoin', etc..)
+
+    Instances are pooled per (exchange_id, options), so callers share one HTTP
+    session and the markets loaded through `load_markets_cached`.
+    """
+    key = (exchange_id, _options_key(options))
+    with _exchanges_lock:
+        exchange = _exchanges.get(key)
+        if exchange is not None:
+            return exchange
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        with _exchanges_lock:
+            exchange = _exchanges.get(key)
+        if exchange is not None:
+            return exchange
+        if exchange_id in _exchange_factories:
+            exchange = _exchange_factories[exchange_id](dict(options or {}))
+        else:
+            # ccxt is only imported once a real exchange is needed
+            import ccxt
+
+            exchange_class = getattr(ccxt, exchange_id)
+            exchange = exchange_class(dict(options or {}))
+            load_markets_cached(exchange, markets_ttl, options=options)
+        with _exchanges_lock:
+            _exchanges[key] = exchange
+    return exchange
+
+
+def get_async_exchange(
+    exchange_id: str, options: dict | None = None, markets_ttl: int = MARKETS_TTL
+) -> Any:
     """
-    exchange_class = getattr(ccxt, exchange_id)
-    exchange = exchange_class({})
+    Asyncio counterpart of `get_exchange` built on `ccxt.async_support`.
+
+    The aiohttp session of an async exchange is bound to an event loop, so
+    instances are pooled per running loop as well.
+    """
+    loop = asyncio.get_running_loop()
+    key = (exchange_id, _options_key(options))
+    with _exchanges_lock:
+        # loops closed but still referenced somewhere are dropped as well
+        for closed in [other for other in _async_exchanges if other.is_closed()]:
+            del _async_exchanges[closed]
+        exchanges = _async_exchanges.setdefault(loop, {})
+        exchange = exchanges.get(key)
+        if exchange is None:
+            import ccxt.async_support as ccxt_async
+
+            exchange_class = getattr(ccxt_async, exchange_id)
+            exchange = exchange_class(dict(options or {}))
+            # markets from disk are set synchronously, a cache miss is left to
+            # the first awaited call that needs them
+            load_markets_cached(exchange, markets_ttl, fetch=False, options=options)
+            exchanges[key] = exchange
     return exchange
 
 
+async def close_async_exchanges() -> None:
+    """Close the sessions of the pooled async exchanges of the running loop."""
+    with _exchanges_lock:
+        exchanges = _async_exchanges.pop(asyncio.get_running_loop(), {})
+    for exchange in exchanges.values():
+        await exchange.close()
+
+
+def load_markets_cached(
+    exchange: Any, ttl: int = MARKETS_TTL, fetch: bool = True, options: dict | None = None
+) -> dict | None:
+    """
+    Set the exchange markets from the on-disk cache if it is younger than `ttl`
+    seconds, otherwise load them from the exchange and refresh the cache.
+
+    Markets depend on the options the exchange was created with (e.g.
+    `defaultType`, sandbox), so each option set has its own cache file.
+    """
+    options_hash = hashlib.sha1(_options_key(options).encode()).hexdigest()[:12]
+    cache_file = MARKETS_CACHE_DIR / f"{exchange.id}-{options_hash}.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < ttl:
+            with open(cache_file) as f:
+                cached = json.load(f)
+            return exchange.set_markets(cached["markets"], cached["currencies"])
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+
+    if not fetch:
+        return None
+
+    markets = exchange.load_markets()
+    MARKETS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(
+            {"markets": list(markets.values()), "currencies": exchange.currencies}, f
+        )
+    tmp_file.replace(cache_file)
+    return markets
+
+
 def timeframe_to_seconds(timeframe: str) -> int:
     """
     Translates the timeframe interval value written in the human readable
     form ('1m', '5m', '1h', '1d', '1w', etc.) to the number
     of seconds for one timeframe interval.
     """
-    return ccxt.Exchange.parse_timeframe(timeframe)
+    amount, unit = int(timeframe[:-1]), timeframe[-1]
+    if unit not in TIMEFRAME_UNITS:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return amount * TIMEFRAME_UNITS[unit]
@@ -1,8 +1,14 @@
+import io
+import os
+import json
+import time
 import pandas as pd
 from datetime import datetime, timedelta
+from pathlib import Path
 
 from .ccxt_helpers import get_exchange, timeframe_to_seconds
 from .datetime_helpers import dt_ts, dt_from_ts
+from .instrumentation import timed
 
 
 # convert data downloaded to dataframe
@@ -15,6 +21,7 @@ def convert_to_dataframe(data: list[list]) -> pd.DataFrame:
 
 
 # store data to csv file
+@timed("stored_csv")
 def stored_csv(new_df: pd.DataFrame, symbol: str, timeframe: str) -> None:
     # Define CSV file path
     csv_file = f"./data/{symbol.lower()}{timeframe}.csv"
@@ -36,6 +43,59 @@ def stored_csv(new_df: pd.DataFrame, symbol: str, timeframe: str) -> None:
     combined_df.to_csv(csv_file)
 
 
+# append rows to csv file without reading it back
+def append_csv(new_df: pd.DataFrame, csv_file: str | Path) -> None:
+    csv_file = Path(csv_file)
+    new_df.to_csv(csv_file, mode="a", header=not csv_file.exists())
+
+
+# put the rows of `rows_file` in front of those of `csv_file`, streaming both
+def prepend_csv(rows_file: str | Path, csv_file: str | Path, block_size: int = 1 << 20) -> None:
+    rows_file, csv_file = Path(rows_file), Path(csv_file)
+    tmp_file = csv_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as out:
+        with open(rows_file, "rb") as f:
+            while block := f.read(block_size):
+                out.write(block)
+        with open(csv_file, "rb") as f:
+            f.readline()  # the header is already written
+            while block := f.read(block_size):
+                out.write(block)
+    tmp_file.replace(csv_file)
+    rows_file.unlink()
+
+
+# read the last `n` rows of a csv file by seeking from its end
+def read_csv_tail(csv_file: str | Path, n: int, block_size: int = 1 << 16) -> pd.DataFrame | None:
+    csv_file = Path(csv_file)
+    if not csv_file.exists():
+        return None
+
+    with open(csv_file, "rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+
+        # grow the tail block until it holds n complete rows (or the whole body)
+        tail = b""
+        while pos > body_start and tail.count(b"\n") <= n:
+            step = min(block_size, pos - body_start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+
+    lines = tail.splitlines()
+    if pos > body_start:
+        lines = lines[1:]  # first line may be cut in the middle
+    lines = lines[-n:]
+    if not lines:
+        return None
+
+    text = (header + b"\n".join(lines)).decode()
+    return pd.read_csv(io.StringIO(text), index_col=["Date"], parse_dates=["Date"])
+
+
 # define number of data to fetch
 def fetch_limits(start_date: datetime, end_date: datetime, timeframe: str, limit=1000):
     # Calculate the time difference
@@ -55,7 +115,172 @@ def fetch_limits(start_date: datetime, end_date: datetime, timeframe: str, limit
     return parts
 
 
+# fetch one chunk, retrying transient errors with exponential backoff
+def fetch_with_retry(
+    exchange,
+    symbol: str,
+    timeframe: str,
+    since: int | None,
+    limit: int,
+    retries: int = 5,
+    backoff: float = 1.0,
+) -> list[list]:
+    import ccxt
+
+    for attempt in range(retries + 1):
+        try:
+            return exchange.fetch_ohlcv(symbol, timeframe, since, limit)
+        except ccxt.NetworkError:
+            # timeouts, rate limits and unavailable exchange are all NetworkError
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2**attempt)
+
+
+# yield ohlcv chunks in [since, until) one request at a time
+def iter_ohlcv(
+    exchange,
+    symbol: str,
+    timeframe: str,
+    since: int,
+    until: int,
+    limit: int = 1000,
+    retries: int = 5,
+    backoff: float = 1.0,
+):
+    timeframe_ms = timeframe_to_seconds(timeframe) * 1000
+    while since < until:
+        chunk = fetch_with_retry(
+            exchange, symbol, timeframe, since, limit, retries, backoff
+        )
+        chunk = [candle for candle in chunk if since <= candle[0] < until]
+        if not chunk:
+            break
+
+        yield chunk
+        since = chunk[-1][0] + timeframe_ms
+
+
+# streaming backfill, resumable from a checkpoint
+def backfill(
+    exchange_id: str,
+    symbol: str,
+    start: str,
+    end: str | None = None,
+    timeframe: str = "5m",
+    limit: int = 1000,
+    retries: int = 5,
+    backoff: float = 1.0,
+    data_dir: str = "./data",
+    exchange_options: dict | None = None,
+):
+    """
+    Download [start, end) chunk by chunk, appending each chunk to the local csv
+    store and recording a checkpoint cursor before yielding it as a DataFrame.
+
+    Only one chunk is held in memory at a time. Candles already in the store
+    are not fetched again: re-running the same call after a crash resumes after
+    the checkpoint (or after the last stored candle, if that is later). A range
+    starting before the first stored candle first downloads the older candles
+    into a side file, resumable the same way, which is then put in front of
+    the store in one streaming rewrite, and goes on after the store if `end`
+    is later.
+    """
+    exchange = get_exchange(exchange_id, exchange_options)
+    if not exchange.has["fetchOHLCV"]:
+        return
+
+    start = datetime.fromisoformat(start)
+    end = datetime.fromisoformat(end) if end is not None else datetime.now()
+    if start > end:
+        raise ValueError("Start date cannot be greater than end date.")
+
+    since = exchange.parse8601(start.isoformat())
+    until = exchange.parse8601(end.isoformat())
+    timeframe_ms = timeframe_to_seconds(timeframe) * 1000
+
+    csv_file = Path(data_dir) / f"{symbol.lower()}{timeframe}.csv"
+    checkpoint_file = csv_file.with_suffix(".checkpoint.json")
+
+    # the store covers [head, cursor]
+    head = cursor = prepend_cursor = None
+    if checkpoint_file.exists():
+        with open(checkpoint_file) as f:
+            checkpoint = json.load(f)
+        cursor, prepend_cursor = checkpoint["cursor"], checkpoint.get("prepend_cursor")
+    tail = read_csv_tail(csv_file, 1)
+    if tail is not None:
+        stored = int(tail.index.as_unit("ms").asi8[-1])
+        cursor = stored if cursor is None else max(cursor, stored)
+        first = pd.read_csv(csv_file, nrows=1, index_col=["Date"], parse_dates=["Date"])
+        head = int(first.index.as_unit("ms").asi8[0])
+
+    # candles older than the store, collected in a side file that survives a
+    # crash: a rerun resumes after its last row, as long as it starts early enough
+    rows_file = csv_file.with_suffix(".prepend.tmp")
+    rows = read_csv_tail(rows_file, 1) if rows_file.exists() else None
+    if rows is not None:
+        first = pd.read_csv(rows_file, nrows=1, index_col=["Date"], parse_dates=["Date"])
+        if head is None or since >= head or since < first.index.as_unit("ms").asi8[0]:
+            rows = None
+        else:
+            collected = int(rows.index.as_unit("ms").asi8[-1])
+            prepend_cursor = max(prepend_cursor or collected, collected)
+    if rows is None:
+        rows_file.unlink(missing_ok=True)
+        prepend_cursor = None
+
+    if head is not None and since < head:
+        resume = since if prepend_cursor is None else max(since, prepend_cursor + timeframe_ms)
+        for chunk in iter_ohlcv(
+            exchange, symbol, timeframe, resume, min(until, head), limit, retries, backoff
+        ):
+            data = convert_to_dataframe(chunk)
+            append_csv(data, rows_file)
+            _write_checkpoint(
+                checkpoint_file,
+                {
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "cursor": cursor,
+                    "prepend_cursor": chunk[-1][0],
+                },
+            )
+            yield data
+        if rows_file.exists():
+            prepend_csv(rows_file, csv_file)
+        _write_checkpoint(
+            checkpoint_file, {"symbol": symbol, "timeframe": timeframe, "cursor": cursor}
+        )
+
+    # then only candles after the store
+    if cursor is not None:
+        since = max(since, cursor + timeframe_ms)
+
+    for chunk in iter_ohlcv(
+        exchange, symbol, timeframe, since, until, limit, retries, backoff
+    ):
+        data = convert_to_dataframe(chunk)
+        append_csv(data, csv_file)
+        _write_checkpoint(
+            checkpoint_file,
+            {"symbol": symbol, "timeframe": timeframe, "cursor": chunk[-1][0]},
+        )
+        yield data
+
+    checkpoint_file.unlink(missing_ok=True)
+
+
+# write the checkpoint atomically so a crash never leaves a torn one
+def _write_checkpoint(checkpoint_file: Path, checkpoint: dict) -> None:
+    tmp_file = checkpoint_file.with_suffix(".tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(checkpoint, f)
+    tmp_file.replace(checkpoint_file)
+
+
 # downloader
+@timed("downloader")
 def downloader(
     exchange_id: str,
     symbol: str,
@@ -88,7 +313,7 @@ def downloader(
                 )
                 since = dt_ts(ts)
 
-            ohlcv_new = exchange.fetch_ohlcv(symbol, timeframe, since, limit)
+            ohlcv_new = fetch_with_retry(exchange, symbol, timeframe, since, limit)
             ohlcv.extend(ohlcv_new)
 
         data = convert_to_dataframe(ohlcv)
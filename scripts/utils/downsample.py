@@ -0,0 +1,69 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling of a line.
+
+    Returns the indices of the `n_out` points kept, always including the first
+    and last point.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+
+    # the first and last points are kept, the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype="int64")
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        # average of the next bucket (or the last point) is the third vertex
+        next_end = edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[b + 1] = a
+
+    return indices
+
+
+def minmax_ohlc(
+    open: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    bucket: int,
+):
+    """
+    Aggregate candles into buckets of `bucket` rows, preserving the OHLC
+    envelope: first open, highest high, lowest low, last close, summed volume.
+
+    Returns (starts, sizes, open, high, low, close, volume), where `starts` are
+    the row positions of the first candle of each bucket.
+    """
+    n = len(open)
+    starts = np.arange(0, n, bucket)
+    ends = np.minimum(starts + bucket, n)
+
+    return (
+        starts,
+        ends - starts,
+        np.asarray(open)[starts],
+        np.maximum.reduceat(high, starts),
+        np.minimum.reduceat(low, starts),
+        np.asarray(close)[ends - 1],
+        np.add.reduceat(volume, starts),
+    )
@@ -0,0 +1,301 @@
+"""
+Timers, counters and latency histograms around the hot paths, exported in the
+Prometheus text format and as JSON lines. Disabled (near no-op) until `enable()`.
+"""
+
+import bisect
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+
+# bucket upper bounds in seconds: 10us to ~3 min, 4 per octave
+BUCKETS = tuple(1e-5 * 2 ** (k / 4) for k in range(0, 97))
+
+logger = logging.getLogger("scripts.instrumentation")
+
+
+class Histogram:
+    """Cumulative latency histogram of one stage and label set."""
+
+    __slots__ = ("counts", "sum", "count", "max", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        i = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate of the `q` quantile, linear within its bucket."""
+        with self._lock:
+            counts, count, maximum = list(self.counts), self.count, self.max
+        if not count:
+            return math.nan
+        rank = q * count
+        seen = 0
+        for i, n in enumerate(counts):
+            if seen + n >= rank and n:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else maximum
+                return min(lower + (upper - lower) * (rank - seen) / n, maximum)
+            seen += n
+        return maximum
+
+
+class _Registry:
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.histograms = {}  # (stage, labels) -> Histogram
+        self.counters = {}  # (name, labels) -> value
+        self.exporter = None
+
+    def histogram(self, stage: str, labels: tuple) -> Histogram:
+        key = (stage, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        return histogram
+
+
+_registry = _Registry()
+
+
+def enable(
+    prometheus_file: str | Path | None = None,
+    log_file: str | Path | None = None,
+    export_interval: float = 10.0,
+) -> None:
+    """
+    Start recording.
+
+    Params:
+    - prometheus_file: Text file rewritten with all metrics every
+      `export_interval` seconds (and on `disable`).
+    - log_file: JSON lines file receiving one event per timed call, through
+      the "scripts.instrumentation" logger.
+    - export_interval: Seconds between Prometheus exports.
+    """
+    if log_file is not None:
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    if prometheus_file is not None and _registry.exporter is None:
+        _registry.exporter = _Exporter(Path(prometheus_file), export_interval)
+        _registry.exporter.start()
+    _registry.enabled = True
+
+
+def disable() -> None:
+    """Stop recording, write a last Prometheus export and close the log."""
+    _registry.enabled = False
+    if _registry.exporter is not None:
+        _registry.exporter.stop()
+        _registry.exporter = None
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+def is_enabled() -> bool:
+    return _registry.enabled
+
+
+def reset() -> None:
+    """Forget everything recorded so far."""
+    with _registry.lock:
+        _registry.histograms.clear()
+        _registry.counters.clear()
+
+
+def _labels(labels: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Add `value` to the counter `name`."""
+    if not _registry.enabled:
+        return
+    key = (name, _labels(labels))
+    with _registry.lock:
+        _registry.counters[key] = _registry.counters.get(key, 0) + value
+
+
+def observe(stage: str, seconds: float, error: bool = False, **labels) -> None:
+    """Record one call of `stage` that took `seconds`."""
+    if not _registry.enabled:
+        return
+    key = _labels(labels)
+    _registry.histogram(stage, key).observe(seconds)
+    if error:
+        count("errors", stage=stage, **labels)
+    if logger.handlers:
+        logger.info(
+            json.dumps(
+                {"time": time.time(), "stage": stage, "seconds": seconds, "error": error, **dict(key)}
+            )
+        )
+
+
+class _Timer:
+    __slots__ = ("stage", "labels", "started")
+
+    def __init__(self, stage: str, labels: dict):
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.stage, time.perf_counter() - self.started, exc_type is not None, **self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage: str, **labels):
+    """Context manager timing its block as one call of `stage`."""
+    if not _registry.enabled:
+        return _NULL_TIMER
+    return _Timer(stage, labels)
+
+
+def timed(stage: str, **labels):
+    """Decorator timing every call of the function as one call of `stage`."""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _registry.enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except BaseException:
+                observe(stage, time.perf_counter() - started, True, **labels)
+                raise
+            observe(stage, time.perf_counter() - started, **labels)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def summary() -> dict:
+    """Calls, mean, p50, p99 and max seconds per stage and label set."""
+    rows = {}
+    for (stage, labels), histogram in sorted(_registry.histograms.items()):
+        name = stage + "".join(f"[{key}={value}]" for key, value in labels)
+        rows[name] = {
+            "calls": histogram.count,
+            "mean": histogram.sum / histogram.count if histogram.count else math.nan,
+            "p50": histogram.quantile(0.5),
+            "p99": histogram.quantile(0.99),
+            "max": histogram.max,
+        }
+    return rows
+
+
+def prometheus_text(prefix: str = "trading") -> str:
+    """All metrics in the Prometheus text exposition format."""
+
+    def labels_text(labels, extra=()):
+        pairs = [*labels, *extra]
+        if not pairs:
+            return ""
+        values = ",".join(f'{key}="{_escape(value)}"' for key, value in pairs)
+        return "{" + values + "}"
+
+    lines = [
+        f"# HELP {prefix}_stage_seconds Latency of instrumented stages.",
+        f"# TYPE {prefix}_stage_seconds histogram",
+    ]
+    for (stage, labels), histogram in sorted(_registry.histograms.items()):
+        labels = (("stage", stage), *labels)
+        with histogram._lock:
+            counts, total, calls = list(histogram.counts), histogram.sum, histogram.count
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(
+                f"{prefix}_stage_seconds_bucket{labels_text(labels, [('le', f'{bound:.6g}')])} {cumulative}"
+            )
+        lines.append(f"{prefix}_stage_seconds_bucket{labels_text(labels, [('le', '+Inf')])} {calls}")
+        lines.append(f"{prefix}_stage_seconds_sum{labels_text(labels)} {total:.9g}")
+        lines.append(f"{prefix}_stage_seconds_count{labels_text(labels)} {calls}")
+
+    with _registry.lock:
+        counters = sorted(_registry.counters.items())
+    for name in sorted({name for (name, _), _ in counters}):
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        for (counter, labels), value in counters:
+            if counter == name:
+                lines.append(f"{prefix}_{name}_total{labels_text(labels)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def write_prometheus(path: str | Path, prefix: str = "trading") -> None:
+    """Write `prometheus_text` to `path` atomically."""
+    path = Path(path)
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(prometheus_text(prefix))
+    tmp_file.replace(path)
+
+
+class _Exporter:
+    """Background thread rewriting the Prometheus file every `interval` seconds."""
+
+    def __init__(self, path: Path, interval: float):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        write_prometheus(self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            write_prometheus(self.path)
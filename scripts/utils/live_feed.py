@@ -0,0 +1,193 @@
+import queue
+import threading
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from .ccxt_helpers import get_exchange, timeframe_to_seconds
+from .downloader import append_csv, read_csv_tail, backfill
+from .instrumentation import timed
+
+
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class LiveFeed:
+    """
+    Holds the last `size` candles of a symbol in a preallocated ring buffer.
+
+    Every candle is written twice (at slot `i` and `i + size`) so the latest
+    `size` candles are always one contiguous slice of the buffer. This lets
+    `dates`, `values` and `frame()` return views without copying.
+
+    Params:
+    - exchange_id: Exchange id from ccxt (e.g., "binance").
+    - symbol: Trading pair (e.g., "BTCUSDT").
+    - timeframe: Timeframe (e.g., "1h").
+    - size: Number of candles kept in memory.
+    - data_dir: Directory of the local csv store.
+    - exchange_options: Options passed to `get_exchange` (e.g., replay settings).
+    """
+
+    def __init__(
+        self,
+        exchange_id: str,
+        symbol: str,
+        timeframe: str = "5m",
+        size: int = 100,
+        data_dir: str = "./data",
+        exchange_options: dict | None = None,
+    ):
+        self.exchange_id = exchange_id
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.size = size
+        self.exchange_options = exchange_options
+        self.data_dir = data_dir
+        self.data_path = Path(data_dir) / f"{symbol.lower()}{timeframe}.csv"
+
+        self._timeframe_ms = timeframe_to_seconds(timeframe) * 1000
+        self._dates = np.zeros(2 * size, dtype="int64")
+        self._values = np.zeros((2 * size, len(COLUMNS)), dtype="float64")
+        self._pos = 0  # next slot to write, in [0, size)
+        self._count = 0
+        self._persisted_ts = None  # last candle timestamp already on disk
+        self._exchange = None
+
+        self._queue = queue.Queue()
+        self._writer = None
+
+    @property
+    def exchange(self):
+        if self._exchange is None:
+            self._exchange = get_exchange(self.exchange_id, self.exchange_options)
+        return self._exchange
+
+    @property
+    def head_ts(self) -> int | None:
+        """Timestamp (ms) of the newest candle, which may still be forming."""
+        if not self._count:
+            return None
+        return int(self._dates[self._pos - 1 + self.size])
+
+    @property
+    def dates(self) -> np.ndarray:
+        """View of candle timestamps in ms, oldest first."""
+        return self._dates[self._window()]
+
+    @property
+    def values(self) -> np.ndarray:
+        """View of the (n, 5) OHLCV block, oldest first."""
+        return self._values[self._window()]
+
+    def __len__(self):
+        return self._count
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame over the buffer. The OHLCV columns share memory with the feed."""
+        index = pd.DatetimeIndex(pd.to_datetime(self.dates, unit="ms"), name="Date")
+        return pd.DataFrame(self.values, index=index, columns=COLUMNS, copy=False)
+
+    @timed("feed_prime")
+    def prime(self) -> pd.DataFrame:
+        """Fill the buffer from the tail of the local store, backfilling any gap once."""
+        tail = read_csv_tail(self.data_path, self.size)
+
+        # the store is too far behind to be caught up by a single tick, backfill it now
+        # (a replay clock is unset until the first request, it then starts at the tail)
+        now = self.exchange.milliseconds()
+        if tail is not None and now is not None:
+            gap = now - tail.index.as_unit("ms").asi8[-1]
+            if gap > self.size * self._timeframe_ms:
+                for _ in backfill(
+                    exchange_id=self.exchange_id,
+                    symbol=self.symbol,
+                    start=tail.index[-1].isoformat(),
+                    timeframe=self.timeframe,
+                    data_dir=self.data_dir,
+                    exchange_options=self.exchange_options,
+                ):
+                    pass
+                tail = read_csv_tail(self.data_path, self.size)
+
+        if tail is not None:
+            dates = tail.index.as_unit("ms").asi8
+            for ts, row in zip(dates, tail[COLUMNS].to_numpy()):
+                self._push(ts, row)
+            self._persisted_ts = int(dates[-1])
+
+        return self.refresh()
+
+    @timed("feed_refresh")
+    def refresh(self) -> pd.DataFrame:
+        """
+        Fetch only candles at or after the head and queue closed ones for
+        persistence. After a stall longer than the buffer, pages are fetched
+        until the head is current, each one persisted before the next
+        overwrites it, so the store gets no hole.
+        """
+        while True:
+            head = self.head_ts
+            candles = self.exchange.fetch_ohlcv(
+                self.symbol, self.timeframe, head, self.size
+            )
+            for candle in candles:
+                self._push(candle[0], candle[1:6])
+            self._persist_closed()
+
+            # a short page reached the newest candle
+            if len(candles) < self.size or self.head_ts == head:
+                break
+        return self.frame()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _window(self) -> slice:
+        start = self._pos + self.size - self._count
+        return slice(start, self._pos + self.size)
+
+    def _push(self, ts, row):
+        ts = int(ts)
+        head = self.head_ts
+        if head is not None and ts < head:
+            return
+
+        if head is not None and ts == head:
+            # the forming candle is updated in place
+            slot = (self._pos - 1) % self.size
+        else:
+            slot = self._pos
+            self._pos = (self._pos + 1) % self.size
+            self._count = min(self._count + 1, self.size)
+
+        self._dates[slot] = self._dates[slot + self.size] = ts
+        self._values[slot] = self._values[slot + self.size] = row
+
+    def _persist_closed(self):
+        # every candle except the head is closed
+        dates = self.dates[:-1]
+        if self._persisted_ts is not None:
+            dates = dates[dates > self._persisted_ts]
+        if not len(dates):
+            return
+
+        values = self.values[-len(dates) - 1 : -1]
+        index = pd.DatetimeIndex(pd.to_datetime(dates, unit="ms"), name="Date")
+        self._queue.put(pd.DataFrame(values.copy(), index=index, columns=COLUMNS))
+        self._persisted_ts = int(dates[-1])
+
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            rows = self._queue.get()
+            if rows is None:
+                break
+            append_csv(rows, self.data_path)
@@ -0,0 +1,138 @@
+import time
+import queue
+import threading
+from typing import Any, Callable
+
+
+class LiveMetrics:
+    """Counters of a `LiveWorker`, updated from both threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.produced = 0  # snapshots put on the queue
+        self.rendered = 0  # snapshots taken by the consumer
+        self.dropped = 0  # snapshots replaced before the consumer took them
+        self.errors = 0  # failed producer calls
+        self.last_error = None
+        self.produce_time = 0.0  # seconds spent in the last producer call
+        self.last_lag = 0.0  # seconds between producing and taking the last snapshot
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    def record(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def record_produce(self, seconds: float):
+        with self._lock:
+            self.produce_time = seconds
+
+    def record_error(self, error: Exception):
+        with self._lock:
+            self.errors += 1
+            self.last_error = error
+
+    def record_lag(self, lag: float):
+        with self._lock:
+            self.rendered += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.total_lag += lag
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "produced": self.produced,
+                "rendered": self.rendered,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "last_error": repr(self.last_error) if self.last_error is not None else None,
+                "produce_time": self.produce_time,
+                "last_lag": self.last_lag,
+                "max_lag": self.max_lag,
+                "mean_lag": self.total_lag / self.rendered if self.rendered else 0.0,
+            }
+
+
+class LiveWorker:
+    """
+    Runs `produce()` every `interval` seconds on a background thread and posts
+    the results to a bounded queue.
+
+    The consumer calls `latest()`, which returns only the newest snapshot;
+    older ones are counted as dropped. Snapshots must not be mutated after
+    they are produced, since they are handed across threads.
+
+    Params:
+    - produce: Callable returning an immutable snapshot.
+    - interval: Seconds between producer calls.
+    - maxsize: Number of snapshots the queue holds before dropping the oldest.
+    """
+
+    def __init__(self, produce: Callable[[], Any], interval: float, maxsize: int = 1):
+        self.produce = produce
+        self.interval = interval
+        self.metrics = LiveMetrics()
+
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def latest(self) -> Any | None:
+        """Newest snapshot since the previous call, or None if nothing new."""
+        item = None
+        while True:
+            try:
+                newer = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.metrics.record(dropped=1)
+            item = newer
+
+        if item is None:
+            return None
+
+        produced_at, snapshot = item
+        self.metrics.record_lag(time.monotonic() - produced_at)
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                snapshot = self.produce()
+            except Exception as e:
+                self.metrics.record_error(e)
+            else:
+                self.metrics.record_produce(time.monotonic() - started)
+                self._put((time.monotonic(), snapshot))
+
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0))
+
+    def _put(self, item):
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                self.metrics.record(produced=1)
+                return
+            except queue.Full:
+                # the consumer is behind: replace the oldest snapshot
+                try:
+                    self._queue.get_nowait()
+                    self.metrics.record(dropped=1)
+                except queue.Empty:
+                    pass
@@ -0,0 +1,149 @@
+import numpy as np
+from pathlib import Path
+
+
+COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+
+def to_ms(timestamp) -> int:
+    """Convert ms int, iso string, datetime or datetime64 to a timestamp in ms."""
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    return int(np.datetime64(timestamp, "ms").astype("int64"))
+
+
+class OHLCV:
+    """
+    Compact OHLCV container over contiguous NumPy arrays.
+
+    Dates are int64 timestamps in ms, sorted ascending. Prices and volume are
+    float64, or float32 when `dtype="float32"` is given. Columns can be read
+    as attributes (`close`) or by the DataFrame names (`data["Close"]`), and
+    `index` is a zero-copy datetime64 view of the dates, so analyzers can take
+    either a DataFrame or an `OHLCV`.
+
+    On disk an `OHLCV` is a directory with one `.npy` file per column. `load`
+    memory-maps it and binary-searches the dates, so only the rows in
+    [start, end] are read.
+    """
+
+    __slots__ = ("dates", "open", "high", "low", "close", "volume")
+
+    def __init__(self, dates, open, high, low, close, volume, dtype=None):
+        self.dates = np.ascontiguousarray(dates, dtype="int64")
+        self.open = np.ascontiguousarray(open, dtype=dtype)
+        self.high = np.ascontiguousarray(high, dtype=dtype)
+        self.low = np.ascontiguousarray(low, dtype=dtype)
+        self.close = np.ascontiguousarray(close, dtype=dtype)
+        self.volume = np.ascontiguousarray(volume, dtype=dtype)
+
+    @classmethod
+    def from_frame(cls, data, dtype=None) -> "OHLCV":
+        """Build from a DataFrame indexed by date with the OHLCV columns."""
+        dates = data.index.as_unit("ms").asi8
+        return cls(dates, *(data[name].to_numpy() for name in COLUMNS), dtype=dtype)
+
+    @classmethod
+    def from_csv(cls, csv_file: str | Path, dtype=None) -> "OHLCV":
+        """Read a csv of the local store (the whole file)."""
+        import pandas as pd
+
+        data = pd.read_csv(csv_file, index_col=["Date"], parse_dates=["Date"])
+        return cls.from_frame(data, dtype)
+
+    @classmethod
+    def load(cls, path: str | Path, start=None, end=None, dtype=None) -> "OHLCV":
+        """Read the rows with `start <= date <= end` from a directory written by `save`."""
+        path = Path(path)
+        dates = np.load(path / "dates.npy", mmap_mode="r")
+        i, j = _bounds(dates, start, end)
+        columns = [np.load(path / f"{name.lower()}.npy", mmap_mode="r")[i:j] for name in COLUMNS]
+        return cls(dates[i:j], *columns, dtype=dtype)
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "dates.npy", self.dates)
+        for name in COLUMNS:
+            np.save(path / f"{name.lower()}.npy", self[name])
+
+    def append(self, path: str | Path) -> None:
+        """
+        Append these rows to a directory written by `save`, in place: only the
+        new rows are written and each column's header is patched, so extending
+        a large store by a few bars costs only those bars.
+        """
+        path = Path(path)
+        if not (path / "dates.npy").exists():
+            self.save(path)
+            return
+        _append_npy(path / "dates.npy", self.dates)
+        for name in COLUMNS:
+            _append_npy(path / f"{name.lower()}.npy", self[name])
+
+    def to_frame(self):
+        import pandas as pd
+
+        index = pd.DatetimeIndex(self.index, name="Date")
+        return pd.DataFrame({name: self[name] for name in COLUMNS}, index=index)
+
+    @property
+    def index(self) -> np.ndarray:
+        return self.dates.view("datetime64[ms]")
+
+    def between(self, start=None, end=None) -> "OHLCV":
+        """View of the rows with `start <= date <= end`."""
+        return self[slice(*_bounds(self.dates, start, end))]
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key.lower())
+        return OHLCV(
+            self.dates[key],
+            self.open[key],
+            self.high[key],
+            self.low[key],
+            self.close[key],
+            self.volume[key],
+        )
+
+    def __repr__(self):
+        if not len(self):
+            return "OHLCV(empty)"
+        return f"OHLCV({len(self)} rows, {self.index[0]} - {self.index[-1]}, {self.close.dtype})"
+
+
+def _bounds(dates: np.ndarray, start, end) -> tuple[int, int]:
+    i = 0 if start is None else int(np.searchsorted(dates, to_ms(start), side="left"))
+    j = len(dates) if end is None else int(np.searchsorted(dates, to_ms(end), side="right"))
+    return i, j
+
+
+# append `values` to a 1-d .npy file, rewriting it only when the grown shape no
+# longer fits in the header's padding
+def _append_npy(path: Path, values: np.ndarray) -> None:
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        prefix = f.tell() + (2 if version == (1, 0) else 4)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        data_start = f.tell()
+
+        shape = (shape[0] + len(values),)
+        header = f"{{'descr': {np.lib.format.dtype_to_descr(dtype)!r}, 'fortran_order': False, 'shape': {shape}, }}"
+        padding = data_start - prefix - len(header) - 1
+        if padding >= 0:
+            # data first, so a crash in between leaves the old (shorter) array
+            f.seek(0, 2)
+            f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            f.seek(prefix)
+            f.write((header + " " * padding + "\n").encode("latin1"))
+            return
+
+    existing = np.load(path)
+    np.save(path, np.concatenate([existing, np.asarray(values, dtype=existing.dtype)]))
@@ -0,0 +1,167 @@
+import time
+import random
+import ccxt
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from .ccxt_helpers import timeframe_to_seconds
+from .ohlcv import to_ms
+
+
+class ReplayExchange:
+    """
+    Local stand-in for a ccxt exchange that replays the csv store.
+
+    It implements the `fetch_ohlcv`/`fetch_trades` surface used by the
+    downloader and the live feed, and is returned by `get_exchange("replay")`.
+    Candles are served up to a virtual clock, which either follows wall time
+    scaled by `speed` or, when `speed` is None, advances `step` candles on every
+    `fetch_ohlcv` call so that runs are fully deterministic.
+
+    Options:
+    - data_dir: Directory of the csv files to replay (default "./data").
+    - start: Virtual start time (iso string or ms). Defaults to the `since` of
+      the first request, or to the first candle of its series without one.
+    - speed: Virtual seconds per wall second, or None for step mode.
+    - step: Candles the clock advances per `fetch_ohlcv` call in step mode.
+    - latency: Mean simulated latency per request in seconds.
+    - jitter: Maximum random latency added on top of `latency`.
+    - rate_limit: Maximum requests per second, above which
+      `ccxt.RateLimitExceeded` is raised (None to disable).
+    - error_rate: Probability that a request fails with `ccxt.RequestTimeout`.
+    - seed: Seed of the random generator for latency and errors.
+    """
+
+    id = "replay"
+    has = {"fetchOHLCV": True, "fetchTrades": True}
+
+    def __init__(self, config: dict | None = None):
+        config = config or {}
+        self.data_dir = Path(config.get("data_dir", "./data"))
+        self.speed = config.get("speed")
+        self.step = config.get("step", 1)
+        self.latency = config.get("latency", 0.0)
+        self.jitter = config.get("jitter", 0.0)
+        self.rate_limit = config.get("rate_limit")
+        self.error_rate = config.get("error_rate", 0.0)
+        self.markets = {}
+
+        start = config.get("start")
+        self._now = to_ms(start) if start is not None else None
+        self._wall_start = None
+        self._random = random.Random(config.get("seed", 0))
+        self._series = {}
+        self._last_request = None
+
+    def parse8601(self, timestamp: str) -> int:
+        return ccxt.Exchange.parse8601(timestamp)
+
+    def milliseconds(self) -> int | None:
+        """Current virtual time in ms, None until the first request starts the clock."""
+        if self._now is None:
+            return None
+        if self.speed is not None and self._wall_start is not None:
+            elapsed = (time.monotonic() - self._wall_start) * self.speed
+            return int(self._now + elapsed * 1000)
+        return self._now
+
+    def load_markets(self, reload=False, params={}):
+        return self.markets
+
+    def close(self):
+        pass
+
+    def fetch_ohlcv(
+        self, symbol: str, timeframe: str = "1m", since=None, limit=None, params={}
+    ) -> list[list]:
+        dates, values = self._load(symbol, timeframe, since)
+        self._request()
+
+        # candles up to and including the one open at the virtual time
+        end = np.searchsorted(dates, self.milliseconds(), side="right")
+        if since is None:
+            begin = max(end - (limit or 500), 0)
+        else:
+            begin = np.searchsorted(dates, since, side="left")
+        if limit is not None:
+            end = min(end, begin + limit)
+
+        candles = [
+            [int(ts), *row] for ts, row in zip(dates[begin:end], values[begin:end].tolist())
+        ]
+
+        if self.speed is None:
+            self._now += self.step * timeframe_to_seconds(timeframe) * 1000
+
+        return candles
+
+    def fetch_trades(self, symbol: str, since=None, limit=None, params={}) -> list[dict]:
+        """
+        Synthetic trades from the 1m series: each candle is split into four
+        trades at open, high/low, low/high and close carrying a quarter of its
+        volume each.
+        """
+        dates, values = self._load(symbol, "1m", since)
+        self._request()
+
+        end = np.searchsorted(dates, self.milliseconds(), side="right")
+        begin = 0 if since is None else np.searchsorted(dates, since, side="left")
+
+        trades = []
+        for ts, (open_, high, low, close, volume) in zip(
+            dates[begin:end], values[begin:end].tolist()
+        ):
+            side = "buy" if close >= open_ else "sell"
+            path = (open_, low, high, close) if side == "buy" else (open_, high, low, close)
+            for i, price in enumerate(path):
+                timestamp = int(ts) + i * 15000
+                trades.append(
+                    {
+                        "id": f"{timestamp}-{i}",
+                        "timestamp": timestamp,
+                        "datetime": ccxt.Exchange.iso8601(timestamp),
+                        "symbol": symbol,
+                        "side": side,
+                        "price": price,
+                        "amount": volume / 4,
+                    }
+                )
+            if limit is not None and len(trades) >= limit:
+                break
+
+        return trades[:limit] if limit is not None else trades
+
+    def _load(self, symbol: str, timeframe: str, since=None):
+        key = (symbol.lower(), timeframe)
+        if key not in self._series:
+            csv_file = self.data_dir / f"{symbol.lower()}{timeframe}.csv"
+            if not csv_file.exists():
+                raise ccxt.BadSymbol(f"replay has no data for {symbol} {timeframe}")
+            data = pd.read_csv(csv_file, index_col=["Date"], parse_dates=["Date"])
+            self._series[key] = (
+                data.index.as_unit("ms").asi8,
+                data[["Open", "High", "Low", "Close", "Volume"]].to_numpy("float64"),
+            )
+
+        if self._now is None:
+            self._now = int(self._series[key][0][0]) if since is None else int(since)
+        if self._wall_start is None:
+            self._wall_start = time.monotonic()
+
+        return self._series[key]
+
+    def _request(self):
+        now = time.monotonic()
+        if self.rate_limit and self._last_request is not None:
+            if now - self._last_request < 1 / self.rate_limit:
+                self._last_request = now
+                raise ccxt.RateLimitExceeded("replay rate limit exceeded")
+        self._last_request = now
+
+        delay = self.latency + self._random.random() * self.jitter
+        if delay:
+            time.sleep(delay)
+
+        if self._random.random() < self.error_rate:
+            raise ccxt.RequestTimeout("replay simulated timeout")
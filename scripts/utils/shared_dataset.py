@@ -0,0 +1,211 @@
+import json
+import mmap
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from .ohlcv import COLUMNS, OHLCV
+
+
+MAGIC = b"OHLCVSHM"
+ALIGN = 64
+
+# datasets attached by this process, by name: numpy views don't keep a mapping
+# open, so it stays mapped until `close` rather than until garbage collection
+_attached = {}
+
+
+class SharedDataset:
+    """
+    OHLCV columns of many symbols in one shared block, for process pools.
+
+    `publish` copies the data once into `multiprocessing.shared_memory` (or a
+    file when `path` is given) behind a small JSON catalog. Workers `attach`
+    by name and get read-only `OHLCV` views, which the analyzers' `fit()` and
+    `find_pivots` take as they are, or zero-copy DataFrames from `frame`. Any
+    number of workers then share the single copy of the data.
+
+    Layout: magic, catalog length, catalog, then per symbol the int64 dates
+    followed by the 5 price/volume columns as one (5, rows) block.
+    """
+
+    def __init__(
+        self, name: str, buffer, catalog: dict, start: int, block=None, owner: bool = False
+    ):
+        self.__name = name
+        self.__buffer = buffer
+        self.__catalog = catalog
+        self.__start = start
+        self.__block = block
+        self.__views = {}
+        self.__finalizer = None
+        if owner:
+            self.__finalizer = weakref.finalize(self, _release, block, name)
+
+    @classmethod
+    def publish(cls, datasets: dict, path: str | Path | None = None) -> "SharedDataset":
+        """
+        Copy `datasets` (symbol -> `OHLCV` or DataFrame) into a new shared
+        block, or into the file `path`. The publisher owns the block: it is
+        removed by `unlink` or when the publisher is garbage collected.
+        """
+        arrays = {
+            symbol: data if isinstance(data, OHLCV) else OHLCV.from_frame(data)
+            for symbol, data in datasets.items()
+        }
+        symbols, offset = {}, 0
+        for symbol, bars in arrays.items():
+            dtype = np.dtype(bars.close.dtype)
+            symbols[symbol] = {"offset": offset, "rows": len(bars), "dtype": dtype.str}
+            offset += _aligned(8 * len(bars)) + _aligned(5 * dtype.itemsize * len(bars))
+        catalog = json.dumps({"symbols": symbols}).encode()
+        start = _aligned(len(MAGIC) + 8 + len(catalog))
+        size = max(1, start + offset)
+
+        if path is None:
+            block = shared_memory.SharedMemory(create=True, size=size)
+            # cleanup is up to the publisher, not to the resource tracker of
+            # whichever process exits first
+            resource_tracker.unregister(block._name, "shared_memory")
+            name, buffer = block.name, block.buf
+        else:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w+b") as f:
+                f.truncate(size)
+                block = mmap.mmap(f.fileno(), size)
+            name, buffer = str(path), memoryview(block)
+
+        buffer[: len(MAGIC)] = MAGIC
+        buffer[len(MAGIC) : len(MAGIC) + 8] = len(catalog).to_bytes(8, "little")
+        buffer[len(MAGIC) + 8 : len(MAGIC) + 8 + len(catalog)] = catalog
+        dataset = cls(name, buffer, json.loads(catalog), start, block, owner=True)
+        for symbol, bars in arrays.items():
+            dates, table = dataset._columns(symbol, writeable=True)
+            dates[:] = bars.dates
+            for row, column in enumerate(COLUMNS):
+                table[row] = bars[column]
+        return dataset
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedDataset":
+        """
+        Attach to a dataset by the `name` (or path) of its publisher. Attaching
+        again in the same process returns the same dataset.
+        """
+        if name in _attached:
+            return _attached[name]
+        if Path(name).exists():
+            with open(name, "rb") as f:
+                block = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(block)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(block._name, "shared_memory")
+            buffer = block.buf
+        if bytes(buffer[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{name} is not a shared OHLCV dataset")
+        length = int.from_bytes(buffer[len(MAGIC) : len(MAGIC) + 8], "little")
+        catalog = json.loads(bytes(buffer[len(MAGIC) + 8 : len(MAGIC) + 8 + length]))
+        dataset = cls(name, buffer, catalog, _aligned(len(MAGIC) + 8 + length), block)
+        _attached[name] = dataset
+        return dataset
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self.__catalog["symbols"])
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.__buffer)
+
+    def _columns(self, symbol: str, writeable: bool = False):
+        entry = self.__catalog["symbols"][symbol]
+        rows, dtype = entry["rows"], np.dtype(entry["dtype"])
+        offset = self.__start + entry["offset"]
+        dates = np.ndarray((rows,), dtype="int64", buffer=self.__buffer, offset=offset)
+        table = np.ndarray(
+            (5, rows), dtype=dtype, buffer=self.__buffer, offset=offset + _aligned(8 * rows)
+        )
+        dates.flags.writeable = table.flags.writeable = writeable
+        return dates, table
+
+    def __getitem__(self, symbol: str) -> OHLCV:
+        """Read-only `OHLCV` view of `symbol`."""
+        if symbol not in self.__views:
+            dates, table = self._columns(symbol)
+            self.__views[symbol] = OHLCV(dates, *table)
+        return self.__views[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.__catalog["symbols"]
+
+    def __len__(self):
+        return len(self.__catalog["symbols"])
+
+    def frame(self, symbol: str):
+        """Read-only DataFrame over the shared columns of `symbol`, no copy."""
+        import pandas as pd
+
+        dates, table = self._columns(symbol)
+        index = pd.DatetimeIndex(dates.view("datetime64[ms]"), name="Date")
+        return pd.DataFrame(table.T, index=index, columns=list(COLUMNS), copy=False)
+
+    def close(self) -> None:
+        """Drop this process's mapping; views taken from it must be gone."""
+        _attached.pop(self.__name, None)
+        self.__views.clear()
+        self.__buffer = None
+        if self.__finalizer is None and self.__block is not None:
+            try:
+                self.__block.close()
+            except BufferError:
+                # views are still alive, the mapping goes with the last one
+                pass
+
+    def unlink(self) -> None:
+        """
+        Remove the published block (publisher only). Views of the publisher
+        must be gone, attached processes keep their mapping until they close.
+        """
+        self.__views.clear()
+        self.__buffer = None
+        if self.__finalizer is not None:
+            self.__finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self.__finalizer is not None:
+            self.unlink()
+        else:
+            self.close()
+
+    def __repr__(self):
+        return f"SharedDataset({self.name!r}, {len(self)} symbols, {self.nbytes} bytes)"
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGN) * ALIGN
+
+
+def _release(block, name):
+    """Close and remove a published block."""
+    try:
+        block.close()
+    except BufferError:
+        # views are still alive in this process, the memory goes with them
+        pass
+    if isinstance(block, shared_memory.SharedMemory):
+        # registered again so unlink's own unregister has an entry to remove
+        resource_tracker.register(block._name, "shared_memory")
+        block.unlink()
+    else:
+        Path(name).unlink(missing_ok=True)